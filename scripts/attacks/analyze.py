@@ -0,0 +1,243 @@
+"""
+Análise Offline de Execuções Gravadas
+Lê os arquivos NDJSON gerados com --output e calcula taxa de bloqueio
+por família de ataque, IP de origem e endpoint, além dos percentis de
+latência por janela de tempo, sem precisar repetir o ataque
+"""
+
+import argparse
+import glob
+from typing import Dict, List, Optional
+
+from harness.histogram import (
+    BUCKET_COUNT,
+    MAX_VALUE_US,
+    SUB_BUCKET_BITS,
+    SUB_BUCKET_COUNT,
+    SUB_BUCKET_HALF,
+    bucket_upper_us,
+)
+from harness.report import PERCENTILES
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    raise SystemExit("analyze.py exige numpy e pandas (pip install numpy pandas)")
+
+COLUMNS = ["ts", "phase", "family", "ip", "endpoint", "status", "latency_ms", "error"]
+GROUPS = {"family": "Família", "ip": "IP de origem", "endpoint": "Endpoint"}
+
+UPPER_US = np.array([bucket_upper_us(i) for i in range(BUCKET_COUNT)], dtype=np.int64)
+
+
+def bucket_indices(values_us: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de harness.histogram.bucket_index
+    """
+    values = np.clip(values_us, 0, MAX_VALUE_US).astype(np.int64)
+    # frexp devolve o expoente e com v = m * 2^e e 0.5 <= m < 1, ou seja, o bit_length
+    _, bit_length = np.frexp(values.astype(np.float64))
+    shift = np.maximum(bit_length - (SUB_BUCKET_BITS + 1), 1)
+
+    log_linear = SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (values >> shift) - SUB_BUCKET_HALF
+    return np.where(values < SUB_BUCKET_COUNT, values, log_linear)
+
+
+def percentiles_of(counts: np.ndarray, max_us: np.ndarray) -> np.ndarray:
+    """
+    Percentis (µs) de uma matriz janelas x buckets, um de cada vez para todas as janelas
+
+    Mesma regra do LatencyHistogram: maior valor do bucket que contém a
+    amostra de posição ceil(p% * n), limitado ao máximo observado.
+    """
+    cumulative = np.cumsum(counts, axis=1)
+    totals = cumulative[:, -1]
+    result = np.zeros((len(counts), len(PERCENTILES)), dtype=np.int64)
+
+    for column, p in enumerate(PERCENTILES):
+        targets = np.maximum(1, np.ceil(p / 100.0 * totals)).astype(np.int64)
+        indices = (cumulative < targets[:, None]).sum(axis=1)
+        indices = np.minimum(indices, BUCKET_COUNT - 1)
+        result[:, column] = np.minimum(UPPER_US[indices], max_us)
+
+    result[totals == 0] = 0
+    return result
+
+
+class RunAnalysis:
+    """
+    Agregados acumulados bloco a bloco
+
+    A memória depende só do número de grupos (famílias, IPs,
+    endpoints) e de janelas de tempo, não do número de linhas.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self.rows = 0
+        self.groups: Dict[str, Optional[pd.DataFrame]] = {name: None for name in GROUPS}
+        # janela (início em segundos epoch / window) -> contagem por bucket
+        self.latency: Dict[int, np.ndarray] = {}
+        self.latency_max: Dict[int, int] = {}
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        chunk = chunk.reindex(columns=COLUMNS)
+        chunk["family"] = chunk["family"].fillna(chunk["phase"])
+        self.rows += len(chunk)
+
+        outcome = pd.DataFrame({
+            "total": 1,
+            "blocked": (chunk["status"] == 403).astype(np.int64),
+            "limited": (chunk["status"] == 429).astype(np.int64),
+            "errors": chunk["error"].notna().astype(np.int64),
+        })
+        for name in GROUPS:
+            counts = outcome.groupby(chunk[name].to_numpy()).sum()
+            current = self.groups[name]
+            self.groups[name] = counts if current is None else current.add(counts, fill_value=0)
+
+        ok = chunk[chunk["error"].isna() & chunk["latency_ms"].notna()]
+        if ok.empty:
+            return
+
+        windows = (ok["ts"].to_numpy() // self.window).astype(np.int64)
+        values_us = (ok["latency_ms"].to_numpy() * 1000).astype(np.int64)
+        buckets = bucket_indices(values_us)
+
+        # Uma única bincount para todas as janelas do bloco
+        first = windows.min()
+        span = windows.max() - first + 1
+        matrix = np.bincount(
+            (windows - first) * BUCKET_COUNT + buckets,
+            minlength=span * BUCKET_COUNT,
+        ).reshape(span, BUCKET_COUNT)
+        maxima = pd.Series(values_us).groupby(windows).max()
+
+        for offset in np.flatnonzero(matrix.any(axis=1)):
+            key = int(first + offset)
+            if key in self.latency:
+                self.latency[key] += matrix[offset]
+            else:
+                self.latency[key] = matrix[offset].copy()
+            self.latency_max[key] = max(self.latency_max.get(key, 0), int(maxima[key]))
+
+    def window_table(self) -> pd.DataFrame:
+        keys = sorted(self.latency)
+        counts = np.array([self.latency[k] for k in keys])
+        maxima = np.array([self.latency_max[k] for k in keys])
+
+        table = pd.DataFrame(
+            percentiles_of(counts, maxima) / 1000.0,
+            columns=[f"p{format(p, 'g')}" for p in PERCENTILES],
+        )
+        table.insert(0, "t", [(k - keys[0]) * self.window for k in keys])
+        table.insert(1, "n", counts.sum(axis=1))
+        table["max"] = maxima / 1000.0
+        return table
+
+    def overall(self) -> Dict[str, float]:
+        counts = np.sum(list(self.latency.values()), axis=0)[None, :]
+        maximum = np.array([max(self.latency_max.values())])
+        values = percentiles_of(counts, maximum)[0] / 1000.0
+        return dict(zip((f"p{format(p, 'g')}" for p in PERCENTILES), values), max=maximum[0] / 1000.0)
+
+
+def analyze(paths: List[str], window: float, chunksize: int) -> RunAnalysis:
+    analysis = RunAnalysis(window)
+    for path in paths:
+        reader = pd.read_json(path, lines=True, chunksize=chunksize, compression="infer", dtype=False)
+        for chunk in reader:
+            analysis.add(chunk)
+    return analysis
+
+
+def print_groups(analysis: RunAnalysis, top: int) -> None:
+    for name, title in GROUPS.items():
+        table = analysis.groups[name]
+        if table is None or table.empty:
+            continue
+
+        table = table.sort_values("total", ascending=False)
+        print(f"\n📍 Bloqueio por {title}" + (f" (top {top})" if len(table) > top else ""))
+        print("-" * 78)
+        print(f"{title:<32} {'total':>10} {'403':>10} {'429':>8} {'erros':>8} {'bloqueio':>8}")
+        for key, row in table.head(top).iterrows():
+            rate = row["blocked"] / row["total"] * 100 if row["total"] else 0.0
+            print(
+                f"{str(key)[:32]:<32} {int(row['total']):>10d} {int(row['blocked']):>10d} "
+                f"{int(row['limited']):>8d} {int(row['errors']):>8d} {rate:>7.1f}%"
+            )
+
+
+def print_latency(analysis: RunAnalysis) -> None:
+    if not analysis.latency:
+        return
+
+    labels = [f"p{format(p, 'g')}" for p in PERCENTILES]
+    print(f"\n⏱️  Latência (ms) por janela de {analysis.window:g}s")
+    print(f"{'t (s)':>8} {'n':>9} {'req/s':>9} " + " ".join(f"{label:>8}" for label in labels) + f" {'max':>8}")
+    for _, row in analysis.window_table().iterrows():
+        print(
+            f"{row['t']:>8.0f} {int(row['n']):>9d} {row['n'] / analysis.window:>9.1f} "
+            + " ".join(f"{row[label]:>8.1f}" for label in labels)
+            + f" {row['max']:>8.1f}"
+        )
+
+    overall = analysis.overall()
+    print(
+        f"{'total':>8} {'':>9} {'':>9} "
+        + " ".join(f"{overall[label]:>8.1f}" for label in labels)
+        + f" {overall['max']:>8.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analisa resultados gravados com --output (NDJSON, .gz aceito)"
+    )
+    parser.add_argument(
+        "files",
+        nargs="+",
+        help="Arquivos ou padrões glob (ex.: runs/soak.w*.ndjson.gz)",
+    )
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=10.0,
+        help="Largura da janela de latência em segundos (padrão: 10)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Linhas por tabela de bloqueio (padrão: 20)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=100_000,
+        help="Linhas lidas por bloco (padrão: 100000)",
+    )
+
+    args = parser.parse_args()
+
+    paths = sorted({path for pattern in args.files for path in glob.glob(pattern)})
+    if not paths:
+        parser.error("Nenhum arquivo encontrado")
+
+    analysis = analyze(paths, args.window, args.chunksize)
+
+    print("\n" + "=" * 78)
+    print("📊 ANÁLISE DE EXECUÇÃO")
+    print("=" * 78)
+    print(f"Arquivos:   {len(paths)}")
+    print(f"Registros:  {analysis.rows}")
+
+    print_groups(analysis, args.top)
+    print_latency(analysis)
+    print("=" * 78 + "\n")
+
+
+if __name__ == "__main__":
+    main()
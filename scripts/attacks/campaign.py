@@ -0,0 +1,189 @@
+"""
+Runner de Campanhas de Ataque
+Executa um cenário declarativo (YAML/JSON) que mistura brute force, SQLi,
+XSS, path traversal e ataques multi-IP em fases simultâneas
+"""
+
+import argparse
+import asyncio
+
+from harness import AttackResult, JobRun, LoadEngine, Shard
+from harness import add_engine_arguments, print_engine_stats, run_job
+from harness.checkpoint import print_checkpoint_hint
+from harness.cli import DEFAULT_BASE_URL
+from harness.phases import PHASE_TYPES
+from harness.scenario import Phase, load_scenario
+
+
+def new_counters(phase: Phase) -> dict:
+    return {"type": phase.type, "sent": 0, "blocked": 0, "errors": 0, "status": {}}
+
+
+async def run_phase(
+    engine: LoadEngine,
+    base_url: str,
+    phase: Phase,
+    shard: Shard,
+    counters: dict,
+    open_loop: bool,
+):
+    """
+    Executa uma fase no motor compartilhado, após o seu `start`
+    """
+    # Numa retomada de checkpoint o cenário continua do instante em que parou
+    resumed = engine.checkpoint.elapsed if engine.checkpoint is not None else 0.0
+    if phase.start > resumed:
+        await asyncio.sleep(phase.start - resumed)
+
+    print(
+        f"▶️  {phase.name:<20} {phase.type:<15} "
+        f"taxa: {phase.rate or 'sem limite'} req/s | "
+        f"duração: {f'{phase.duration:g}s' if phase.duration else 'um ciclo'}"
+    )
+
+    def handle(result: AttackResult) -> None:
+        counters["sent"] += 1
+
+        if result.error is not None:
+            counters["errors"] += 1
+            return
+
+        status = str(result.status)
+        counters["status"][status] = counters["status"].get(status, 0) + 1
+        if result.status == 403:
+            counters["blocked"] += 1
+
+    build = PHASE_TYPES[phase.type]
+    requests = build(base_url, phase.options, shard, phase.duration is not None)
+
+    stats = await engine.run_async(
+        requests,
+        handle,
+        rate=phase.rate_profile(),
+        concurrency=phase.concurrency,
+        phase=phase.name,
+        duration=phase.duration,
+        open_loop=phase.open_loop if phase.open_loop is not None else open_loop,
+    )
+    print(f"⏹️  {phase.name:<20} {stats.completed} requisições em {stats.elapsed:.1f}s")
+    return stats
+
+
+def run_campaign(engine: LoadEngine, args: argparse.Namespace, shard: Shard, results: dict):
+    """
+    Dispara todas as fases do cenário ao mesmo tempo
+
+    Com --workers cada processo recebe uma fração da taxa e da
+    concorrência de cada fase.
+    """
+    scenario = load_scenario(args.scenario)
+    base_url = args.base_url or scenario.target or DEFAULT_BASE_URL
+
+    runs = []
+    for phase in scenario.phases:
+        if args.only and phase.name not in args.only:
+            continue
+
+        phase = phase.scaled(shard.count)
+        if phase.rate is None and args.rate:
+            phase.rate = args.rate / shard.count
+        if phase.concurrency is None:
+            phase.concurrency = engine.concurrency
+
+        counters = results.setdefault(phase.name, engine.checkpointed(phase.name, new_counters(phase)))
+        runs.append(run_phase(engine, base_url, phase, shard, counters, args.phase_open_loop))
+
+    engine.run_all(runs)
+
+
+def print_summary(results: dict, run: JobRun = None):
+    """
+    Exibe o resultado por fase e o relatório de latência da campanha
+    """
+    print("\n" + "=" * 70)
+    print("📊 RELATÓRIO DA CAMPANHA")
+    print("=" * 70)
+    print(f"{'fase':<20} {'tipo':<15} {'enviadas':>9} {'bloqueadas':>11} {'taxa':>7} {'erros':>6}")
+
+    for name, counters in results.items():
+        sent = counters["sent"]
+        block_rate = counters["blocked"] / sent * 100 if sent else 0.0
+        print(
+            f"{name[:20]:<20} {counters['type']:<15} {sent:>9d} "
+            f"{counters['blocked']:>11d} {block_rate:>6.1f}% {counters['errors']:>6d}"
+        )
+        statuses = ", ".join(f"{code}: {n}" for code, n in sorted(counters["status"].items()))
+        if statuses:
+            print(f"{'':<20} status → {statuses}")
+
+    if run is not None:
+        print()
+        print_engine_stats(run.totals)
+        run.report.print()
+
+    print("=" * 70 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Executa uma campanha de ataques descrita em um cenário YAML/JSON"
+    )
+    parser.add_argument(
+        "scenario",
+        help="Arquivo do cenário (.yaml, .yml ou .json)",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        metavar="FASE",
+        help="Executa apenas a fase indicada (pode repetir)",
+    )
+
+    add_engine_arguments(parser)
+    # Sem --base-url explícito vale o `target` do cenário
+    parser.set_defaults(base_url=None)
+
+    args = parser.parse_args()
+
+    try:
+        scenario = load_scenario(args.scenario)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    phases = [p for p in scenario.phases if not args.only or p.name in args.only]
+    if not phases:
+        parser.error("Nenhuma fase selecionada")
+
+    # O modo open-loop é decidido por fase; --open-loop vira o padrão
+    # das fases que não definem `open_loop` e não passa para o motor
+    args.phase_open_loop, args.open_loop = args.open_loop, False
+    if args.phase_open_loop and any(not (p.rate or args.rate) for p in phases):
+        parser.error("--open-loop exige 'rate' em todas as fases (ou --rate)")
+
+    # Todas as fases dividem o mesmo pool de conexões
+    if not args.pool_size:
+        args.pool_size = sum(p.concurrency or args.concurrency for p in phases)
+
+    print("\n" + "=" * 70)
+    print("🎯 ATTACK CAMPAIGN RUNNER")
+    print("=" * 70)
+    print(f"Cenário: {args.scenario}")
+    print(f"Target:  {args.base_url or scenario.target or DEFAULT_BASE_URL}")
+    print(f"Fases:   {', '.join(p.name for p in phases)}")
+    print(f"Workers: {args.workers}")
+    print("=" * 70 + "\n")
+
+    results = {}
+
+    try:
+        run = run_job(args, run_campaign, results)
+        print_summary(results, run)
+
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Campanha interrompida pelo usuário")
+        print_summary(results)
+        print_checkpoint_hint(args)
+
+
+if __name__ == "__main__":
+    main()
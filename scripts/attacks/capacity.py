@@ -0,0 +1,202 @@
+"""
+Teste de Capacidade do WAF
+Sobe a taxa ofertada em degraus para cada mix de ataques e encontra a
+maior taxa sustentável antes de o alvo sair do SLO ou o goodput estabilizar
+"""
+
+import argparse
+
+from harness import JobRun, LoadEngine, Shard, add_engine_arguments, print_engine_stats, run_job
+from harness.phases import mixed, parse_phase_mix
+from harness.saturation import SaturationReport, SloPolicy, StepResult, find_saturation, step_rates
+
+# Mixes prontos (--mix aceita estes nomes ou "tipo:peso,...")
+MIXES = {
+    "sqli-heavy": "sqli:0.8,xss:0.1,path_traversal:0.1",
+    "honeypot-heavy": "path_traversal:0.6,xss:0.3,sqli:0.1",
+    "brute-force": "brute_force:0.9,sqli:0.1",
+    "distributed": "multi_ip:0.7,sqli:0.3",
+}
+
+
+def ramp_step(engine: LoadEngine, args: argparse.Namespace, shard: Shard, results: dict):
+    """
+    Executa um degrau: `args.step_rate` req/s em open-loop por `args.step_duration`
+
+    Open-loop mantém a taxa ofertada mesmo quando o alvo atrasa, então
+    a fila aparece no p99 em vez de reduzir a carga.
+    """
+    step = results["step"]
+    stats = engine.run(
+        mixed(args.base_url, args.mix, shard),
+        step.record,
+        rate=args.step_rate / shard.count,
+        phase=f"{args.mix_name} @ {args.step_rate:g} req/s",
+        duration=args.step_duration,
+        open_loop=True,
+    )
+    step.elapsed = stats.elapsed
+
+
+def merge_steps(target: dict, other: dict) -> None:
+    target["step"].merge(other["step"])
+
+
+def measure_mix(args: argparse.Namespace, name: str, policy: SloPolicy, run: JobRun) -> SaturationReport:
+    """
+    Rampa completa de um mix; acumula as estatísticas do motor em `run`
+    """
+    args.mix_name = name
+    args.mix = parse_phase_mix(MIXES.get(name, name))
+
+    print(f"\n▶️  {name}: " + ", ".join(f"{family} {weight * 100:.0f}%" for family, weight in args.mix.items()))
+
+    def run_step(rate: float) -> StepResult:
+        args.step_rate = rate
+        args.rate = rate
+        results = {"step": StepResult(rate)}
+        step_run = run_job(args, ramp_step, results, merge=merge_steps)
+        run.totals.add(step_run.totals)
+        run.report.merge(step_run.report)
+        return results["step"]
+
+    return find_saturation(name, run_step, step_rates(args.start_rate, args.step, args.max_rate), policy)
+
+
+def print_summary(reports, policy: SloPolicy, run: JobRun = None):
+    """
+    Exibe a maior taxa sustentável de cada mix
+    """
+    print("\n" + "=" * 70)
+    print("📊 CAPACIDADE POR MIX DE ATAQUE")
+    print("=" * 70)
+    print(
+        f"SLO: p99 ≤ {policy.p99 * 1000:.0f}ms | erros ≤ {policy.error_rate * 100:.1f}% | "
+        f"goodput ≥ {policy.plateau * 100:.0f}% do aumento ofertado"
+    )
+    print(f"\n{'mix':<20} {'sustentável':>12} {'goodput':>9} {'p99':>9}  parou por")
+
+    for report in reports:
+        step = report.sustainable
+        reason = report.reason or "--max-rate sem saturar"
+        if step is None:
+            below = f"< {report.steps[0].rate:g} r/s"
+            print(f"{report.name[:20]:<20} {below:>12} {'-':>9} {'-':>9}  {reason}")
+        else:
+            print(
+                f"{report.name[:20]:<20} {step.rate:>8g} r/s {step.goodput:>9.1f} "
+                f"{step.p99 * 1000:>7.1f}ms  {reason}"
+            )
+
+    if run is not None:
+        print()
+        print_engine_stats(run.totals)
+        run.report.print()
+
+    print("=" * 70 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Encontra a maior taxa sustentável do WAF para cada mix de ataques"
+    )
+    parser.add_argument(
+        "--mix",
+        action="append",
+        metavar="MIX",
+        help=f"Mix medido: {', '.join(MIXES)} ou \"sqli:0.7,xss:0.3\" "
+        "(pode repetir; padrão: sqli-heavy e honeypot-heavy)",
+    )
+    parser.add_argument(
+        "--start-rate",
+        type=float,
+        default=50.0,
+        help="Taxa do primeiro degrau em req/s (padrão: 50)",
+    )
+    parser.add_argument(
+        "--step",
+        type=float,
+        default=50.0,
+        help="Aumento da taxa a cada degrau em req/s (padrão: 50)",
+    )
+    parser.add_argument(
+        "--step-duration",
+        type=float,
+        default=30.0,
+        help="Segundos de cada degrau (padrão: 30)",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        help="Para a rampa nesta taxa mesmo sem saturar (padrão: sem limite)",
+    )
+    parser.add_argument(
+        "--slo-p99",
+        type=float,
+        default=500.0,
+        help="p99 máximo em ms (padrão: 500)",
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=1.0,
+        help="Erros máximos em %% - transporte, timeout, 5xx e 429 (padrão: 1)",
+    )
+    parser.add_argument(
+        "--plateau",
+        type=float,
+        default=0.25,
+        help="Ganho mínimo de goodput por degrau, em fração do aumento ofertado (padrão: 0.25)",
+    )
+
+    add_engine_arguments(parser)
+    # Os degraus são sempre open-loop: o motor dimensiona o pool pela taxa do degrau
+    parser.set_defaults(open_loop=True)
+
+    args = parser.parse_args()
+
+    mixes = args.mix or ["sqli-heavy", "honeypot-heavy"]
+    try:
+        for name in mixes:
+            parse_phase_mix(MIXES.get(name, name))
+    except ValueError as e:
+        parser.error(str(e))
+    if min(args.start_rate, args.step, args.step_duration) <= 0:
+        parser.error("--start-rate, --step e --step-duration precisam ser positivos")
+    if args.checkpoint:
+        # Cada degrau é uma medição curta e independente: não há o que retomar
+        parser.error("--checkpoint não se aplica ao teste de capacidade")
+
+    policy = SloPolicy(
+        p99=args.slo_p99 / 1000,
+        error_rate=args.max_error_rate / 100,
+        plateau=args.plateau,
+    )
+
+    print("\n" + "=" * 70)
+    print("📈 WAF CAPACITY TEST")
+    print("=" * 70)
+    print(f"Target:  {args.base_url}")
+    print(f"Mixes:   {', '.join(mixes)}")
+    print(
+        f"Rampa:   {args.start_rate:g} req/s + {args.step:g} a cada {args.step_duration:g}s"
+        + (f" até {args.max_rate:g}" if args.max_rate else "")
+    )
+    print(f"Workers: {args.workers}")
+    print("=" * 70)
+
+    reports = []
+    run = JobRun()
+
+    try:
+        for name in mixes:
+            reports.append(measure_mix(args, name, policy, run))
+        print_summary(reports, policy, run)
+
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Teste interrompido pelo usuário")
+        print_summary([report for report in reports if report.steps], policy)
+
+
+if __name__ == "__main__":
+    main()
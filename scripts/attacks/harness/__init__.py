@@ -0,0 +1,37 @@
+"""
+Harness compartilhado dos scripts de ataque controlado
+"""
+
+from .cli import add_engine_arguments, engine_from_args, print_engine_stats
+from .engine import AttackRequest, AttackResult, EngineStats, LoadEngine, open_loop_pool_size
+from .histogram import LatencyHistogram
+from .pool import ConnectionStats, PipelinedTransport, SessionTransport
+from .profiling import ClientProfile, ClientProfiler
+from .rates import RateProfile
+from .report import LatencyReport
+from .sink import ResultSink
+from .workers import JobRun, Shard, merge_counters, run_job
+
+__all__ = [
+    "AttackRequest",
+    "AttackResult",
+    "ClientProfile",
+    "ClientProfiler",
+    "ConnectionStats",
+    "EngineStats",
+    "JobRun",
+    "LatencyHistogram",
+    "LatencyReport",
+    "LoadEngine",
+    "PipelinedTransport",
+    "RateProfile",
+    "ResultSink",
+    "SessionTransport",
+    "Shard",
+    "add_engine_arguments",
+    "engine_from_args",
+    "merge_counters",
+    "open_loop_pool_size",
+    "print_engine_stats",
+    "run_job",
+]
@@ -0,0 +1,212 @@
+"""
+Matriz de benchmark do WAF (modo x família de tráfego) e comparação com baseline
+
+Cada célula roda uma família de tráfego em taxa fixa contra o servidor
+em um WAF_MODE e guarda vazão, percentis de latência e taxa de
+bloqueio. O resultado vai para um JSON que serve de baseline para as
+próximas execuções: uma célula que ficou mais lenta, perdeu vazão ou
+passou a bloquear mais (ou menos) que o limite é uma regressão.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .report import PERCENTILES
+from .saturation import StepResult
+
+# Versão do formato do arquivo de resultados
+FORMAT = 1
+
+MODES = ("test", "production")
+# Famílias da matriz, na ordem de execução (tipos de fase de harness.phases)
+FAMILIES = ("clean", "sqli", "xss", "path_traversal", "honeypot")
+# Os honeypots ficam fora do WAF: os ataques vão para rotas que passam pela detecção
+FAMILY_OPTIONS = {
+    "xss": {"target": "post"},
+    "path_traversal": {"endpoints": ["/users", "/auth/me"]},
+}
+
+# 403 da detecção por conteúdo; o da blocklist responde só "Forbidden"
+DETECTION_MESSAGE = "Request blocked by WAF"
+
+
+@dataclass
+class CellResult(StepResult):
+    """
+    Medições de uma célula da matriz (de um worker ou de todos somados)
+
+    Além do que o StepResult conta, separa os 403 da detecção dos 403
+    da blocklist (o corpo da resposta precisa ser lido).
+    """
+
+    detected: int = 0
+    blocklisted: int = 0
+
+    def record(self, result) -> None:
+        super().record(result)
+        if result.error is None and result.status == 403:
+            if DETECTION_MESSAGE in result.text:
+                self.detected += 1
+            else:
+                self.blocklisted += 1
+
+    def merge(self, other: "CellResult") -> None:
+        super().merge(other)
+        self.detected += other.detected
+        self.blocklisted += other.blocklisted
+
+    @property
+    def block_rate(self) -> float:
+        """
+        Fração das respostas que foram 403 (detecção ou blocklist)
+        """
+        responses = self.completed - self.errors
+        return (self.detected + self.blocklisted) / responses if responses else 0.0
+
+    def to_dict(self, mode: str, family: str) -> Dict:
+        return {
+            "mode": mode,
+            "family": family,
+            "rate": self.rate,
+            "completed": self.completed,
+            "errors": self.errors,
+            "failures": self.failures,
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 2),
+            "latency_ms": {
+                **{f"p{p:g}": round(self.histogram.percentile(p) * 1000, 3) for p in PERCENTILES},
+                "mean": round(self.histogram.mean * 1000, 3),
+                "max": round(self.histogram.max * 1000, 3),
+            },
+            "block_rate": round(self.block_rate, 4),
+            "detected": self.detected,
+            "blocklisted": self.blocklisted,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+        }
+
+
+@dataclass
+class Thresholds:
+    """
+    Limites de regressão contra o baseline
+
+    Args:
+        latency: Aumento máximo do p50 e do p99, em fração (0.2 = +20%)
+        latency_floor: Aumento absoluto (segundos) abaixo do qual a latência
+            nunca é regressão (ruído de medições sub-milissegundo)
+        throughput: Queda máxima de vazão, em fração
+        block_rate: Variação máxima da taxa de bloqueio, em pontos (0.05 = 5 p.p.)
+    """
+
+    latency: float = 0.2
+    latency_floor: float = 0.001
+    throughput: float = 0.1
+    block_rate: float = 0.05
+
+
+@dataclass
+class Regression:
+    mode: str
+    family: str
+    metric: str
+    baseline: float
+    current: float
+    limit: str
+
+
+def save_results(path: str, cells: List[Dict], settings: Dict) -> None:
+    document = {
+        "format": FORMAT,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "settings": settings,
+        "cells": cells,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict:
+    """
+    Lê um arquivo gravado por save_results() (SystemExit se inválido)
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+    except FileNotFoundError:
+        raise SystemExit(f"❌ Baseline não encontrado: {path}")
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"❌ Baseline ilegível: {path} ({e})")
+
+    if not isinstance(document, dict) or document.get("format") != FORMAT:
+        raise SystemExit(f"❌ Baseline em formato desconhecido: {path}")
+    return document
+
+
+def compare_cells(
+    cells: List[Dict],
+    baseline: List[Dict],
+    thresholds: Thresholds,
+) -> Tuple[List[Regression], List[Tuple[str, str]]]:
+    """
+    Regressões das células em relação ao baseline
+
+    Devolve também as células sem par no baseline (não comparadas).
+    """
+    previous = {(cell["mode"], cell["family"]): cell for cell in baseline}
+    regressions: List[Regression] = []
+    unmatched: List[Tuple[str, str]] = []
+
+    for cell in cells:
+        mode, family = cell["mode"], cell["family"]
+        old = previous.get((mode, family))
+        if old is None:
+            unmatched.append((mode, family))
+            continue
+
+        for percentile in ("p50", "p99"):
+            before, after = old["latency_ms"][percentile], cell["latency_ms"][percentile]
+            if after - before > thresholds.latency_floor * 1000 and after > before * (1 + thresholds.latency):
+                regressions.append(Regression(
+                    mode, family, f"{percentile} (ms)", before, after, f"+{thresholds.latency * 100:g}%"
+                ))
+
+        before, after = old["throughput"], cell["throughput"]
+        if after < before * (1 - thresholds.throughput):
+            regressions.append(Regression(
+                mode, family, "vazão (req/s)", before, after, f"-{thresholds.throughput * 100:g}%"
+            ))
+
+        before, after = old["block_rate"], cell["block_rate"]
+        if abs(after - before) > thresholds.block_rate:
+            regressions.append(Regression(
+                mode, family, "bloqueio (%)", before * 100, after * 100, f"±{thresholds.block_rate * 100:g} p.p."
+            ))
+
+    return regressions, unmatched
+
+
+def print_matrix(cells: List[Dict], baseline: Optional[List[Dict]] = None) -> None:
+    """
+    Tabela modo x família (com a variação do p99 quando há baseline)
+    """
+    previous = {(cell["mode"], cell["family"]): cell for cell in baseline or []}
+
+    print(
+        f"{'modo':<11} {'família':<15} {'vazão':>9} {'p50':>9} {'p90':>9} {'p99':>9} "
+        f"{'p99.9':>9} {'bloqueio':>9}" + ("  p99 vs baseline" if baseline else "")
+    )
+    for cell in cells:
+        latency = cell["latency_ms"]
+        line = (
+            f"{cell['mode']:<11} {cell['family']:<15} {cell['throughput']:>9.1f} "
+            f"{latency['p50']:>7.2f}ms {latency['p90']:>7.2f}ms {latency['p99']:>7.2f}ms "
+            f"{latency['p99.9']:>7.2f}ms {cell['block_rate'] * 100:>8.1f}%"
+        )
+        old = previous.get((cell["mode"], cell["family"]))
+        if old is not None and old["latency_ms"]["p99"] > 0:
+            change = latency["p99"] / old["latency_ms"]["p99"] - 1
+            line += f"  {change * 100:+15.1f}%"
+        print(line)
@@ -0,0 +1,298 @@
+"""
+Checkpoint e retomada de campanhas longas (--checkpoint / --resume)
+
+O motor grava periodicamente, de forma atômica, o que é preciso para
+continuar uma execução interrompida: quais requisições de cada run()
+já terminaram, o estado que o script registrou (contadores, conjuntos
+de IPs...), os histogramas de latência e os totais do motor. Numa
+retomada as agendas são regeradas na mesma ordem (o `random` global
+volta com a mesma semente) e as requisições já concluídas são puladas
+sem envio.
+"""
+
+import argparse
+import copy
+import os
+import pickle
+import random
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from .report import LatencyReport
+from .sink import shard_path
+
+# Segundos entre gravações periódicas
+CHECKPOINT_INTERVAL = 10.0
+# Versão do formato do arquivo
+FORMAT = 1
+
+
+@dataclass
+class RunCursor:
+    """
+    Progresso de uma chamada de run(), pela ordem de geração das requisições
+
+    As requisições antes de `position` terminaram todas; `ahead` guarda
+    as que terminaram fora de ordem depois dela (no máximo as que
+    estavam em voo).
+    """
+
+    key: str
+    position: int = 0
+    ahead: Set[int] = field(default_factory=set)
+    # Segundos de execução já cumpridos: duração e agenda continuam daqui
+    elapsed: float = 0.0
+    finished: bool = False
+    # (concluídas, erros, segundos) da execução em andamento já somados aos totais salvos
+    partial: Optional[Tuple[int, int, float]] = None
+
+    def __contains__(self, index: int) -> bool:
+        return index < self.position or index in self.ahead
+
+    def add(self, index: int) -> None:
+        if index != self.position:
+            self.ahead.add(index)
+            return
+        self.position += 1
+        while self.position in self.ahead:
+            self.ahead.remove(self.position)
+            self.position += 1
+
+
+class Checkpoint:
+    """
+    Estado de retomada de um processo gerador de carga
+
+    O motor chama `begin()`/`end()` em cada run() e `completed()` a cada
+    resposta tratada; a gravação acontece no event loop, entre dois
+    handlers, então contadores e cursores ficam sempre coerentes.
+
+    Args:
+        path: Arquivo do checkpoint (gravado em um temporário e renomeado)
+        interval: Segundos mínimos entre gravações periódicas
+        shards: Número de workers da execução (precisa ser o mesmo na retomada)
+    """
+
+    def __init__(self, path: str, interval: float = CHECKPOINT_INTERVAL, shards: int = 1):
+        self.path = path
+        self.interval = interval
+        self.shards = shards
+        self.command = [arg for arg in sys.argv[1:] if arg != "--resume"]
+        self.seed = random.randrange(1 << 32)
+        self.resumed = False
+        # Segundos de execução das sessões anteriores (0 sem retomada)
+        self.elapsed = 0.0
+
+        self.engine = None
+        self.cursors: Dict[str, RunCursor] = {}
+        self.state: Dict[str, Any] = {}
+        self._saved: Dict[str, Any] = {}
+        self._names: Counter = Counter()
+        # Execuções em andamento: chave -> (fase, EngineStats, início)
+        self._active: Dict[str, Tuple[str, Any, float]] = {}
+        self._attached = 0.0
+        self._next_save = 0.0
+        self._warned = False
+
+    def load(self) -> None:
+        """
+        Lê o checkpoint de uma execução anterior (antes de `attach()`)
+        """
+        try:
+            with open(self.path, "rb") as f:
+                saved = pickle.load(f)
+        except FileNotFoundError:
+            raise SystemExit(f"❌ Checkpoint não encontrado: {self.path} (rode sem --resume para começar)")
+        except (OSError, EOFError, AttributeError, pickle.UnpicklingError) as e:
+            raise SystemExit(f"❌ Checkpoint ilegível: {self.path} ({e})")
+
+        if not isinstance(saved, dict) or saved.get("format") != FORMAT:
+            raise SystemExit(f"❌ Checkpoint em formato desconhecido: {self.path}")
+        if saved["shards"] != self.shards:
+            raise SystemExit(f"❌ {self.path} foi gravado com --workers {saved['shards']}")
+        if saved["command"] != self.command:
+            print(f"⚠️  Checkpoint gravado com outros argumentos: {' '.join(saved['command'])}")
+
+        self.seed = saved["seed"]
+        self.elapsed = saved["elapsed"]
+        self.cursors = saved["cursors"]
+        self._saved = saved
+        self.resumed = True
+
+    def attach(self, engine) -> None:
+        """
+        Liga o checkpoint ao motor (restaurando totais e relatório numa retomada)
+        """
+        self.engine = engine
+        engine.checkpoint = self
+        if self.resumed:
+            engine.totals = self._saved["totals"]
+            engine.report = LatencyReport.from_dict(self._saved["report"])
+        random.seed(self.seed)
+        self._attached = time.perf_counter()
+        self._next_save = self._attached + self.interval
+
+    def restore(self, name: str, value: Any) -> Any:
+        """
+        Estado registrado pelo script; numa retomada, o objeto salvo
+
+        Nomes repetidos (a mesma função chamada duas vezes) são
+        numerados pela ordem de registro.
+        """
+        key = self._key(name)
+        value = self._saved.get("state", {}).get(key, value)
+        self.state[key] = value
+        return value
+
+    def begin(self, phase: str, stats, resumable: bool = True) -> RunCursor:
+        """
+        Cursor de uma chamada de run(), na ordem em que as chamadas acontecem
+
+        Uma execução não retomável interrompida no meio é descartada
+        (totais e relatório da fase voltam ao que eram antes dela) e
+        recomeça do zero.
+        """
+        key = self._key(f"run:{phase}")
+        cursor = self.cursors.get(key)
+        if cursor is not None and not cursor.finished and not resumable:
+            self._discard(phase, cursor)
+            cursor = None
+        if cursor is None:
+            cursor = self.cursors[key] = RunCursor(key)
+
+        if not cursor.finished:
+            self._active[key] = (phase, stats, time.perf_counter())
+        return cursor
+
+    def pending(
+        self,
+        requests: Iterable,
+        cursor: RunCursor,
+        positions: Dict[int, int],
+    ) -> Iterator:
+        """
+        Requisições ainda não concluídas; anota o índice de cada uma em `positions`
+        """
+        for index, request in enumerate(requests):
+            if index in cursor:
+                continue
+            positions[id(request)] = index
+            yield request
+
+    def completed(self, cursor: RunCursor, index: int) -> None:
+        cursor.add(index)
+        if time.perf_counter() >= self._next_save:
+            self.save()
+
+    def end(self, cursor: RunCursor) -> None:
+        _, _, started = self._active.pop(cursor.key)
+        cursor.elapsed += time.perf_counter() - started
+        cursor.finished = True
+        cursor.partial = None
+        self.save()
+
+    def save(self) -> None:
+        """
+        Grava o estado atual (as execuções em andamento entram com o que já concluíram)
+        """
+        now = time.perf_counter()
+        totals = copy.deepcopy(self.engine.totals)
+        report = self.engine.report.to_dict()
+        cursors = dict(self.cursors)
+
+        longest = 0.0
+        for key, (phase, stats, started) in self._active.items():
+            elapsed = now - started
+            longest = max(longest, elapsed)
+
+            cursor = cursors[key] = copy.copy(self.cursors[key])
+            cursor.elapsed += elapsed
+            cursor.partial = (stats.completed, stats.errors, elapsed)
+
+            # Só o que terminou: o que estava em voo é reenviado na retomada
+            totals.sent += stats.completed
+            totals.completed += stats.completed
+            totals.errors += stats.errors
+            totals.max_send_lag = max(totals.max_send_lag, stats.max_send_lag)
+            report["phase_elapsed"][phase] = report["phase_elapsed"].get(phase, 0.0) + elapsed
+        # Execuções simultâneas (campaign.py) se sobrepõem no tempo
+        totals.elapsed += longest
+
+        snapshot = {
+            "format": FORMAT,
+            "command": self.command,
+            "shards": self.shards,
+            "seed": self.seed,
+            "elapsed": self.elapsed + now - self._attached,
+            "cursors": cursors,
+            "state": self.state,
+            "totals": totals,
+            "report": report,
+        }
+
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+        except (OSError, TypeError, AttributeError, pickle.PicklingError) as e:
+            if not self._warned:
+                self._warned = True
+                print(f"⚠️  Falha ao gravar o checkpoint {self.path}: {e}")
+
+        self._next_save = time.perf_counter() + self.interval
+
+    def _discard(self, phase: str, cursor: RunCursor) -> None:
+        totals, report = self.engine.totals, self.engine.report
+        if cursor.partial is not None:
+            completed, errors, elapsed = cursor.partial
+            totals.sent -= completed
+            totals.completed -= completed
+            totals.errors -= errors
+            totals.elapsed -= elapsed
+        for key in [key for key in report.histograms if key[0] == phase]:
+            del report.histograms[key]
+        for key in [key for key in report.errors if key[0] == phase]:
+            del report.errors[key]
+        report.phase_elapsed.pop(phase, None)
+
+    def _key(self, name: str) -> str:
+        occurrence = self._names[name]
+        self._names[name] += 1
+        return f"{name}#{occurrence}" if occurrence else name
+
+
+@contextmanager
+def checkpointing(engine, args: argparse.Namespace, shard) -> Iterator[Optional[Checkpoint]]:
+    """
+    Liga --checkpoint/--resume ao motor durante um job
+
+    Com --workers cada processo grava o seu arquivo (campanha.w0.ckpt,
+    ...). A última gravação acontece na saída, inclusive num Ctrl+C.
+    """
+    path = getattr(args, "checkpoint", None)
+    if not path:
+        yield None
+        return
+
+    if shard.count > 1:
+        path = shard_path(path, shard.index)
+    checkpoint = Checkpoint(path, args.checkpoint_interval, shard.count)
+    if args.resume:
+        checkpoint.load()
+    checkpoint.attach(engine)
+    try:
+        yield checkpoint
+    finally:
+        checkpoint.save()
+
+
+def print_checkpoint_hint(args: argparse.Namespace) -> None:
+    if getattr(args, "checkpoint", None):
+        print(f"💾 Progresso salvo em {args.checkpoint}: repita o comando com --resume para continuar")
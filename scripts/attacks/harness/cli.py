@@ -0,0 +1,182 @@
+"""
+Argumentos de linha de comando comuns do motor de carga
+"""
+
+import argparse
+
+from .checkpoint import CHECKPOINT_INTERVAL
+from .console import Console, wants_dashboard
+from .engine import LoadEngine, open_loop_pool_size
+from .pool import PipelinedTransport, SessionTransport
+from .sink import ResultSink
+
+DEFAULT_BASE_URL = "http://localhost:3000"
+
+
+def add_engine_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adiciona as opções do motor (concorrência, taxa e pool de conexões)
+    """
+    group = parser.add_argument_group("motor de carga")
+    group.add_argument(
+        "--base-url",
+        default=DEFAULT_BASE_URL,
+        help=f"URL base do alvo (padrão: {DEFAULT_BASE_URL}; ex.: o mock_server.py)",
+    )
+    group.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Requisições simultâneas em voo (padrão: 1 - serial)",
+    )
+    group.add_argument(
+        "--rate",
+        type=float,
+        help="Taxa alvo em req/s (padrão: derivada de --delay, ou sem limite)",
+    )
+    group.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos geradores de carga; --concurrency e --rate são divididos entre eles (padrão: 1)",
+    )
+    group.add_argument(
+        "--timeout",
+        type=float,
+        default=5.0,
+        help="Timeout por requisição em segundos (padrão: 5)",
+    )
+    group.add_argument(
+        "--open-loop",
+        action="store_true",
+        help="Dispara em taxa constante sem esperar respostas (exige --rate ou --delay)",
+    )
+    group.add_argument(
+        "--pool-size",
+        type=int,
+        help="Máximo de conexões TCP abertas (padrão: igual a --concurrency; em open-loop, taxa x timeout)",
+    )
+    group.add_argument(
+        "--no-keepalive",
+        action="store_true",
+        help="Abre uma conexão nova por requisição (mede o custo de handshake)",
+    )
+    group.add_argument(
+        "--pipeline",
+        type=int,
+        default=1,
+        help="Requisições em voo por conexão via HTTP pipelining (padrão: 1 - desligado)",
+    )
+    group.add_argument(
+        "--output",
+        metavar="ARQUIVO",
+        help="Grava cada resultado em NDJSON (.ndjson.gz comprime; com --workers, um arquivo por worker)",
+    )
+    group.add_argument(
+        "--profile",
+        metavar="ARQUIVO",
+        help="Perfila o próprio cliente (CPU por amostragem + janela curta de tracemalloc) e grava as pilhas "
+        "no formato collapsed de flame graph",
+    )
+    group.add_argument(
+        "--log",
+        metavar="ARQUIVO",
+        help="Grava as linhas por requisição em um arquivo (o terminal mostra só o painel)",
+    )
+    group.add_argument(
+        "--no-dashboard",
+        action="store_true",
+        help="Desliga o painel ao vivo (req/s, em voo, status, bloqueio, p99)",
+    )
+    group.add_argument(
+        "--checkpoint",
+        metavar="ARQUIVO",
+        help="Grava o progresso periodicamente para retomar com --resume (com --workers, um arquivo por worker)",
+    )
+    group.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=CHECKPOINT_INTERVAL,
+        metavar="SEGUNDOS",
+        help=f"Segundos entre gravações do checkpoint (padrão: {CHECKPOINT_INTERVAL:g})",
+    )
+    group.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continua a execução do --checkpoint de onde parou (repita os mesmos argumentos)",
+    )
+
+
+def engine_from_args(args: argparse.Namespace) -> LoadEngine:
+    """
+    Cria o LoadEngine a partir dos argumentos parseados
+
+    Sem --rate explícito, um --delay > 0 vira a taxa equivalente
+    (1/delay req/s), preservando o ritmo dos scripts antigos.
+    Com --open-loop essa taxa passa a ser uma agenda fixa de chegadas e,
+    sem --pool-size, o pool é dimensionado por ela (open_loop_pool_size).
+    Com --resume, --output e --log continuam os arquivos existentes.
+    """
+    rate = args.rate
+    delay = getattr(args, "delay", 0) or 0
+    if rate is None and delay > 0:
+        rate = 1.0 / delay
+    if args.open_loop and not rate:
+        raise SystemExit("--open-loop exige uma taxa alvo (--rate ou --delay > 0)")
+    resume = getattr(args, "resume", False)
+    if resume and not getattr(args, "checkpoint", None):
+        raise SystemExit("--resume exige --checkpoint")
+
+    pool_size = args.pool_size
+    if not pool_size:
+        pool_size = args.concurrency
+        if args.open_loop:
+            pool_size = max(pool_size, open_loop_pool_size(rate, args.timeout))
+    if args.pipeline > 1:
+        if not (args.base_url or DEFAULT_BASE_URL).startswith("http://"):
+            # O transporte com pipelining fala HTTP puro, sem TLS
+            raise SystemExit("--pipeline > 1 exige uma --base-url http://")
+        transport = PipelinedTransport(
+            pool_size=pool_size,
+            depth=args.pipeline,
+            timeout=args.timeout,
+        )
+    else:
+        transport = SessionTransport(
+            pool_size=pool_size,
+            keepalive=not args.no_keepalive,
+            timeout=args.timeout,
+        )
+
+    return LoadEngine(
+        concurrency=args.concurrency,
+        rate=rate,
+        timeout=args.timeout,
+        transport=transport,
+        open_loop=args.open_loop,
+        sink=ResultSink(args.output, append=resume) if args.output else None,
+        base_url=args.base_url or DEFAULT_BASE_URL,
+        console=Console(
+            log_path=getattr(args, "log", None),
+            append=resume,
+            live=wants_dashboard(args),
+            publish=getattr(args, "dashboard_channel", None),
+            worker=getattr(args, "worker_index", 0),
+        ),
+    )
+
+
+def print_engine_stats(stats) -> None:
+    """
+    Linha de throughput usada nos relatórios dos scripts
+    """
+    print(f"Requisições: {stats.completed} em {stats.elapsed:.2f}s ({stats.throughput:.1f} req/s)")
+    print(
+        f"Conexões:    {stats.connections.opened} abertas, "
+        f"{stats.connections.reused} reaproveitadas "
+        f"({stats.connections.reuse_rate * 100:.1f}% reuso)"
+    )
+    if stats.open_loop:
+        print(f"Open-loop:   atraso máximo de envio {stats.max_send_lag * 1000:.1f}ms")
+    if stats.client is not None:
+        stats.client.print()
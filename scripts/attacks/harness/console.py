@@ -0,0 +1,373 @@
+"""
+Saída de console dos scripts: painel ao vivo e log por requisição
+
+Imprimir uma linha por requisição trava o event loop em milhares de
+req/s. Aqui o loop só incrementa contadores; uma thread redesenha um
+painel algumas vezes por segundo e as linhas por requisição vão, se
+pedidas, para um arquivo com buffer.
+"""
+
+import argparse
+import io
+import queue
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, TextIO, Tuple
+
+from .histogram import LatencyHistogram
+
+# Redesenhos por segundo do painel
+REFRESH_RATE = 4
+# Segundos cobertos pelo p99 do painel (fatias de 1s)
+ROLLING_WINDOW = 5
+
+Snapshot = Dict[str, Any]
+
+
+def wants_dashboard(args: argparse.Namespace) -> bool:
+    """
+    Painel ao vivo só em terminal interativo e sem --no-dashboard
+    """
+    return not getattr(args, "no_dashboard", False) and sys.stdout.isatty()
+
+
+class LiveStats:
+    """
+    Contadores atualizados pelo event loop a cada envio e resposta
+
+    O p99 é calculado sobre as últimas ROLLING_WINDOW fatias de um
+    segundo (timeouts incluídos); quem gira as fatias é a thread do
+    painel, então o caminho de envio não consulta o relógio.
+    """
+
+    def __init__(self):
+        self.sent = 0
+        self.completed = 0
+        self.errors = 0
+        self.statuses: Counter = Counter()
+        self.slices: Deque[LatencyHistogram] = deque([LatencyHistogram()], maxlen=ROLLING_WINDOW)
+
+    def record_sent(self) -> None:
+        self.sent += 1
+
+    def record(self, result) -> None:
+        self.completed += 1
+        if result.error is not None:
+            self.errors += 1
+            if result.timed_out:
+                self.slices[-1].record(result.latency)
+            return
+        self.statuses[result.status] += 1
+        self.slices[-1].record(result.latency)
+
+    def rotate(self) -> None:
+        self.slices.append(LatencyHistogram())
+
+    def snapshot(self) -> Snapshot:
+        rolling = LatencyHistogram()
+        for histogram in list(self.slices):
+            rolling.merge(histogram)
+        return {
+            "sent": self.sent,
+            "completed": self.completed,
+            "errors": self.errors,
+            "statuses": dict(self.statuses),
+            "rolling": rolling.to_dict(),
+        }
+
+
+def merge_snapshots(snapshots: List[Snapshot]) -> Snapshot:
+    merged: Snapshot = {"sent": 0, "completed": 0, "errors": 0, "statuses": Counter()}
+    rolling = LatencyHistogram()
+    for snapshot in snapshots:
+        for key in ("sent", "completed", "errors"):
+            merged[key] += snapshot[key]
+        merged["statuses"].update(snapshot["statuses"])
+        rolling.merge(LatencyHistogram.from_dict(snapshot["rolling"]))
+    merged["rolling"] = rolling
+    return merged
+
+
+class LiveView:
+    """
+    Painel redesenhado no lugar com ANSI, em uma thread própria
+
+    Enquanto o painel está ativo, `sys.stdout` é desviado: qualquer
+    print() (avisos, cabeçalhos de fase) aparece acima do painel em
+    vez de corrompê-lo. Subclasses definem de onde vêm os números.
+    """
+
+    def __init__(self, refresh: float = 1.0 / REFRESH_RATE):
+        self.refresh = refresh
+        self._out: TextIO = sys.stdout
+        self._lock = threading.Lock()
+        self._frame_lines = 0
+        self._last_frame: List[str] = []
+        self._history: Deque[Tuple[float, int]] = deque()
+        self._started = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._out = sys.stdout
+        sys.stdout = _LineWriter(self.event)
+        self._started = time.perf_counter()
+        self._history.clear()
+        self._history.append((self._started, merge_snapshots(self.collect())["completed"]))
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._render_loop, name="live-view", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+        if isinstance(sys.stdout, _LineWriter):
+            sys.stdout.flush()
+        sys.stdout = self._out
+        with self._lock:
+            self._clear()
+            self._last_frame = []
+            self._out.flush()
+
+    def event(self, line: str) -> None:
+        """
+        Imprime uma linha acima do painel
+        """
+        with self._lock:
+            self._clear()
+            self._out.write(line + "\n")
+            self._draw(self._last_frame)
+
+    def collect(self) -> List[Snapshot]:
+        raise NotImplementedError
+
+    def tick(self) -> None:
+        """
+        Chamado uma vez por segundo pela thread do painel
+        """
+
+    def _render_loop(self) -> None:
+        next_tick = time.perf_counter() + 1.0
+        while not self._stopped.wait(self.refresh):
+            now = time.perf_counter()
+            if now >= next_tick:
+                self.tick()
+                next_tick += 1.0
+
+            frame = self._frame(merge_snapshots(self.collect()), now)
+            with self._lock:
+                self._clear()
+                self._draw(frame)
+
+    def _frame(self, stats: Snapshot, now: float) -> List[str]:
+        # Vazão da última ~1s a partir do histórico de respostas concluídas
+        self._history.append((now, stats["completed"]))
+        while len(self._history) > 2 and now - self._history[1][0] >= 1.0:
+            self._history.popleft()
+        first_at, first_completed = self._history[0]
+        rate = (stats["completed"] - first_completed) / (now - first_at) if now > first_at else 0.0
+
+        statuses = stats["statuses"]
+        answered = sum(statuses.values())
+        blocked = statuses.get(403, 0) / answered * 100 if answered else 0.0
+        p99 = stats["rolling"].percentile(99) * 1000
+        codes = " | ".join(f"{code}: {count}" for code, count in sorted(statuses.items()))
+
+        return [
+            f"⚡ {rate:9.1f} req/s | em voo: {stats['sent'] - stats['completed']:>5d} | "
+            f"concluídas: {stats['completed']:>9d} | bloqueio: {blocked:5.1f}% | "
+            f"p99 ({ROLLING_WINDOW}s): {p99:7.1f}ms | {now - self._started:5.0f}s",
+            f"   status → {codes or '-'} | erros: {stats['errors']}",
+        ]
+
+    def _clear(self) -> None:
+        if self._frame_lines:
+            # Sobe até a primeira linha do painel e apaga até o fim da tela
+            self._out.write(f"\x1b[{self._frame_lines}F\x1b[J")
+            self._frame_lines = 0
+
+    def _draw(self, frame: List[str]) -> None:
+        if frame:
+            self._out.write("\n".join(frame) + "\n")
+        self._out.flush()
+        self._frame_lines = len(frame)
+        self._last_frame = frame
+
+
+class _LineWriter(io.TextIOBase):
+    """
+    Substituto de sys.stdout que entrega linhas completas a uma função
+    """
+
+    def __init__(self, emit):
+        self._emit = emit
+        self._buffer = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            self._emit(line)
+        return len(text)
+
+    def flush(self) -> None:
+        if self._buffer:
+            line, self._buffer = self._buffer, ""
+            self._emit(line)
+
+
+class Console:
+    """
+    Saída de um motor de carga: log por requisição, estatísticas e painel
+
+    `log()` é para as linhas por requisição: vão para o arquivo de
+    `log_path` (com buffer) ou são descartadas, nunca para o terminal.
+    Prints comuns continuam funcionando e, com o painel ativo, aparecem
+    acima dele.
+
+    Com `publish` (uma fila de multiprocessing) o painel não é
+    desenhado aqui: os números e as linhas impressas são enviados ao
+    processo pai, que junta todos os workers em um único painel.
+
+    Args:
+        log_path: Arquivo das linhas por requisição (None = descartar)
+        live: Mostra o painel ao vivo durante as execuções
+        publish: Fila para enviar estatísticas e prints ao processo pai
+        worker: Índice deste worker (com `publish`)
+        append: Continua o arquivo de log existente (retomada de checkpoint)
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[str] = None,
+        live: bool = False,
+        publish=None,
+        worker: int = 0,
+        append: bool = False,
+    ):
+        self.log_path = log_path
+        self.stats = LiveStats()
+        self._log: Optional[TextIO] = (
+            open(log_path, "a" if append else "w", encoding="utf-8", buffering=1 << 20) if log_path else None
+        )
+
+        self._view: Optional[LiveView] = None
+        if publish is not None:
+            self._view = _Publisher(self.stats, publish, worker)
+            # Tudo que o worker imprimir vai para o painel do pai
+            self._view.start()
+        elif live:
+            self._view = _LocalView(self.stats)
+
+    def log(self, line: str) -> None:
+        if self._log is not None:
+            self._log.write(line + "\n")
+
+    def start(self) -> None:
+        """
+        Chamado pelo motor quando uma execução começa
+        """
+        if isinstance(self._view, _LocalView):
+            self._view.start()
+
+    def stop(self) -> None:
+        """
+        Chamado pelo motor quando a última execução em andamento termina
+        """
+        if isinstance(self._view, _LocalView):
+            self._view.stop()
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.stop()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+class _LocalView(LiveView):
+    def __init__(self, stats: LiveStats):
+        super().__init__()
+        self.stats = stats
+
+    def collect(self) -> List[Snapshot]:
+        return [self.stats.snapshot()]
+
+    def tick(self) -> None:
+        self.stats.rotate()
+
+
+class _Publisher(LiveView):
+    """
+    Lado do worker: envia snapshots e linhas impressas para o pai
+    """
+
+    def __init__(self, stats: LiveStats, channel, worker: int):
+        super().__init__()
+        self.stats = stats
+        self.channel = channel
+        self.worker = worker
+
+    def collect(self) -> List[Snapshot]:
+        return [self.stats.snapshot()]
+
+    def event(self, line: str) -> None:
+        self.channel.put(("event", self.worker, line))
+
+    def tick(self) -> None:
+        self.stats.rotate()
+
+    def _render_loop(self) -> None:
+        next_tick = time.perf_counter() + 1.0
+        while not self._stopped.wait(self.refresh):
+            if time.perf_counter() >= next_tick:
+                self.tick()
+                next_tick += 1.0
+            self.channel.put(("stats", self.worker, self.stats.snapshot()))
+
+        self.channel.put(("stats", self.worker, self.stats.snapshot()))
+
+
+class Dashboard(LiveView):
+    """
+    Lado do pai com --workers: um painel com os números de todos os workers
+    """
+
+    def __init__(self, channel):
+        super().__init__()
+        self.channel = channel
+        self.latest: Dict[int, Snapshot] = {}
+
+    def collect(self) -> List[Snapshot]:
+        while True:
+            try:
+                kind, worker, payload = self.channel.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "event":
+                self.event(payload)
+            else:
+                self.latest[worker] = payload
+        return list(self.latest.values())
+
+    def stop(self) -> None:
+        super().stop()
+        # Linhas que os workers enviaram depois do último redesenho
+        while True:
+            try:
+                kind, _, payload = self.channel.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "event":
+                print(payload)
@@ -0,0 +1,522 @@
+"""
+Motor de carga assíncrono compartilhado pelos scripts de ataque
+Substitui os loops seriais (requests + time.sleep) por um event loop
+com limite de concorrência e taxa alvo em requisições por segundo
+"""
+
+import asyncio
+import copy
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+import aiohttp
+
+from .checkpoint import Checkpoint
+from .console import Console
+from .pool import ConnectionStats, SessionTransport
+from .profiling import ClientProfile
+from .rates import Rate, RateProfile
+from .report import LatencyReport
+from .sink import ResultSink, record_of
+
+# Limite padrão de requisições pendentes em open-loop
+MAX_OUTSTANDING = 10_000
+
+
+def open_loop_pool_size(rate: float, timeout: float, max_outstanding: int = MAX_OUTSTANDING) -> int:
+    """
+    Conexões para sustentar `rate` req/s em open-loop
+
+    Sem esperar respostas, cada requisição pendente ocupa uma conexão:
+    com o alvo respondendo no limite do timeout, ficam até
+    `rate * timeout` em voo. Um pool menor enfileira as chegadas no
+    próprio cliente e a latência medida passa a ser a do pool.
+    """
+    return max(1, min(max_outstanding, math.ceil(rate * timeout)))
+
+
+@dataclass
+class AttackRequest:
+    """
+    Uma requisição a ser enviada pelo motor
+
+    `meta` carrega o contexto do script (índice, payload, endpoint...)
+    e volta intacto no AttackResult correspondente. `read_body` força
+    (True) ou dispensa (False) a leitura do corpo da resposta; o padrão
+    é decidir pelo status (ver harness.pool.wants_body). `at` é o
+    instante de envio (segundos desde o início) em execuções agendadas.
+    """
+
+    method: str
+    url: str
+    json: Any = None
+    params: Optional[Dict[str, str]] = None
+    headers: Optional[Dict[str, str]] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+    read_body: Optional[bool] = None
+    at: float = 0.0
+
+
+@dataclass
+class AttackResult:
+    """
+    Resultado de uma requisição enviada pelo motor
+    """
+
+    request: AttackRequest
+    status: Optional[int] = None
+    content_type: str = ""
+    # Vazio quando o corpo foi descartado (só o status interessava)
+    text: str = ""
+    # Tempo desde o envio planejado (inclui espera na fila no modo open-loop)
+    latency: float = 0.0
+    # Tempo desde o envio efetivo até a resposta
+    service_time: float = 0.0
+    error: Optional[BaseException] = None
+
+    @property
+    def timed_out(self) -> bool:
+        return isinstance(self.error, asyncio.TimeoutError)
+
+    def json(self) -> Any:
+        import json
+
+        return json.loads(self.text)
+
+
+@dataclass
+class EngineStats:
+    """
+    Contadores agregados de uma execução do motor
+    """
+
+    sent: int = 0
+    completed: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    open_loop: bool = False
+    # Maior atraso entre o envio planejado e o efetivo (open-loop)
+    max_send_lag: float = 0.0
+    connections: ConnectionStats = field(default_factory=ConnectionStats)
+    # Perfil do cliente (só com --profile)
+    client: Optional[ClientProfile] = None
+
+    @property
+    def throughput(self) -> float:
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def add(self, other: "EngineStats", parallel: bool = False) -> None:
+        """
+        Acumula outra execução nestes contadores
+
+        Execuções sequenciais somam o tempo decorrido; execuções paralelas
+        (outros processos) contam pelo tempo da mais longa.
+        """
+        self.sent += other.sent
+        self.completed += other.completed
+        self.errors += other.errors
+        if parallel:
+            self.elapsed = max(self.elapsed, other.elapsed)
+        else:
+            self.elapsed += other.elapsed
+        self.open_loop = self.open_loop or other.open_loop
+        self.max_send_lag = max(self.max_send_lag, other.max_send_lag)
+        self.connections.opened += other.connections.opened
+        self.connections.reused += other.connections.reused
+        if other.client is not None:
+            if self.client is None:
+                self.client = copy.deepcopy(other.client)
+            else:
+                self.client.add(other.client, parallel=parallel)
+
+
+class RatePacer:
+    """
+    Distribui os envios no tempo para respeitar uma taxa alvo (req/s)
+
+    Cada chamada a `wait()` reserva o próximo slot livre, então vários
+    workers concorrentes compartilham o mesmo orçamento de taxa.
+
+    No modo closed-loop um atraso "empurra" a agenda (o próximo slot
+    nunca fica no passado). No modo open-loop a agenda é fixa: slots
+    atrasados são disparados imediatamente, sem perder o horário
+    planejado, que é devolvido por `wait()`.
+
+    Com um RateProfile o intervalo é recalculado a cada slot com a taxa
+    do instante planejado, o que permite rampas de carga. `elapsed`
+    adianta a rampa (retomada de um checkpoint).
+    """
+
+    def __init__(self, rate: Rate, open_loop: bool = False, elapsed: float = 0.0):
+        self.profile = rate if isinstance(rate, RateProfile) else None
+        self.interval = 1.0 / rate if rate and self.profile is None else 0.0
+        self.open_loop = open_loop
+        self.elapsed = elapsed
+        self._start: Optional[float] = None
+        self._next: Optional[float] = None
+
+    async def wait(self) -> float:
+        now = time.perf_counter()
+        if not self.interval and self.profile is None:
+            return now
+
+        if self._next is None:
+            self._next = now
+            self._start = now - self.elapsed
+
+        slot = self._next if self.open_loop else max(now, self._next)
+        if self.profile is not None:
+            self._next = slot + 1.0 / self.profile.rate_at(slot - self._start)
+        else:
+            self._next = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return slot
+
+
+Handler = Callable[[AttackResult], None]
+
+T = TypeVar("T")
+
+
+def _ignore_interrupt(loop: asyncio.AbstractEventLoop, context: dict) -> None:
+    if not isinstance(context.get("exception"), KeyboardInterrupt):
+        loop.default_exception_handler(context)
+
+
+class LoadEngine:
+    """
+    Executa requisições com concorrência limitada e taxa alvo
+
+    O motor mantém um event loop próprio para que o mesmo pool de
+    conexões seja reaproveitado entre chamadas sucessivas de `run()`
+    dentro de um mesmo script. Use como context manager ou chame
+    `close()` ao final.
+
+    No modo closed-loop (padrão) cada worker só envia a próxima
+    requisição depois de receber a resposta da anterior. No modo
+    open-loop as requisições saem em taxa fixa independentemente das
+    respostas, e a latência é medida a partir do horário planejado de
+    envio, de modo que lentidão do servidor aparece como fila
+    (correção de coordinated omission).
+
+    Args:
+        concurrency: Máximo de requisições em voo (closed-loop)
+        rate: Taxa alvo em req/s ou RateProfile (None = sem limite; obrigatória em open-loop)
+        timeout: Timeout total por requisição (segundos)
+        transport: Camada de conexões (padrão: SessionTransport keep-alive)
+        open_loop: Dispara em taxa constante sem esperar respostas
+        max_outstanding: Limite de segurança de requisições pendentes em open-loop
+        sink: Grava cada resultado em NDJSON (fechado junto com o motor)
+        base_url: Prefixo das requisições com URL relativa (ex.: "/auth/login")
+        console: Painel ao vivo e log por requisição (padrão: sem painel, log descartado)
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 50,
+        rate: Rate = None,
+        timeout: float = 5.0,
+        transport=None,
+        open_loop: bool = False,
+        max_outstanding: int = MAX_OUTSTANDING,
+        sink: Optional[ResultSink] = None,
+        base_url: Optional[str] = None,
+        console: Optional[Console] = None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.timeout = timeout
+        self.open_loop = open_loop
+        self.max_outstanding = max_outstanding
+        self.sink = sink
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.console = console or Console()
+        self.transport = transport or SessionTransport(
+            pool_size=self.concurrency, timeout=timeout
+        )
+
+        # Acumulado de todas as execuções deste motor
+        self.totals = EngineStats()
+        self.report = LatencyReport()
+        # Ligado por --checkpoint (ver harness.checkpoint)
+        self.checkpoint: Optional[Checkpoint] = None
+
+        self._loop = asyncio.new_event_loop()
+        self._stopped = False
+        self._active_runs = 0
+
+    def __enter__(self) -> "LoadEngine":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def stop(self) -> None:
+        """
+        Interrompe as execuções em andamento (requisições em voo ainda terminam)
+        """
+        self._stopped = True
+
+    def checkpointed(self, name: str, value: T) -> T:
+        """
+        Registra estado do script (contadores, IPs bloqueados...) no checkpoint
+
+        Sem --checkpoint devolve o próprio `value`. Numa retomada devolve
+        o objeto salvo com o mesmo nome, que passa a ser usado no lugar.
+        Estado alterado pelo gerador de requisições também precisa ser
+        registrado: as requisições já concluídas são regeradas (e puladas).
+        """
+        if self.checkpoint is None:
+            return value
+        return self.checkpoint.restore(name, value)
+
+    def run(
+        self,
+        requests: Iterable[AttackRequest],
+        handler: Handler,
+        rate: Rate = None,
+        concurrency: Optional[int] = None,
+        phase: str = "default",
+        duration: Optional[float] = None,
+        open_loop: Optional[bool] = None,
+        scheduled: bool = False,
+        resumable: bool = True,
+    ) -> EngineStats:
+        """
+        Envia todas as requisições e chama `handler` para cada resultado
+
+        Args:
+            requests: Iterável (pode ser gerador) de AttackRequest
+            handler: Callback síncrono chamado no event loop a cada resposta
+            rate: Sobrescreve a taxa alvo do motor (req/s ou RateProfile)
+            concurrency: Sobrescreve a concorrência do motor para esta execução
+            phase: Nome da fase de ataque no relatório de latência
+            duration: Para de enviar após N segundos (útil com geradores infinitos)
+            open_loop: Sobrescreve o modo open-loop do motor para esta execução
+            scheduled: Envia cada requisição no seu `at` (agenda em ordem de
+                tempo, sem esperar respostas); ignora a taxa
+            resumable: False quando a agenda depende das respostas e não
+                dá para regerar só o que faltou: numa retomada de
+                checkpoint a execução interrompida recomeça do zero
+
+        Returns:
+            EngineStats da execução
+        """
+        return self._loop.run_until_complete(
+            self.run_async(requests, handler, rate, concurrency, phase, duration, open_loop, scheduled, resumable)
+        )
+
+    def run_all(self, runs: List[Awaitable[EngineStats]]) -> List[EngineStats]:
+        """
+        Executa várias chamadas de `run_async` ao mesmo tempo
+
+        Todas compartilham o event loop e o pool de conexões do motor.
+        O tempo e as conexões acumulados em `totals` passam a ser os do
+        conjunto: as estatísticas de cada execução se sobrepõem no tempo
+        e somá-las contaria o mesmo intervalo várias vezes.
+        """
+        before = copy.deepcopy(self.totals)
+        connections_before = self.transport.stats.snapshot()
+        started = time.perf_counter()
+
+        async def gather():
+            return await asyncio.gather(*runs)
+
+        # Interrompidas, as execuções ainda em andamento ficam de fora dos
+        # totais (o checkpoint as soma com o tempo que cada uma já correu)
+        stats = self._loop.run_until_complete(gather())
+        delta = self.transport.stats.since(connections_before)
+        self.totals.elapsed = before.elapsed + (time.perf_counter() - started)
+        self.totals.connections = ConnectionStats(
+            before.connections.opened + delta.opened,
+            before.connections.reused + delta.reused,
+        )
+        return stats
+
+    async def run_async(
+        self,
+        requests: Iterable[AttackRequest],
+        handler: Handler,
+        rate: Rate = None,
+        concurrency: Optional[int] = None,
+        phase: str = "default",
+        duration: Optional[float] = None,
+        open_loop: Optional[bool] = None,
+        scheduled: bool = False,
+        resumable: bool = True,
+    ) -> EngineStats:
+        rate = rate if rate is not None else self.rate
+        open_loop = scheduled or (self.open_loop if open_loop is None else open_loop)
+        if open_loop and not rate and not scheduled:
+            raise ValueError("O modo open-loop exige uma taxa alvo (--rate)")
+
+        stats = EngineStats(open_loop=open_loop)
+        checkpoint = self.checkpoint
+        cursor = checkpoint.begin(phase, stats, resumable) if checkpoint is not None else None
+        if cursor is not None and cursor.finished:
+            # Concluída antes da interrupção: resultados já vieram do checkpoint
+            return stats
+
+        source = iter(requests)
+        # Índice de cada requisição em voo na ordem de geração (para o cursor)
+        positions: Dict[int, int] = {}
+        if cursor is not None:
+            source = checkpoint.pending(source, cursor, positions)
+        resumed = cursor.elapsed if cursor is not None else 0.0
+
+        pacer = RatePacer(rate, open_loop=open_loop, elapsed=resumed)
+        started = time.perf_counter()
+        # Numa retomada a agenda e a duração continuam de onde pararam
+        origin = started - resumed
+        deadline = origin + duration if duration else None
+        connections_before = self.transport.stats.snapshot()
+
+        # Um stop() vale para todas as execuções simultâneas; só a
+        # primeira a começar limpa o sinal de uma execução anterior
+        if not self._active_runs:
+            self._stopped = False
+            self.console.start()
+        self._active_runs += 1
+
+        def next_request() -> Optional[AttackRequest]:
+            if self._stopped:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            return next(source, None)
+
+        async def dispatch(request: AttackRequest, intended: float) -> None:
+            stats.sent += 1
+            stats.max_send_lag = max(stats.max_send_lag, time.perf_counter() - intended)
+            self.console.stats.record_sent()
+
+            result = await self._send(request, intended)
+            stats.completed += 1
+            if result.error is not None:
+                stats.errors += 1
+
+            self.report.record(phase, result)
+            self.console.stats.record(result)
+            if self.sink is not None:
+                self.sink.write(record_of(phase, result))
+            handler(result)
+            if cursor is not None:
+                checkpoint.completed(cursor, positions.pop(id(request)))
+
+        async def worker() -> None:
+            while not self._stopped:
+                await pacer.wait()
+
+                request = next_request()
+                if request is None:
+                    return
+
+                await dispatch(request, time.perf_counter())
+
+        async def next_slot():
+            intended = await pacer.wait()
+            return intended, next_request()
+
+        async def next_scheduled():
+            request = next_request()
+            if request is None:
+                return 0.0, None
+            intended = origin + request.at
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return intended, request
+
+        try:
+            if open_loop:
+                await self._run_open_loop(next_scheduled if scheduled else next_slot, dispatch)
+            else:
+                workers = concurrency or self.concurrency
+                await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            self._active_runs -= 1
+            if not self._active_runs:
+                self.console.stop()
+
+        stats.elapsed = time.perf_counter() - started
+        stats.connections = self.transport.stats.since(connections_before)
+        self.totals.add(stats)
+        self.report.add_elapsed(phase, stats.elapsed)
+        if cursor is not None:
+            checkpoint.end(cursor)
+        return stats
+
+    async def _run_open_loop(self, next_slot, dispatch) -> None:
+        """
+        Dispara cada requisição no seu slot planejado, sem esperar respostas
+
+        `next_slot()` espera o próximo horário (da taxa ou do `at` da
+        requisição) e devolve (horário planejado, requisição ou None).
+        """
+        outstanding = asyncio.Semaphore(self.max_outstanding)
+        tasks = set()
+
+        async def fire(request: AttackRequest, intended: float) -> None:
+            try:
+                await dispatch(request, intended)
+            finally:
+                outstanding.release()
+
+        while not self._stopped:
+            intended, request = await next_slot()
+            if request is None:
+                break
+
+            # Só bloqueia se o número de pendentes explodir; o atraso
+            # continua contabilizado porque a latência parte de `intended`
+            await outstanding.acquire()
+            task = asyncio.ensure_future(fire(request, intended))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _send(self, request: AttackRequest, intended: float) -> AttackResult:
+        if self.base_url and request.url.startswith("/"):
+            request.url = self.base_url + request.url
+
+        result = AttackResult(request=request)
+        started = time.perf_counter()
+
+        try:
+            result.status, result.content_type, result.text = await self.transport.send(request)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            result.error = e
+
+        finished = time.perf_counter()
+        result.latency = finished - intended
+        result.service_time = finished - started
+        return result
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+
+        # Após um Ctrl+C podem sobrar workers pendentes no loop, e tarefas
+        # internas do aiohttp que receberam o KeyboardInterrupt só avisam
+        # ("Task exception was never retrieved") ao serem coletadas
+        self._loop.set_exception_handler(_ignore_interrupt)
+        pending = asyncio.all_tasks(self._loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self._loop.run_until_complete(
+                asyncio.gather(*pending, return_exceptions=True)
+            )
+
+        self._loop.run_until_complete(self.transport.close())
+        self._loop.close()
+
+        self.console.close()
+        if self.sink is not None:
+            self.sink.close()
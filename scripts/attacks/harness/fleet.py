@@ -0,0 +1,255 @@
+"""
+Frota virtual de IPs de origem para ataques distribuídos em larga escala
+
+Gera de 10 mil a 1 milhão de IPs distintos a partir de faixas CIDR e uma
+agenda única, ordenada no tempo, em que cada IP segue um perfil de
+comportamento. Nenhuma lista de IPs ou de eventos fica em memória: o IP
+é calculado a partir do índice e a agenda é produzida sob demanda.
+"""
+
+import bisect
+import heapq
+import ipaddress
+import math
+import random
+from dataclasses import dataclass, field
+from itertools import count as count_from
+from typing import Dict, Iterator, List, NamedTuple, Sequence
+
+# Faixa CGNAT (RFC 6598): 4 milhões de endereços que nunca são roteados na internet
+DEFAULT_CIDRS = ("100.64.0.0/10",)
+
+PROFILES = ("zipf", "burst", "trickle")
+
+
+class FleetEvent(NamedTuple):
+    # Segundos desde o início da execução
+    at: float
+    # Índice do IP na frota (0 .. size - 1)
+    ip_index: int
+    profile: str
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    "zipf:0.8,burst:0.15,trickle:0.05" -> frações normalizadas por perfil
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.strip().partition(":")
+        if name not in PROFILES:
+            raise ValueError(f"Perfil desconhecido: {name!r} (use {', '.join(PROFILES)})")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Peso inválido para {name}: {weight!r}")
+        if mix[name] < 0:
+            raise ValueError(f"Peso negativo para {name}")
+
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("O mix de perfis precisa de pelo menos um peso positivo")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+@dataclass
+class FleetConfig:
+    """
+    Parâmetros da frota
+
+    Args:
+        size: Número de IPs distintos
+        cidrs: Faixas de onde os IPs são tirados
+        mix: Fração da frota em cada perfil
+        duration: Segundos de agenda
+        zipf_rate: Req/s somadas de todos os IPs zipf
+        zipf_exponent: Expoente s (maior = tráfego mais concentrado nos primeiros IPs)
+        burst_size: Requisições por rajada (uma rajada por IP)
+        burst_gap: Segundos entre as requisições de uma rajada
+        trickle_interval: Segundos entre as requisições de um IP trickle
+        seed: Semente (mesma semente = mesmos IPs e mesma agenda)
+    """
+
+    size: int = 10_000
+    cidrs: Sequence[str] = DEFAULT_CIDRS
+    mix: Dict[str, float] = field(default_factory=lambda: {"zipf": 1.0})
+    duration: float = 60.0
+    zipf_rate: float = 200.0
+    zipf_exponent: float = 1.1
+    burst_size: int = 20
+    burst_gap: float = 0.01
+    trickle_interval: float = 30.0
+    seed: int = 0
+
+
+class IpFleet:
+    """
+    IPs virtuais e a agenda de requisições de cada perfil
+
+    O índice `i` vira um endereço por uma permutação afim sobre todas as
+    faixas, então os IPs ficam espalhados e não são sequenciais. Os
+    índices são divididos em blocos contíguos por perfil: zipf primeiro
+    (o índice 0 é o IP mais ativo), depois burst e trickle.
+
+    Perfis:
+        zipf: chegadas de Poisson a `zipf_rate` req/s; cada uma escolhe um
+            IP com probabilidade proporcional a 1/rank^s (poucos IPs
+            barulhentos e uma cauda longa de IPs com uma ou duas requisições)
+        burst: cada IP dispara `burst_size` requisições seguidas em um
+            instante aleatório da execução e some
+        trickle: cada IP envia uma requisição a cada `trickle_interval`
+            segundos ("low and slow"), com as fases espalhadas no intervalo
+    """
+
+    def __init__(self, config: FleetConfig):
+        self.config = config
+
+        networks = [ipaddress.ip_network(cidr, strict=False) for cidr in config.cidrs]
+        if not networks:
+            raise ValueError("Informe ao menos uma faixa CIDR")
+        self._starts = [int(net.network_address) for net in networks]
+        self._versions = [net.version for net in networks]
+        self._offsets = [0]
+        for net in networks:
+            self._offsets.append(self._offsets[-1] + net.num_addresses)
+        self.capacity = self._offsets[-1]
+
+        if not 0 < config.size <= self.capacity:
+            raise ValueError(f"Tamanho da frota deve estar entre 1 e {self.capacity} (endereços nas faixas)")
+
+        rng = random.Random(config.seed)
+        self._shift = rng.randrange(self.capacity)
+        self._stride = rng.randrange(1, self.capacity) if self.capacity > 1 else 1
+        while math.gcd(self._stride, self.capacity) != 1:
+            self._stride += 1
+
+        # Blocos de índices por perfil, na ordem de PROFILES
+        self.ranges: Dict[str, range] = {}
+        start = 0
+        names = [name for name in PROFILES if config.mix.get(name)]
+        for position, name in enumerate(names):
+            share = round(config.size * config.mix[name]) if position < len(names) - 1 else config.size - start
+            share = min(share, config.size - start)
+            self.ranges[name] = range(start, start + share)
+            start += share
+
+    @property
+    def size(self) -> int:
+        return self.config.size
+
+    def peak_rate(self) -> float:
+        """
+        Taxa de pico estimada da agenda (req/s, somando todos os workers)
+
+        A taxa média de cada perfil mais uma rajada em andamento, que sozinha
+        chega a 1/burst_gap req/s (uma rajada sem intervalo conta como
+        `burst_size` requisições em um segundo).
+        """
+        config = self.config
+        duration = max(config.duration, 1e-9)
+        rate = 0.0
+        if self.ranges.get("zipf"):
+            rate += max(0.0, config.zipf_rate)
+        if self.ranges.get("burst"):
+            size = max(1, config.burst_size)
+            rate += len(self.ranges["burst"]) * size / duration
+            rate += 1 / config.burst_gap if config.burst_gap > 0 else size
+        if self.ranges.get("trickle") and config.trickle_interval > 0:
+            rate += len(self.ranges["trickle"]) / config.trickle_interval
+        return rate
+
+    def address(self, index: int) -> str:
+        position = (index * self._stride + self._shift) % self.capacity
+        net = bisect.bisect_right(self._offsets, position) - 1
+        value = self._starts[net] + position - self._offsets[net]
+        if self._versions[net] == 4:
+            return str(ipaddress.IPv4Address(value))
+        return str(ipaddress.IPv6Address(value))
+
+    def schedule(self, shard_index: int = 0, shard_count: int = 1) -> Iterator[FleetEvent]:
+        """
+        Eventos de todos os perfis, em ordem de tempo
+
+        Com vários workers cada um fica com os IPs de índice
+        `shard_index` módulo `shard_count`: todo o tráfego de um IP sai
+        do mesmo processo.
+        """
+        seed = self.config.seed
+        streams = []
+        if self.ranges.get("zipf"):
+            streams.append(self._zipf(random.Random(f"{seed}:zipf")))
+        if self.ranges.get("burst"):
+            streams.append(self._burst(random.Random(f"{seed}:burst")))
+        if self.ranges.get("trickle"):
+            streams.append(self._trickle())
+
+        for event in heapq.merge(*streams):
+            if event.ip_index % shard_count == shard_index:
+                yield event
+
+    def _zipf(self, rng: random.Random) -> Iterator[FleetEvent]:
+        indices = self.ranges["zipf"]
+        n = len(indices)
+        s = self.config.zipf_exponent
+        rate = self.config.zipf_rate
+        if rate <= 0:
+            return
+
+        # Inversa da CDF da lei de potência contínua em [1, n + 1): O(1) de memória
+        if abs(s - 1.0) < 1e-9:
+            log_span = math.log(n + 1)
+            rank_of = lambda u: math.exp(u * log_span)
+        else:
+            top = (n + 1) ** (1 - s) - 1
+            rank_of = lambda u: (top * u + 1) ** (1 / (1 - s))
+
+        t = 0.0
+        while True:
+            t += rng.expovariate(rate)
+            if t >= self.config.duration:
+                return
+            rank = min(int(rank_of(rng.random())), n)
+            yield FleetEvent(t, indices.start + rank - 1, "zipf")
+
+    def _burst(self, rng: random.Random) -> Iterator[FleetEvent]:
+        indices = self.ranges["burst"]
+        size = max(1, self.config.burst_size)
+        gap = self.config.burst_gap
+        window = max(0.0, self.config.duration - (size - 1) * gap)
+
+        # Inícios das rajadas já ordenados (estatísticas de ordem de uniformes),
+        # então só as rajadas em andamento ficam no heap
+        def starts() -> Iterator[float]:
+            previous = 0.0
+            for remaining in range(len(indices), 0, -1):
+                previous += (1.0 - previous) * (1.0 - rng.random() ** (1.0 / remaining))
+                yield previous * window
+
+        pending = enumerate(starts())
+        upcoming = next(pending, None)
+        active: List[tuple] = []
+
+        while active or upcoming is not None:
+            if upcoming is not None and (not active or upcoming[1] <= active[0][0]):
+                position, start = upcoming
+                heapq.heappush(active, (start, indices.start + position, 0))
+                upcoming = next(pending, None)
+                continue
+
+            at, index, sent = heapq.heappop(active)
+            yield FleetEvent(at, index, "burst")
+            if sent + 1 < size:
+                heapq.heappush(active, (at + gap, index, sent + 1))
+
+    def _trickle(self) -> Iterator[FleetEvent]:
+        indices = self.ranges["trickle"]
+        interval = self.config.trickle_interval
+        step = interval / len(indices)
+
+        for cycle in count_from():
+            base = cycle * interval
+            for position, index in enumerate(indices):
+                at = base + position * step
+                if at >= self.config.duration:
+                    return
+                yield FleetEvent(at, index, "trickle")
@@ -0,0 +1,131 @@
+"""
+Histograma de latência no estilo HDR (High Dynamic Range)
+Memória fixa independente do número de amostras, com erro relativo
+inferior a 1% em toda a faixa (1µs até ~1h)
+"""
+
+import math
+from typing import Dict, List
+
+# 2^SUB_BUCKET_BITS sub-buckets lineares por potência de 2 (precisão ~0.8%)
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_HALF = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_COUNT = SUB_BUCKET_HALF * 2
+
+# Maior valor rastreável em microssegundos (~71 min); acima disso satura
+MAX_VALUE_US = (1 << 32) - 1
+
+
+def bucket_index(value_us: int) -> int:
+    """
+    Índice do bucket para um valor em microssegundos
+    """
+    if value_us < SUB_BUCKET_COUNT:
+        return value_us
+
+    shift = value_us.bit_length() - (SUB_BUCKET_BITS + 1)
+    return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + (value_us >> shift) - SUB_BUCKET_HALF
+
+
+def bucket_upper_us(index: int) -> int:
+    """
+    Maior valor (µs) que cai no bucket `index`
+    """
+    if index < SUB_BUCKET_COUNT:
+        return index
+
+    shift = (index - SUB_BUCKET_COUNT) // SUB_BUCKET_HALF + 1
+    mantissa = (index - SUB_BUCKET_COUNT) % SUB_BUCKET_HALF + SUB_BUCKET_HALF
+    return ((mantissa + 1) << shift) - 1
+
+
+BUCKET_COUNT = bucket_index(MAX_VALUE_US) + 1
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências com buckets log-lineares
+
+    Os valores são gravados em segundos e armazenados em microssegundos.
+    Percentis devolvem o maior valor equivalente do bucket, como no HDR.
+    """
+
+    __slots__ = ("counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_us = 0
+        self.min_us = MAX_VALUE_US
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        value = min(max(int(seconds * 1_000_000), 0), MAX_VALUE_US)
+
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total_us += value
+        if value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+
+    def percentile(self, p: float) -> float:
+        """
+        Latência (segundos) abaixo da qual estão `p`% das amostras
+        """
+        if self.count == 0:
+            return 0.0
+
+        target = max(1, math.ceil(p / 100.0 * self.count))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                return min(bucket_upper_us(index), self.max_us) / 1_000_000
+
+        return self.max_us / 1_000_000
+
+    @property
+    def max(self) -> float:
+        return self.max_us / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self.total_us / self.count / 1_000_000 if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Soma outro histograma neste (ex.: resultados de outro worker)
+        """
+        counts = self.counts
+        for index, bucket in enumerate(other.counts):
+            if bucket:
+                counts[index] += bucket
+        self.count += other.count
+        self.total_us += other.total_us
+        self.min_us = min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def to_dict(self) -> Dict:
+        """
+        Forma serializável e esparsa (apenas buckets não vazios)
+        """
+        return {
+            "count": self.count,
+            "total_us": self.total_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+            "buckets": {str(i): c for i, c in enumerate(self.counts) if c},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.count = data["count"]
+        histogram.total_us = data["total_us"]
+        histogram.min_us = data["min_us"]
+        histogram.max_us = data["max_us"]
+        for index, bucket in data["buckets"].items():
+            histogram.counts[int(index)] = bucket
+        return histogram
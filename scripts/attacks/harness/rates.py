@@ -0,0 +1,64 @@
+"""
+Perfis de taxa que variam no tempo (rampas de carga)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+RAMP_TYPES = ("constant", "linear", "step")
+
+
+@dataclass
+class RateProfile:
+    """
+    Taxa alvo em função do tempo decorrido desde o início da execução
+
+    - constant: `rate` desde o primeiro envio
+    - linear: sobe de `start_rate` até `rate` ao longo de `ramp_duration`
+    - step: sobe em `steps` degraus iguais ao longo de `ramp_duration`
+
+    Depois da rampa a taxa fica fixa em `rate`.
+    """
+
+    rate: float
+    ramp: str = "constant"
+    start_rate: Optional[float] = None
+    ramp_duration: float = 0.0
+    steps: int = 5
+
+    def __post_init__(self):
+        if self.ramp not in RAMP_TYPES:
+            raise ValueError(f"Rampa desconhecida: {self.ramp} (use {', '.join(RAMP_TYPES)})")
+        if self.start_rate is None:
+            # Partir de zero deixaria o primeiro intervalo infinito
+            self.start_rate = max(1.0, self.rate / 10)
+
+    def rate_at(self, elapsed: float) -> float:
+        if self.ramp == "constant" or elapsed >= self.ramp_duration:
+            return self.rate
+
+        progress = elapsed / self.ramp_duration
+        if self.ramp == "step":
+            progress = int(progress * self.steps) / self.steps
+
+        return self.start_rate + (self.rate - self.start_rate) * progress
+
+    @classmethod
+    def from_config(cls, rate: float, ramp: Optional[Dict[str, Any]] = None) -> "RateProfile":
+        """
+        Monta o perfil a partir do bloco `ramp` de um cenário
+
+        Ex.: {"type": "linear", "from": 5, "duration": 30}
+             {"type": "step", "from": 10, "duration": 60, "steps": 6}
+        """
+        ramp = ramp or {}
+        return cls(
+            rate=float(rate),
+            ramp=ramp.get("type", "linear" if ramp else "constant"),
+            start_rate=ramp.get("from"),
+            ramp_duration=float(ramp.get("duration", 0)),
+            steps=int(ramp.get("steps", 5)),
+        )
+
+
+Rate = Union[float, RateProfile, None]
@@ -0,0 +1,137 @@
+"""
+Relatório de latência por fase de ataque e por endpoint
+"""
+
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .histogram import LatencyHistogram
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def endpoint_of(request) -> str:
+    """
+    Endpoint usado para agrupar uma requisição no relatório
+
+    Scripts que colocam o payload no path (ex.: path traversal) informam
+    o endpoint base em `meta["endpoint"]` para não explodir o número de
+    linhas do relatório.
+    """
+    return request.meta.get("endpoint") or urlsplit(request.url).path or "/"
+
+
+class LatencyReport:
+    """
+    Histogramas de latência agrupados por (fase, endpoint)
+
+    A vazão de cada linha é calculada sobre o tempo total das execuções
+    da fase, então endpoints de uma mesma fase são comparáveis entre si.
+    Timeouts entram nos histogramas com a latência até desistir: sob
+    sobrecarga são justamente as requisições mais lentas, e ignorá-las
+    cortaria o p99 e o max. Demais erros só são contados.
+    """
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.phase_elapsed: Dict[str, float] = defaultdict(float)
+
+    def record(self, phase: str, result) -> None:
+        key = (phase, endpoint_of(result.request))
+        if result.error is not None:
+            self.errors[key] += 1
+            if not result.timed_out:
+                return
+        self.histograms[key].record(result.latency)
+
+    def add_elapsed(self, phase: str, seconds: float) -> None:
+        self.phase_elapsed[phase] += seconds
+
+    def phase_histogram(self, phase: str) -> LatencyHistogram:
+        merged = LatencyHistogram()
+        for (name, _), histogram in self.histograms.items():
+            if name == phase:
+                merged.merge(histogram)
+        return merged
+
+    def phase_errors(self, phase: str) -> int:
+        return sum(n for (name, _), n in self.errors.items() if name == phase)
+
+    def merge(self, other: "LatencyReport") -> None:
+        for key, histogram in other.histograms.items():
+            self.histograms[key].merge(histogram)
+        for key, n in other.errors.items():
+            self.errors[key] += n
+        for phase, seconds in other.phase_elapsed.items():
+            self.phase_elapsed[phase] = max(self.phase_elapsed[phase], seconds)
+
+    def to_dict(self) -> Dict:
+        return {
+            "histograms": [
+                {"phase": phase, "endpoint": endpoint, "histogram": histogram.to_dict()}
+                for (phase, endpoint), histogram in self.histograms.items()
+            ],
+            "errors": [
+                {"phase": phase, "endpoint": endpoint, "count": n}
+                for (phase, endpoint), n in self.errors.items()
+            ],
+            "phase_elapsed": dict(self.phase_elapsed),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyReport":
+        report = cls()
+        for entry in data["histograms"]:
+            key = (entry["phase"], entry["endpoint"])
+            report.histograms[key] = LatencyHistogram.from_dict(entry["histogram"])
+        # Checkpoints gravados antes da contagem de erros não têm a chave
+        for entry in data.get("errors", []):
+            report.errors[(entry["phase"], entry["endpoint"])] = entry["count"]
+        report.phase_elapsed.update(data["phase_elapsed"])
+        return report
+
+    def print(self, phase: Optional[str] = None) -> None:
+        """
+        Imprime p50/p90/p99/p99.9/max, erros e vazão (apenas de `phase`, se informada)
+
+        `n` inclui os timeouts; `erros` conta todas as falhas de transporte.
+        Linhas só com erros mostram `-` no lugar das latências.
+        """
+        phases = [phase] if phase else sorted(self.phase_elapsed)
+        rows = []
+        for name in phases:
+            elapsed = self.phase_elapsed.get(name, 0.0)
+            endpoints = sorted({e for (p, e) in [*self.histograms, *self.errors] if p == name})
+            if not endpoints:
+                continue
+
+            rows.append((f"{name} (total)", self.phase_histogram(name), self.phase_errors(name), elapsed))
+            if len(endpoints) > 1:
+                for endpoint in endpoints:
+                    key = (name, endpoint)
+                    rows.append((f"  {endpoint}", self.histograms.get(key), self.errors.get(key, 0), elapsed))
+
+        if not rows:
+            return
+
+        print("\n⏱️  Latência (ms)")
+        print(
+            f"{'fase / endpoint':<28} {'n':>7} {'req/s':>8} "
+            + " ".join(f"{'p' + format(p, 'g'):>7}" for p in PERCENTILES)
+            + f" {'max':>7} {'erros':>7}"
+        )
+        for label, histogram, errors, elapsed in rows:
+            if histogram is None or histogram.count == 0:
+                # Só erros: nenhuma latência medida
+                latencies = " ".join(f"{'-':>7}" for _ in (*PERCENTILES, "max"))
+                print(f"{label[:28]:<28} {0:>7d} {0.0:>8.1f} {latencies} {errors:>7d}")
+                continue
+
+            throughput = histogram.count / elapsed if elapsed > 0 else 0.0
+            print(
+                f"{label[:28]:<28} {histogram.count:>7d} {throughput:>8.1f} "
+                + " ".join(f"{histogram.percentile(p) * 1000:>7.1f}" for p in PERCENTILES)
+                + f" {histogram.max * 1000:>7.1f} {errors:>7d}"
+            )
@@ -0,0 +1,181 @@
+"""
+Busca do ponto de saturação com carga em degraus
+Sobe a taxa ofertada degrau a degrau, mede vazão, erros e p99 em cada
+um e para quando o alvo sai do SLO ou o goodput deixa de acompanhar
+"""
+
+from dataclasses import dataclass, field
+from itertools import count as count_from
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .histogram import LatencyHistogram
+
+# Status que contam como falha do alvo (não como resposta do WAF)
+FAILURE_STATUSES = {429}
+
+
+@dataclass
+class SloPolicy:
+    """
+    Critérios que encerram a rampa
+
+    Args:
+        p99: Latência máxima (segundos) no p99 de um degrau
+        error_rate: Fração máxima de erros (transporte, timeout, 5xx, 429)
+        plateau: Ganho mínimo de goodput, em fração do aumento da taxa
+            ofertada entre dois degraus (0.25 = +50 req/s ofertados
+            precisam render ao menos +12.5 req/s de goodput)
+    """
+
+    p99: float = 0.5
+    error_rate: float = 0.01
+    plateau: float = 0.25
+
+
+@dataclass
+class StepResult:
+    """
+    Medições de um degrau da rampa (de um processo ou de todos somados)
+
+    É usado direto como handler do motor: `record()` recebe cada resultado.
+    Timeouts contam como erro e entram no histograma com a latência até
+    desistir, para o p99 perto da saturação não sair cortado.
+    """
+
+    rate: float
+    completed: int = 0
+    errors: int = 0
+    failures: int = 0
+    elapsed: float = 0.0
+    statuses: Dict[int, int] = field(default_factory=dict)
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def record(self, result) -> None:
+        self.completed += 1
+        if result.error is not None:
+            self.errors += 1
+            if result.timed_out:
+                self.histogram.record(result.latency)
+            return
+
+        self.statuses[result.status] = self.statuses.get(result.status, 0) + 1
+        self.histogram.record(result.latency)
+        if result.status >= 500 or result.status in FAILURE_STATUSES:
+            self.failures += 1
+
+    def merge(self, other: "StepResult") -> None:
+        """
+        Junta o degrau de outro worker (os processos rodam em paralelo)
+        """
+        self.completed += other.completed
+        self.errors += other.errors
+        self.failures += other.failures
+        self.elapsed = max(self.elapsed, other.elapsed)
+        for status, n in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + n
+        self.histogram.merge(other.histogram)
+
+    @property
+    def throughput(self) -> float:
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def goodput(self) -> float:
+        """
+        Respostas válidas do alvo por segundo (403 e 401 do WAF contam)
+        """
+        good = self.completed - self.errors - self.failures
+        return good / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return (self.errors + self.failures) / self.completed if self.completed else 0.0
+
+    @property
+    def p99(self) -> float:
+        return self.histogram.percentile(99)
+
+
+def saturation_reason(step: StepResult, previous: Optional[StepResult], policy: SloPolicy) -> Optional[str]:
+    """
+    Por que o degrau não é sustentável (None = dentro do SLO)
+    """
+    if not step.completed:
+        return "nenhuma resposta no degrau"
+    if step.error_rate > policy.error_rate:
+        return f"erros {step.error_rate * 100:.1f}% > {policy.error_rate * 100:.1f}%"
+    if step.p99 > policy.p99:
+        return f"p99 {step.p99 * 1000:.1f}ms > SLO {policy.p99 * 1000:.0f}ms"
+
+    if previous is not None:
+        offered = step.rate - previous.rate
+        gain = step.goodput - previous.goodput
+        if offered > 0 and gain < policy.plateau * offered:
+            return f"goodput estabilizou (+{gain:.1f} req/s para +{offered:g} req/s ofertados)"
+    return None
+
+
+def step_rates(start: float, step: float, max_rate: Optional[float] = None) -> Iterator[float]:
+    """
+    start, start + step, ... até `max_rate` (sem limite se None)
+    """
+    for n in count_from():
+        rate = start + n * step
+        if max_rate is not None and rate > max_rate:
+            return
+        yield rate
+
+
+@dataclass
+class SaturationReport:
+    """
+    Degraus executados para um mix e onde a rampa parou
+    """
+
+    name: str
+    steps: List[StepResult] = field(default_factory=list)
+    reason: Optional[str] = None
+    # Último degrau dentro do SLO
+    sustainable: Optional[StepResult] = None
+
+    @property
+    def max_rate(self) -> float:
+        return self.sustainable.rate if self.sustainable else 0.0
+
+    def print_step(self, step: StepResult, reason: Optional[str]) -> None:
+        print(
+            f"   {step.rate:>8g} req/s → vazão {step.throughput:>8.1f} | goodput {step.goodput:>8.1f} | "
+            f"p99 {step.p99 * 1000:>7.1f}ms | erros {step.error_rate * 100:>5.1f}% | "
+            + (f"⛔ {reason}" if reason else "✅")
+        )
+
+
+def find_saturation(
+    name: str,
+    run_step: Callable[[float], StepResult],
+    rates: Iterable[float],
+    policy: SloPolicy,
+) -> SaturationReport:
+    """
+    Executa os degraus em ordem até o primeiro fora do SLO
+
+    Args:
+        name: Nome do mix no relatório
+        run_step: Executa um degrau na taxa dada e devolve as medições
+        rates: Taxas ofertadas de cada degrau (ex.: step_rates())
+        policy: Critérios de saturação
+    """
+    report = SaturationReport(name)
+    previous = None
+
+    for rate in rates:
+        step = run_step(rate)
+        reason = saturation_reason(step, previous, policy)
+        report.steps.append(step)
+        report.print_step(step, reason)
+        if reason is not None:
+            report.reason = reason
+            break
+        report.sustainable = previous = step
+
+    return report
@@ -0,0 +1,134 @@
+"""
+Cenários declarativos de campanha (YAML ou JSON)
+
+Um cenário lista fases de ataque que rodam ao mesmo tempo sobre o
+mesmo motor, cada uma com taxa, duração, concorrência e rampa próprias:
+
+    target: http://localhost:3000
+    defaults:
+      concurrency: 5
+    phases:
+      - name: stuffing
+        type: brute_force
+        rate: 20
+        duration: 60
+        ramp: {type: linear, from: 2, duration: 15}
+      - name: sqli-login
+        type: sqli
+        rate: 10
+        duration: 60
+        start: 10
+"""
+
+import copy
+import json
+import math
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .phases import PHASE_TYPES
+from .rates import Rate, RateProfile
+
+
+@dataclass
+class Phase:
+    """
+    Uma fase da campanha
+
+    Sem `duration` o corpus da fase é percorrido uma única vez; com
+    `duration` ele é repetido até o tempo acabar. `start` atrasa o
+    início da fase em relação ao começo da campanha.
+    """
+
+    name: str
+    type: str
+    rate: Optional[float] = None
+    duration: Optional[float] = None
+    concurrency: Optional[int] = None
+    start: float = 0.0
+    open_loop: Optional[bool] = None
+    ramp: Optional[Dict[str, Any]] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def rate_profile(self) -> Rate:
+        if not self.rate:
+            return None
+        if not self.ramp:
+            return self.rate
+        return RateProfile.from_config(self.rate, self.ramp)
+
+    def scaled(self, count: int) -> "Phase":
+        """
+        Fatia da fase para um de `count` workers (taxa e concorrência divididas)
+        """
+        share = copy.deepcopy(self)
+        if count <= 1:
+            return share
+        if share.rate:
+            share.rate /= count
+        if share.concurrency:
+            share.concurrency = max(1, math.ceil(share.concurrency / count))
+        if share.ramp and share.ramp.get("from"):
+            share.ramp["from"] /= count
+        return share
+
+
+@dataclass
+class Scenario:
+    target: Optional[str] = None
+    phases: List[Phase] = field(default_factory=list)
+
+
+def parse_scenario(data: Dict[str, Any]) -> Scenario:
+    """
+    Valida o dicionário do cenário e aplica o bloco `defaults` às fases
+    """
+    if not isinstance(data, dict) or not data.get("phases"):
+        raise ValueError("O cenário precisa de uma lista 'phases'")
+
+    known = {f.name for f in fields(Phase)}
+    defaults = data.get("defaults") or {}
+    phases = []
+
+    for position, raw in enumerate(data["phases"], 1):
+        config = {**defaults, **raw}
+        config.setdefault("name", f"{config.get('type', 'fase')}-{position}")
+
+        unknown = set(config) - known
+        if unknown:
+            raise ValueError(f"Fase '{config['name']}': campos desconhecidos {sorted(unknown)}")
+        if config.get("type") not in PHASE_TYPES:
+            raise ValueError(
+                f"Fase '{config['name']}': tipo '{config.get('type')}' inválido "
+                f"(use {', '.join(PHASE_TYPES)})"
+            )
+        if config.get("ramp") and not config.get("rate"):
+            raise ValueError(f"Fase '{config['name']}': 'ramp' exige 'rate'")
+
+        phases.append(Phase(**config))
+
+    names = [phase.name for phase in phases]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Nomes de fase repetidos: {duplicated}")
+
+    return Scenario(target=data.get("target"), phases=phases)
+
+
+def load_scenario(path: str) -> Scenario:
+    """
+    Lê um cenário .yaml/.yml (requer PyYAML) ou .json
+    """
+    text = Path(path).read_text(encoding="utf-8")
+
+    if Path(path).suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Cenários YAML exigem PyYAML (pip install pyyaml) - ou use JSON")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    return parse_scenario(data)
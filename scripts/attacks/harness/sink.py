@@ -0,0 +1,134 @@
+"""
+Gravação em streaming dos resultados por requisição (NDJSON)
+
+Os scripts mantêm em memória apenas contadores e histogramas; cada
+resposta individual vai para um arquivo NDJSON (gzip se o nome terminar
+em .gz) escrito por uma thread em segundo plano.
+"""
+
+import gzip
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .report import endpoint_of
+
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def record_of(phase: str, result) -> Dict[str, Any]:
+    """
+    Linha do NDJSON para um AttackResult
+
+    Campos escalares de `meta` (payload, ip, índice...) são copiados
+    para a linha; os campos do motor têm precedência.
+    """
+    request = result.request
+    record = {k: v for k, v in request.meta.items() if isinstance(v, SCALAR_TYPES)}
+    record.update(
+        ts=round(time.time(), 6),
+        phase=phase,
+        method=request.method,
+        endpoint=endpoint_of(request),
+        status=result.status,
+        latency_ms=round(result.latency * 1000, 3),
+        service_ms=round(result.service_time * 1000, 3),
+        error=type(result.error).__name__ if result.error is not None else None,
+    )
+    return record
+
+
+def shard_path(path: str, index: int) -> str:
+    """
+    Arquivo de saída de um worker: results.ndjson.gz -> results.w1.ndjson.gz
+    """
+    target = Path(path)
+    stem, dot, suffixes = target.name.partition(".")
+    return str(target.with_name(f"{stem}.w{index}{dot}{suffixes}"))
+
+
+class ResultSink:
+    """
+    Escritor NDJSON com buffer e thread dedicada
+
+    `write()` só acumula o registro em um lote; lotes cheios vão para
+    uma fila limitada consumida pela thread, que serializa e grava.
+    Se o disco ficar para trás a fila enche e `write()` bloqueia, então
+    a memória usada é constante mesmo em execuções de horas.
+
+    Args:
+        path: Arquivo de saída (.ndjson ou .ndjson.gz)
+        batch_size: Registros por lote entregue à thread
+        max_batches: Lotes pendentes antes de aplicar backpressure
+        append: Continua um arquivo existente (retomada de checkpoint)
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, max_batches: int = 64, append: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+
+        opener = gzip.open if path.endswith(".gz") else open
+        self._file = opener(path, "at" if append else "wt", encoding="utf-8")
+        self._queue: "queue.Queue[Optional[List[dict]]]" = queue.Queue(maxsize=max_batches)
+        self._batch: List[dict] = []
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._drain, name="result-sink", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        batch, self._batch = self._batch, []
+        self._queue.put(batch)
+
+    def _drain(self) -> None:
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            if self._error is not None:
+                # Continua esvaziando a fila para não travar quem escreve
+                continue
+            try:
+                self._file.write(
+                    "".join(
+                        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                        for record in batch
+                    )
+                )
+                self.written += len(batch)
+            except (OSError, TypeError, ValueError) as e:
+                self._error = e
+
+        self._file.close()
+
+    def close(self) -> None:
+        """
+        Grava o lote parcial, espera a thread terminar e fecha o arquivo
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._batch:
+            self._flush_batch()
+        self._queue.put(None)
+        self._thread.join()
+
+        if self._error is not None:
+            raise OSError(f"Falha ao gravar {self.path}: {self._error}") from self._error
@@ -0,0 +1,230 @@
+"""
+Wordlists grandes (ex.: rockyou) lidas sob demanda
+
+Arquivos comuns são mapeados em memória e percorridos linha a linha:
+cada palavra é decodificada direto do mapa, sem ler o arquivo para a
+memória do processo. Arquivos .gz são descomprimidos em streaming. O
+ataque começa na primeira linha, a memória fica estável e a leitura
+pode recomeçar de um offset em bytes.
+"""
+
+import gzip
+import hashlib
+import math
+import mmap
+import os
+from collections import Counter
+from typing import Iterator, Optional, Tuple, Union
+
+Line = Union[bytes, memoryview]
+
+COMMENT = ord("#")
+
+
+class BloomFilter:
+    """
+    Conjunto probabilístico de tamanho fixo para descartar repetidas
+
+    Nunca dá falso negativo (uma palavra vista é sempre reconhecida);
+    com `error_rate` de chance uma palavra nova é tomada por repetida e
+    pulada. ~14 bits por palavra com 0.1% de erro: 25 MiB para os 14
+    milhões de linhas do rockyou.
+
+    Args:
+        capacity: Palavras distintas esperadas
+        error_rate: Fração de falsos positivos com `capacity` palavras
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: Line) -> bool:
+        """
+        Marca `item` e diz se ele era novo
+        """
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        # Hashing duplo (Kirsch-Mitzenmacher): k posições a partir de dois hashes
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+
+        bits, size = self.bits, self.size
+        new = False
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % size
+            mask = 1 << (bit & 7)
+            if not bits[bit >> 3] & mask:
+                bits[bit >> 3] |= mask
+                new = True
+        return new
+
+    def __contains__(self, item: Line) -> bool:
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return all(
+            self.bits[bit >> 3] & (1 << (bit & 7))
+            for bit in ((h1 + i * h2) % self.size for i in range(self.hashes))
+        )
+
+
+class Wordlist:
+    """
+    Iterável de palavras de um arquivo, uma por linha
+
+    Pode ser percorrido várias vezes (cada passada reabre o arquivo a
+    partir de `start`). Linhas vazias são puladas, assim como as que
+    começam com `#` quando `comments` é True. Durante a iteração:
+
+    - `offset`: byte onde começa a próxima linha ainda não lida
+    - `line_offset`: byte onde começa a última palavra entregue
+    - `lines` / `duplicates`: palavras entregues e repetidas descartadas
+
+    Offsets de arquivos .gz contam bytes descomprimidos.
+
+    Args:
+        path: Arquivo texto ou .gz
+        start: Offset em bytes onde a leitura começa (no meio de uma linha,
+            vale a linha seguinte)
+        dedup: Descarta palavras repetidas com um BloomFilter
+        error_rate: Falsos positivos do filtro
+        expected: Palavras distintas esperadas (padrão: estimada pelo tamanho)
+        comments: Pula linhas que começam com `#`
+        encoding: Codificação das palavras (bytes inválidos viram U+FFFD)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        start: int = 0,
+        dedup: bool = False,
+        error_rate: float = 0.001,
+        expected: Optional[int] = None,
+        comments: bool = True,
+        encoding: str = "utf-8",
+    ):
+        self.path = path
+        self.start = start
+        self.dedup = dedup
+        self.error_rate = error_rate
+        self.comments = comments
+        self.encoding = encoding
+        self.compressed = path.endswith(".gz")
+        if expected is None:
+            # ~8 bytes por linha em dicionários de senhas; .gz comprime ~4x
+            expected = os.path.getsize(path) // (2 if self.compressed else 8)
+        self.expected = max(1024, expected)
+
+        self.offset = start
+        self.line_offset = start
+        self.lines = 0
+        self.duplicates = 0
+        self.exhausted = False
+
+    def __iter__(self) -> Iterator[str]:
+        self.offset = self.line_offset = self.start
+        self.lines = self.duplicates = 0
+        self.exhausted = False
+
+        seen = BloomFilter(self.expected, self.error_rate) if self.dedup else None
+        if seen is not None and self.start:
+            # Retomada: as palavras antes do offset continuam valendo como vistas
+            for _, line in self._raw_lines(0, self.start):
+                seen.add(line)
+
+        for offset, line in self._raw_lines(self.start):
+            if seen is not None and not seen.add(line):
+                self.duplicates += 1
+                continue
+            self.line_offset = offset
+            self.lines += 1
+            yield str(line, self.encoding, "replace")
+
+        self.exhausted = True
+
+    def _raw_lines(self, start: int, stop: Optional[int] = None) -> Iterator[Tuple[int, Line]]:
+        """
+        (offset, linha sem o fim de linha) das linhas úteis entre start e stop
+        """
+        lines = self._gzip_lines(start) if self.compressed else self._mapped_lines(start)
+        for offset, line in lines:
+            if stop is not None and offset >= stop:
+                return
+            if len(line) and line[-1] == 13:  # \r de arquivos do Windows
+                line = line[:-1]
+            if not len(line) or (self.comments and line[0] == COMMENT):
+                continue
+            yield offset, line
+
+    def _mapped_lines(self, start: int) -> Iterator[Tuple[int, Line]]:
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            position, size = start, len(mapped)
+            if 0 < position < size and mapped[position - 1] != 10:
+                # Offset no meio de uma linha: começa na seguinte
+                position = mapped.find(b"\n", position) + 1 or size
+            while position < size:
+                end = mapped.find(b"\n", position)
+                if end < 0:
+                    end = size
+                position, line = min(end + 1, size), view[position:end]
+                self.offset = position
+                yield end - len(line), line
+        finally:
+            view.release()
+            try:
+                mapped.close()
+            except BufferError:
+                # A última fatia entregue ainda está viva: o mapa fecha quando ela for coletada
+                pass
+
+    def _gzip_lines(self, start: int) -> Iterator[Tuple[int, Line]]:
+        with gzip.open(self.path, "rb") as f:
+            position = start
+            if start:
+                f.seek(start - 1)
+                if f.read(1) != b"\n":
+                    # Offset no meio de uma linha: começa na seguinte
+                    position += len(f.readline())
+            for line in f:
+                self.offset = position + len(line)
+                yield position, line.rstrip(b"\n")
+                position = self.offset
+
+
+class ResumeCursor:
+    """
+    Offset seguro para retomar uma wordlist consumida em paralelo
+
+    Cada requisição registra (`take`) o offset da palavra que está
+    usando e o libera (`done`) ao terminar. O offset de retomada é o da
+    palavra mais antiga ainda em voo ou, sem nenhuma, o da próxima linha.
+    """
+
+    def __init__(self, wordlist: Wordlist):
+        self.wordlist = wordlist
+        self.pending: Counter = Counter()
+
+    def take(self) -> int:
+        offset = self.wordlist.line_offset
+        self.pending[offset] += 1
+        return offset
+
+    def done(self, offset: int) -> None:
+        self.pending[offset] -= 1
+        if self.pending[offset] <= 0:
+            del self.pending[offset]
+
+    @property
+    def offset(self) -> int:
+        return min(self.pending) if self.pending else self.wordlist.offset
+
+    @property
+    def finished(self) -> bool:
+        return self.wordlist.exhausted and not self.pending
@@ -0,0 +1,188 @@
+"""
+Geração de carga multiprocesso
+Divide a agenda de payloads entre processos (cada um com seu próprio
+event loop e pool de conexões) e junta histogramas e contadores em um
+único relatório no processo pai
+"""
+
+import argparse
+import copy
+import math
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .checkpoint import checkpointing
+from .cli import engine_from_args
+from .console import Dashboard, wants_dashboard
+from .engine import EngineStats
+from .profiling import ClientProfiler
+from .report import LatencyReport
+from .sink import shard_path
+
+
+@dataclass
+class Shard:
+    """
+    Fatia da agenda atribuída a um worker
+
+    `take()` distribui itens em rodízio (ex.: payloads) e `owns()` faz
+    partição estável por chave (ex.: IP de origem), para que todo o
+    tráfego de um IP saia sempre do mesmo processo.
+    """
+
+    index: int = 0
+    count: int = 1
+
+    def take(self, items: Iterable) -> Iterator:
+        for position, item in enumerate(items):
+            if position % self.count == self.index:
+                yield item
+
+    def owns(self, key: str) -> bool:
+        return zlib.crc32(key.encode()) % self.count == self.index
+
+    def split(self, total: int) -> int:
+        """
+        Quantos itens de `total` cabem a este worker
+        """
+        return total // self.count + (1 if self.index < total % self.count else 0)
+
+
+@dataclass
+class JobRun:
+    """
+    Estatísticas de uma execução (de um processo ou de todos somados)
+
+    Tem a mesma interface `totals`/`report` do LoadEngine, então os
+    relatórios dos scripts aceitam qualquer um dos dois.
+    """
+
+    totals: EngineStats = field(default_factory=EngineStats)
+    report: LatencyReport = field(default_factory=LatencyReport)
+
+
+# job(engine, args, shard, results) preenche `results` in-place
+Job = Callable[[Any, argparse.Namespace, Shard, dict], None]
+
+
+def merge_counters(target: dict, other: dict) -> None:
+    """
+    Soma recursivamente os contadores de `other` em `target`
+
+    Números são somados, dicts mesclados, listas concatenadas e
+    booleanos combinados com OR.
+    """
+    for key, value in other.items():
+        current = target.get(key)
+        if isinstance(value, bool):
+            target[key] = bool(current) or value
+        elif isinstance(value, (int, float)) and isinstance(current, (int, float)):
+            target[key] = current + value
+        elif isinstance(value, dict):
+            target.setdefault(key, {})
+            merge_counters(target[key], value)
+        elif isinstance(value, list):
+            target.setdefault(key, [])
+            target[key].extend(value)
+        elif current is None:
+            target[key] = value
+
+
+def _worker_args(args: argparse.Namespace, shard: Shard, channel=None) -> argparse.Namespace:
+    share = copy.copy(args)
+    # Workers nunca desenham: publicam no painel único do processo pai
+    share.no_dashboard = True
+    share.dashboard_channel = channel
+    share.worker_index = shard.index
+    share.concurrency = max(1, math.ceil(args.concurrency / shard.count))
+    if getattr(args, "pool_size", None):
+        share.pool_size = max(1, math.ceil(args.pool_size / shard.count))
+    if args.rate:
+        share.rate = args.rate / shard.count
+    elif getattr(args, "delay", 0):
+        share.delay = args.delay * shard.count
+    if getattr(args, "output", None):
+        share.output = shard_path(args.output, shard.index)
+    if getattr(args, "log", None):
+        share.log = shard_path(args.log, shard.index)
+    return share
+
+
+def _profiled(job: Job, engine, args: argparse.Namespace, shard: Shard, results: dict) -> None:
+    """
+    Executa o job, com o cliente perfilado se houver --profile
+    """
+    if not getattr(args, "profile", None):
+        job(engine, args, shard, results)
+        return
+
+    path = shard_path(args.profile, shard.index) if shard.count > 1 else args.profile
+    profiler = ClientProfiler(path)
+    profiler.start(events=lambda: engine.console.stats.completed)
+    try:
+        job(engine, args, shard, results)
+    finally:
+        engine.totals.client = profiler.stop()
+
+
+def _run_shard(job: Job, args: argparse.Namespace, shard: Shard, results: dict, channel=None):
+    with engine_from_args(_worker_args(args, shard, channel)) as engine:
+        with checkpointing(engine, args, shard):
+            _profiled(job, engine, args, shard, results)
+        return results, engine.totals, engine.report.to_dict()
+
+
+def run_job(
+    args: argparse.Namespace,
+    job: Job,
+    results: dict,
+    merge: Callable[[dict, dict], None] = merge_counters,
+    workers: Optional[int] = None,
+) -> JobRun:
+    """
+    Executa `job` em um processo ou espalhado em `--workers` processos
+
+    Com um único worker o job roda no próprio processo e `results` é
+    preenchido diretamente (um Ctrl+C preserva o resultado parcial).
+    Com vários, cada processo recebe uma cópia vazia de `results` e as
+    cópias são combinadas com `merge` ao final. Com --checkpoint cada
+    processo grava e retoma o seu próprio checkpoint.
+    """
+    count = workers or getattr(args, "workers", 1) or 1
+
+    if count <= 1:
+        with engine_from_args(args) as engine:
+            with checkpointing(engine, args, Shard()):
+                _profiled(job, engine, args, Shard(), results)
+            return JobRun(engine.totals, engine.report)
+
+    template = copy.deepcopy(results)
+    run = JobRun()
+
+    manager = channel = dashboard = None
+    if wants_dashboard(args):
+        manager = multiprocessing.Manager()
+        channel = manager.Queue()
+        dashboard = Dashboard(channel)
+        dashboard.start()
+
+    try:
+        with ProcessPoolExecutor(max_workers=count) as pool:
+            futures = [
+                pool.submit(_run_shard, job, args, Shard(index, count), copy.deepcopy(template), channel)
+                for index in range(count)
+            ]
+            for future in futures:
+                shard_results, totals, report = future.result()
+                merge(results, shard_results)
+                run.totals.add(totals, parallel=True)
+                run.report.merge(LatencyReport.from_dict(report))
+    finally:
+        if dashboard is not None:
+            dashboard.stop()
+            manager.shutdown()
+
+    return run
@@ -0,0 +1,549 @@
+"""
+Servidor Alvo Simulado (Mock WAF)
+Imita o WAFMiddleware, o /auth/login e os honeypots da API NestJS em um
+único processo Python, sem Postgres, para medir o teto do próprio
+gerador de carga e rodar os scripts em uma máquina sem o stack completo
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+# Mesmos padrões do DetectionService (src/security/detection/detection-engine.ts)
+SQL_PATTERNS = [
+    re.compile(r"(\bunion\b.*\bselect\b)", re.I),
+    re.compile(r"(\bor\b.*=.*)", re.I),
+    re.compile(r"(\'.*\bor\b.*\'.*=.*\')", re.I),
+    re.compile(r"(\bdrop\b.*\btable\b)", re.I),
+    re.compile(r"(;.*\b(drop|delete|insert|update)\b)", re.I),
+    re.compile(r"(\bexec\b.*\()", re.I),
+    re.compile(r"(\/\*.*\*\/)"),
+    re.compile(r"(--[^\r\n]*)"),
+    re.compile(r"(\bxp_cmdshell\b)", re.I),
+]
+XSS_PATTERNS = [
+    re.compile(r"<script[^>]*>.*?<\/script>", re.I),
+    re.compile(r"javascript:", re.I),
+    re.compile(r"on\w+\s*=", re.I),
+    re.compile(r"<iframe[^>]*>", re.I),
+    re.compile(r"<object[^>]*>", re.I),
+    re.compile(r"<embed[^>]*>", re.I),
+]
+PATH_PATTERNS = [
+    re.compile(r"\.\.[\/\\]"),
+    re.compile(r"%2e%2e[\/\\]", re.I),
+    re.compile(r"\.\.[%2f%5c]", re.I),
+]
+
+# Mesmos pesos e limiar do ThreatIntelligenceService
+ATTACK_SCORES = {
+    "BRUTE_FORCE": 10,
+    "SQL_INJECTION": 25,
+    "XSS": 20,
+    "SUSPICIOUS_PATTERN": 10,
+    "RATE_LIMIT_EXCEEDED": 5,
+}
+
+# Rotas fora do WAF (app.module.ts): honeypots coletam inteligência sem bloquear
+WAF_EXCLUDED = re.compile(
+    r"^/(admin|administrator|phpmyadmin|debug|swagger|api-docs)(/.*)?$"
+    r"|^/(db|database|\.env|config\.json|secrets\.txt|passwords\.txt|backup\.sql|test|dev)$"
+)
+# Rotas do HoneypotController e o tipo de resposta falsa de cada uma
+HONEYPOTS = {
+    "/admin": "admin",
+    "/administrator": "admin",
+    "/admin/login": "admin",
+    "/admin/dashboard": "admin",
+    "/db": "database",
+    "/database": "database",
+    "/phpmyadmin": "database",
+    "/mysql": "database",
+    "/.env": "file",
+    "/config.json": "file",
+    "/secrets.txt": "file",
+    "/passwords.txt": "file",
+    "/backup.sql": "file",
+    "/debug": "api",
+    "/test": "api",
+    "/dev": "api",
+    "/swagger": "api",
+    "/api-docs": "api",
+}
+PROTECTED = ("/users", "/auth/me", "/monitoring")
+
+DEVELOPMENT_IPS = {"127.0.0.1", "::1", "localhost", "::ffff:127.0.0.1"}
+
+FAILED_LOGIN_WINDOW = 5 * 60
+# Chaves examinadas por hit na limpeza das inativas (como no SlidingWindowCounter)
+PRUNE_SCAN = 64
+
+
+class SlidingWindow:
+    """
+    Contador de janela deslizante por chave, como o SlidingWindowCounter da API
+
+    A janela é dividida em `slots` fatias em um buffer circular: hit,
+    contagem e Retry-After custam no máximo `slots` passos. As chaves ficam
+    na ordem do último hit e cada hit descarta no máximo PRUNE_SCAN das
+    inativas, que estão no começo.
+    """
+
+    def __init__(self, window: float, slots: int = 10):
+        self.window = window
+        self.slots = slots
+        self.slot_seconds = window / slots
+        # chave -> [fatia do último hit, total, contagens por fatia]
+        self.entries: "OrderedDict[str, list]" = OrderedDict()
+
+    def hit(self, key: str, now: float) -> int:
+        """
+        Registra um hit e devolve o total da chave na janela (incluindo ele)
+        """
+        slot = int(now // self.slot_seconds)
+        self._prune(slot)
+
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [slot, 0, [0] * self.slots]
+        else:
+            self._advance(entry, slot)
+            self.entries.move_to_end(key)
+        entry[2][slot % self.slots] += 1
+        entry[1] += 1
+        return entry[1]
+
+    def retry_after(self, key: str, limit: int, now: float) -> float:
+        """
+        Segundos até o total da chave ficar abaixo de `limit`
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return 0.0
+        self._advance(entry, int(now // self.slot_seconds))
+        remaining = entry[1]
+        for slot in range(entry[0] - self.slots + 1, entry[0] + 1):
+            if remaining < limit:
+                break
+            remaining -= entry[2][slot % self.slots]
+            if remaining < limit:
+                return max(0.0, (slot + self.slots) * self.slot_seconds - now)
+        return 0.0
+
+    def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    def _prune(self, slot: int) -> None:
+        for _ in range(min(PRUNE_SCAN, len(self.entries))):
+            entry = next(iter(self.entries.values()))
+            self._advance(entry, slot)
+            if entry[1] > 0:
+                return
+            self.entries.popitem(last=False)
+
+    def _advance(self, entry: list, slot: int) -> None:
+        if slot <= entry[0]:
+            return
+        if slot - entry[0] >= self.slots:
+            entry[1] = 0
+            entry[2] = [0] * self.slots
+        else:
+            for step in range(entry[0] + 1, slot + 1):
+                entry[1] -= entry[2][step % self.slots]
+                entry[2][step % self.slots] = 0
+        entry[0] = slot
+
+
+def js_stringify(value) -> str:
+    """
+    Equivalente ao JSON.stringify usado pelo DetectionService
+    """
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+class MockWAF:
+    """
+    Estado e regras do WAF simulado
+
+    Detecção por regex igual à da API, threat score por IP com bloqueio
+    automático, contagem de logins falhos, rate limit por IP + endpoint
+    e regras extras opcionais.
+
+    Args:
+        mode: production (bloqueia todos) ou test (não bloqueia IPs locais)
+        block_score: Threat score que coloca o IP na blocklist
+        block_ttl: Segundos até o bloqueio expirar (None = permanente)
+        disabled: Famílias de detecção desligadas (sqli, xss, path)
+        rules: Regex extras que bloqueiam quando casam com path/query/body
+        credentials: Pares email -> senha aceitos pelo /auth/login
+        rate_limit: Requisições por IP + endpoint na janela (0 = desligado)
+        rate_window: Janela do rate limit em segundos
+    """
+
+    def __init__(
+        self,
+        mode: str = "production",
+        block_score: int = 100,
+        block_ttl: Optional[float] = None,
+        disabled: Optional[List[str]] = None,
+        rules: Optional[List[str]] = None,
+        credentials: Optional[Dict[str, str]] = None,
+        rate_limit: int = 0,
+        rate_window: float = 60.0,
+    ):
+        self.mode = mode
+        self.block_score = block_score
+        self.block_ttl = block_ttl
+        self.disabled = set(disabled or ())
+        self.rules = [re.compile(rule, re.I) for rule in rules or ()]
+        self.credentials = credentials or {}
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.reset()
+
+    def reset(self) -> None:
+        self.scores: Dict[str, int] = {}
+        # ip -> expiração (None = permanente)
+        self.blocklist: Dict[str, Optional[float]] = {}
+        self.failed_logins = SlidingWindow(FAILED_LOGIN_WINDOW)
+        self.requests = SlidingWindow(self.rate_window)
+        self.stats = {
+            "requests": 0,
+            "blocked": 0,
+            "blocked_by": {},
+            "rate_limited": 0,
+            "honeypot_hits": 0,
+            "logins": {"failed": 0, "success": 0},
+            "started_at": time.time(),
+        }
+
+    def detect(self, endpoint: str, query: dict, body) -> Optional[str]:
+        """
+        Tipo do ataque detectado (ou None)
+
+        Como no DetectionService, vence a detecção de maior confiança e,
+        no empate, a primeira avaliada (SQLi, XSS, path traversal).
+        """
+        detections = []
+        content = js_stringify([body, query])
+
+        if "sqli" not in self.disabled:
+            lowered = content.lower()
+            matched = sum(1 for p in SQL_PATTERNS if p.search(lowered))
+            if matched:
+                detections.append((min(matched * 0.3, 1), "SQL_INJECTION"))
+
+        if "xss" not in self.disabled:
+            matched = sum(1 for p in XSS_PATTERNS if p.search(content))
+            if matched:
+                detections.append((min(matched * 0.35, 1), "XSS"))
+
+        if "path" not in self.disabled:
+            with_endpoint = js_stringify([endpoint, query, body])
+            if any(p.search(with_endpoint) for p in PATH_PATTERNS):
+                detections.append((0.9, "SUSPICIOUS_PATTERN"))
+
+        if detections:
+            best = detections[0]
+            for detection in detections[1:]:
+                if detection[0] > best[0]:
+                    best = detection
+            return best[1]
+
+        if self.rules:
+            content = js_stringify([endpoint, query, body])
+            if any(rule.search(content) for rule in self.rules):
+                return "RULE"
+
+        return None
+
+    def is_blocked(self, ip: str) -> bool:
+        if ip not in self.blocklist:
+            return False
+        expires = self.blocklist[ip]
+        if expires is not None and expires < time.time():
+            del self.blocklist[ip]
+            return False
+        return True
+
+    def record_threat(self, ip: str, attack_type: str) -> None:
+        score = self.scores.get(ip, 0) + ATTACK_SCORES.get(attack_type, 5)
+        self.scores[ip] = score
+        if score >= self.block_score and not self.is_blocked(ip):
+            self.blocklist[ip] = time.time() + self.block_ttl if self.block_ttl else None
+
+    def record_failed_login(self, ip: str) -> None:
+        if self.failed_logins.hit(ip, time.time()) >= 3:
+            self.record_threat(ip, "BRUTE_FORCE")
+
+    def check_rate_limit(self, ip: str, endpoint: str) -> Optional[float]:
+        """
+        Segundos até o IP voltar a ser atendido no endpoint (None = dentro do limite)
+
+        Como no DetectionService.checkRateLimit, recusas também contam e só
+        a primeira requisição acima do limite soma threat score.
+        """
+        if self.rate_limit <= 0:
+            return None
+        key, now = f"{ip} {endpoint}", time.time()
+        count = self.requests.hit(key, now)
+        if count <= self.rate_limit:
+            return None
+        if count == self.rate_limit + 1:
+            self.record_threat(ip, "RATE_LIMIT_EXCEEDED")
+        return self.requests.retry_after(key, self.rate_limit, now)
+
+    def count_block(self, reason: str) -> None:
+        self.stats["blocked"] += 1
+        self.stats["blocked_by"][reason] = self.stats["blocked_by"].get(reason, 0) + 1
+
+    def spares(self, ip: str) -> bool:
+        """
+        Em modo test, IPs locais são apenas registrados, nunca bloqueados
+        """
+        return self.mode == "test" and ip in DEVELOPMENT_IPS
+
+
+def client_ip(request: web.Request) -> str:
+    forwarded = request.headers.get("X-Forwarded-For")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return request.remote or "unknown"
+
+
+def forbidden(body=None) -> web.Response:
+    return web.json_response(body or {"statusCode": 403, "message": "Forbidden"}, status=403)
+
+
+def build_app(waf: MockWAF, latency: float = 0.0, jitter: float = 0.0, attack_latency: float = 0.0) -> web.Application:
+    """
+    Monta a aplicação aiohttp com as rotas e o middleware do WAF
+
+    Latências em segundos: `latency` (+ até `jitter`) em toda resposta e
+    `attack_latency` extra quando um ataque é registrado, no lugar das
+    gravações em banco que a API faz antes de responder.
+    """
+
+    async def delay(attack: bool = False) -> None:
+        seconds = latency + (random.uniform(0, jitter) if jitter else 0.0)
+        if attack:
+            seconds += attack_latency
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    @web.middleware
+    async def waf_middleware(request: web.Request, handler):
+        if request.path.startswith("/__mock__/"):
+            return await handler(request)
+
+        waf.stats["requests"] += 1
+        ip = client_ip(request)
+        request["client_ip"] = ip
+        if WAF_EXCLUDED.match(request.path):
+            return await handler(request)
+
+        if waf.is_blocked(ip) and not waf.spares(ip):
+            waf.count_block("blocklist")
+            await delay()
+            return forbidden()
+
+        retry_after = waf.check_rate_limit(ip, request.path)
+        if retry_after is not None and not waf.spares(ip):
+            waf.stats["rate_limited"] += 1
+            await delay()
+            seconds = math.ceil(retry_after)
+            return web.json_response(
+                {"statusCode": 429, "message": "Too Many Requests", "retryAfter": seconds},
+                status=429,
+                headers={"Retry-After": str(seconds)},
+            )
+
+        try:
+            body = await request.json() if request.can_read_body else {}
+        except (ValueError, UnicodeDecodeError):
+            body = {}
+        request["body"] = body
+
+        attack = waf.detect(request.raw_path.split("?")[0], dict(request.query), body)
+        if attack is not None:
+            if attack != "RULE":
+                waf.record_threat(ip, attack)
+            await delay(attack=True)
+            if not waf.spares(ip):
+                waf.count_block(attack)
+                return forbidden({
+                    "statusCode": 403,
+                    "message": "Request blocked by WAF",
+                    "reason": "Suspicious activity detected",
+                })
+            return await handler(request)
+
+        await delay()
+        return await handler(request)
+
+    async def login(request: web.Request) -> web.Response:
+        body = request.get("body") or {}
+        email, password = body.get("email"), body.get("password")
+        if email in waf.credentials and waf.credentials[email] == password:
+            waf.stats["logins"]["success"] += 1
+            waf.failed_logins.delete(request["client_ip"])
+            return web.json_response({"access_token": "mock.jwt.token"}, status=200)
+
+        waf.stats["logins"]["failed"] += 1
+        waf.record_failed_login(request["client_ip"])
+        return web.json_response(
+            {"statusCode": 401, "message": "Credenciais inválidas", "error": "Unauthorized"},
+            status=401,
+        )
+
+    async def honeypot(request: web.Request) -> web.Response:
+        waf.stats["honeypot_hits"] += 1
+        waf.record_threat(request["client_ip"], "SUSPICIOUS_PATTERN")
+        await delay(attack=True)
+        return web.json_response({"success": True, "type": HONEYPOTS[request.path]})
+
+    async def fallback(request: web.Request) -> web.Response:
+        if request.path in HONEYPOTS:
+            return await honeypot(request)
+        if request.path.startswith(PROTECTED):
+            return web.json_response({"statusCode": 401, "message": "Unauthorized"}, status=401)
+        return web.json_response(
+            {"statusCode": 404, "message": f"Cannot {request.method} {request.path}", "error": "Not Found"},
+            status=404,
+        )
+
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response({
+            **waf.stats,
+            "uptime": time.time() - waf.stats["started_at"],
+            "blocklist_size": len(waf.blocklist),
+            "threat_actors": len(waf.scores),
+            "pid": os.getpid(),
+        })
+
+    async def reset(request: web.Request) -> web.Response:
+        waf.reset()
+        return web.json_response({"reset": True})
+
+    app = web.Application(middlewares=[waf_middleware])
+    app.router.add_get("/__mock__/stats", stats)
+    app.router.add_post("/__mock__/reset", reset)
+    app.router.add_post("/auth/login", login)
+    app.router.add_route("*", "/{tail:.*}", fallback)
+    return app
+
+
+def serve(args: argparse.Namespace, reuse_port: bool = False) -> None:
+    credentials = dict(pair.split(":", 1) for pair in args.credentials)
+    waf = MockWAF(
+        mode=args.mode,
+        block_score=args.block_score,
+        block_ttl=args.block_ttl,
+        disabled=args.disable,
+        rules=args.rule,
+        credentials=credentials,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+    )
+    app = build_app(waf, args.latency / 1000, args.jitter / 1000, args.attack_latency / 1000)
+    web.run_app(app, host=args.host, port=args.port, reuse_port=reuse_port, print=None, access_log=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Servidor alvo simulado com o comportamento do WAF da API"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=3000, help="Porta (padrão: 3000, a mesma da API)")
+    parser.add_argument(
+        "--mode",
+        choices=["production", "test"],
+        default=os.environ.get("WAF_MODE", "production"),
+        help="Como o WAF_MODE da API: test não bloqueia IPs locais (padrão: $WAF_MODE ou production)",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Latência base por resposta em ms (padrão: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variação aleatória somada à latência em ms (padrão: 0)")
+    parser.add_argument(
+        "--attack-latency",
+        type=float,
+        default=0.0,
+        help="Latência extra em ms quando um ataque é registrado (simula as gravações em banco)",
+    )
+    parser.add_argument("--block-score", type=int, default=100, help="Threat score que bloqueia o IP (padrão: 100)")
+    parser.add_argument("--block-ttl", type=float, help="Segundos até o bloqueio expirar (padrão: permanente)")
+    parser.add_argument(
+        "--disable",
+        action="append",
+        choices=["sqli", "xss", "path"],
+        default=[],
+        help="Desliga uma família de detecção (pode repetir)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=0,
+        help="Requisições por IP + endpoint na janela antes do 429, como RATE_LIMIT_MAX_REQUESTS (padrão: 0 - desligado)",
+    )
+    parser.add_argument(
+        "--rate-window",
+        type=float,
+        default=60.0,
+        help="Janela do rate limit em segundos, como RATE_LIMIT_WINDOW_MS (padrão: 60)",
+    )
+    parser.add_argument("--rule", action="append", default=[], help="Regex extra que bloqueia path/query/body (pode repetir)")
+    parser.add_argument(
+        "--credentials",
+        action="append",
+        default=[],
+        metavar="EMAIL:SENHA",
+        help="Credencial aceita pelo /auth/login (pode repetir; padrão: nenhuma)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Processos servindo a mesma porta (SO_REUSEPORT); cada um tem estado próprio (padrão: 1)",
+    )
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 50)
+    print("🧪 MOCK WAF SERVER")
+    print("=" * 50)
+    print(f"Escutando:  http://{args.host}:{args.port}")
+    print(f"Modo:       {args.mode}")
+    print(f"Latência:   {args.latency:g}ms (+{args.jitter:g}ms jitter, +{args.attack_latency:g}ms em ataques)")
+    print(f"Rate limit: {f'{args.rate_limit} req/{args.rate_window:g}s por IP + endpoint' if args.rate_limit else 'desligado'}")
+    print(f"Processos:  {args.processes}")
+    print(f"Estatísticas: GET /__mock__/stats | reset: POST /__mock__/reset")
+    print("=" * 50 + "\n")
+
+    if args.processes <= 1:
+        serve(args)
+        return
+
+    processes = [
+        multiprocessing.Process(target=serve, args=(args, True), daemon=True)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
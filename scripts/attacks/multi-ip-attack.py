@@ -3,23 +3,19 @@ Script de Ataque Simulado - Múltiplos IPs
 Simula ataques vindos de diferentes endereços IP
 """
 
-import requests
+import math
 import random
 import time
 import argparse
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Optional
 
-BASE_URL = "http://localhost:3000"
-
-# IPs fictícios para simular ataques de diferentes origens
-ATTACKER_IPS = [
-    "203.0.113.10",    # IP documentação RFC 5737
-    "198.51.100.50",   # IP documentação RFC 5737
-    "192.0.2.100",     # IP documentação RFC 5737
-    "45.33.32.156",    # IP suspeito fictício
-    "185.220.101.1",   # IP suspeito fictício
-    "104.28.0.1",      # IP suspeito fictício
-    "8.8.8.8",         # Google DNS (exemplo de IP legítimo)
-]
+from harness import AttackRequest, AttackResult, LatencyHistogram, LoadEngine, open_loop_pool_size
+from harness import JobRun, Shard, add_engine_arguments, merge_counters, print_engine_stats, run_job
+from harness.checkpoint import print_checkpoint_hint
+from harness.fleet import DEFAULT_CIDRS, FleetConfig, IpFleet, parse_mix
+from harness.payloads import ATTACKER_IPS
 
 SQL_INJECTION_PAYLOADS = [
     "' OR '1'='1",
@@ -28,40 +24,49 @@ SQL_INJECTION_PAYLOADS = [
     "'; DROP TABLE users--",
 ]
 
+# Mínimo teórico até o bloqueio: 4 SQLi de 25 pontos levam o IP ao
+# limiar CRITICAL (100) e a 5ª requisição já deveria cair na blocklist
+IDEAL_REQUESTS_TO_BLOCK = 5
+
 
-def attack_from_ip(ip: str, payload: str, attack_type: str = "SQL Injection"):
+def attack_from_ip(ip: str, payload: str, attack_type: str = "SQL Injection") -> AttackRequest:
     """
-    Simula um ataque vindo de um IP específico
+    Monta um ataque vindo de um IP específico
     """
-    endpoint = f"{BASE_URL}/auth/login"
-    
-    try:
-        response = requests.post(
-            endpoint,
-            json={"email": payload, "password": "test123"},
-            headers={
-                "X-Forwarded-For": ip,  # Simula IP de origem
-                "User-Agent": f"AttackBot/1.0 ({attack_type})",
-            },
-            timeout=5,
-        )
+    endpoint = "/auth/login"
+
+    return AttackRequest(
+        "POST",
+        endpoint,
+        json={"email": payload, "password": "test123"},
+        headers={
+            "X-Forwarded-For": ip,  # Simula IP de origem
+            "User-Agent": f"AttackBot/1.0 ({attack_type})",
+        },
+        meta={"ip": ip, "payload": payload},
+    )
 
-        if response.status_code == 403:
-            return "🛡️  BLOCKED"
-        elif response.status_code == 401:
-            return "⚠️  DETECTED (401)"
-        elif response.status_code == 400:
-            return "⚠️  DETECTED (400)"
-        else:
-            return f"⚠️  DETECTED ({response.status_code})"
 
-    except requests.exceptions.Timeout:
+def describe_result(result: AttackResult) -> str:
+    """
+    Traduz a resposta de um ataque em um status legível
+    """
+    if result.timed_out:
         return "⏱️  TIMEOUT"
-    except Exception as e:
-        return f"❌ ERROR: {str(e)[:30]}"
+    if result.error is not None:
+        return f"❌ ERROR: {str(result.error)[:30]}"
 
+    if result.status == 403:
+        return "🛡️  BLOCKED"
+    elif result.status == 401:
+        return "⚠️  DETECTED (401)"
+    elif result.status == 400:
+        return "⚠️  DETECTED (400)"
+    else:
+        return f"⚠️  DETECTED ({result.status})"
 
-def simulate_distributed_attack(num_attacks: int = 20, delay: float = 0.5):
+
+def simulate_distributed_attack(engine: LoadEngine, num_attacks: int = 20, ips: List[str] = ATTACKER_IPS):
     """
     Simula um ataque distribuído de múltiplos IPs
     """
@@ -69,8 +74,9 @@ def simulate_distributed_attack(num_attacks: int = 20, delay: float = 0.5):
     print("🌐 ATAQUE DISTRIBUÍDO - MÚLTIPLOS IPs")
     print("=" * 60)
     print(f"Total de ataques: {num_attacks}")
-    print(f"IPs atacantes:    {len(ATTACKER_IPS)}")
-    print(f"Delay:            {delay}s")
+    print(f"IPs atacantes:    {len(ips)}")
+    print(f"Concorrência:     {engine.concurrency}")
+    print(f"Taxa:             {engine.rate or 'sem limite'} req/s")
     print("=" * 60 + "\n")
 
     results = {
@@ -79,19 +85,19 @@ def simulate_distributed_attack(num_attacks: int = 20, delay: float = 0.5):
         "detected": 0,
         "by_ip": {},
     }
+    results = engine.checkpointed("distributed", results)
+
+    def handle(result: AttackResult) -> None:
+        i = result.request.meta["index"]
+        ip = result.request.meta["ip"]
+        payload = result.request.meta["payload"]
 
-    for i in range(1, num_attacks + 1):
-        # Escolhe IP aleatório
-        ip = random.choice(ATTACKER_IPS)
-        payload = random.choice(SQL_INJECTION_PAYLOADS)
-        
         # Inicializa contador do IP se necessário
         if ip not in results["by_ip"]:
             results["by_ip"][ip] = {"total": 0, "blocked": 0}
-        
-        # Executa ataque
-        status = attack_from_ip(ip, payload)
-        
+
+        status = describe_result(result)
+
         results["total"] += 1
         results["by_ip"][ip]["total"] += 1
         
@@ -101,14 +107,24 @@ def simulate_distributed_attack(num_attacks: int = 20, delay: float = 0.5):
         else:
             results["detected"] += 1
         
-        print(f"[{i:2d}/{num_attacks}] {ip:15s} | {status:20s} | {payload[:30]}")
-        
-        time.sleep(delay)
+        engine.console.log(f"[{i:2d}/{num_attacks}] {ip:15s} | {status:20s} | {payload[:30]}")
+
+    def build_requests():
+        for i in range(1, num_attacks + 1):
+            # Escolhe IP aleatório
+            ip = random.choice(ips)
+            payload = random.choice(SQL_INJECTION_PAYLOADS)
+
+            request = attack_from_ip(ip, payload)
+            request.meta["index"] = i
+            yield request
+
+    engine.run(build_requests(), handle, phase="distributed")
 
     return results
 
 
-def simulate_focused_attack(target_ip: str, num_attacks: int = 10):
+def simulate_focused_attack(engine: LoadEngine, target_ip: str, num_attacks: int = 10):
     """
     Simula múltiplos ataques de um único IP (para testar blocklist)
     """
@@ -123,10 +139,12 @@ def simulate_focused_attack(target_ip: str, num_attacks: int = 10):
         "blocked": 0,
         "detected": 0,
     }
+    results = engine.checkpointed("focused", results)
 
-    for i in range(1, num_attacks + 1):
-        payload = random.choice(SQL_INJECTION_PAYLOADS)
-        status = attack_from_ip(target_ip, payload)
+    def handle(result: AttackResult) -> None:
+        i = result.request.meta["index"]
+        payload = result.request.meta["payload"]
+        status = describe_result(result)
         
         results["total"] += 1
         
@@ -135,14 +153,351 @@ def simulate_focused_attack(target_ip: str, num_attacks: int = 10):
         else:
             results["detected"] += 1
         
-        print(f"[{i:2d}/{num_attacks}] {status:20s} | {payload[:30]}")
-        
-        time.sleep(0.5)
+        engine.console.log(f"[{i:2d}/{num_attacks}] {status:20s} | {payload[:30]}")
+
+    def build_requests():
+        for i in range(1, num_attacks + 1):
+            request = attack_from_ip(target_ip, random.choice(SQL_INJECTION_PAYLOADS))
+            request.meta["index"] = i
+            yield request
+
+    engine.run(build_requests(), handle, phase="focused")
+
+    return results
+
+
+def fleet_bucket(active_ips: int) -> int:
+    """
+    Faixa de IPs distintos já vistos (1, 10, 100, ... 1.000.000)
+    """
+    bucket = 1
+    while bucket < active_ips:
+        bucket *= 10
+    return bucket
+
+
+def simulate_fleet_attack(engine: LoadEngine, fleet: IpFleet, shard: Shard):
+    """
+    Simula uma frota de milhares a milhões de IPs, cada um com seu perfil
+
+    Toda a frota é agendada no mesmo event loop: cada requisição sai no
+    instante definido pelo perfil do seu IP. A latência é agrupada pelo
+    número de IPs distintos vistos até o envio, para mostrar como o WAF
+    (threat_actors, ip_blocklist, isIpBlocked) escala com os atacantes.
+    """
+    config = fleet.config
+    print("\n" + "=" * 60)
+    print("🌐 ATAQUE DISTRIBUÍDO - FROTA VIRTUAL")
+    print("=" * 60)
+    print(f"IPs na frota:     {fleet.size} ({', '.join(config.cidrs)})")
+    print("Perfis:           " + ", ".join(f"{name}: {len(ips)} IPs" for name, ips in fleet.ranges.items()))
+    print(f"Duração:          {config.duration:g}s")
+    print("=" * 60 + "\n")
+
+    results = {
+        "total": 0,
+        "blocked": 0,
+        "detected": 0,
+        "errors": 0,
+        "ips_seen": 0,
+        "ips_blocked": 0,
+        "by_profile": {},
+        "scaling": {},
+    }
+    results = engine.checkpointed("fleet", results)
+    # Bit 1 = IP já enviou, bit 2 = IP já foi bloqueado (1 byte por IP da frota)
+    flags = engine.checkpointed("fleet-flags", bytearray(fleet.size))
+
+    def build_requests():
+        for event in fleet.schedule(shard.index, shard.count):
+            if not flags[event.ip_index] & 1:
+                flags[event.ip_index] |= 1
+                results["ips_seen"] += 1
+
+            ip = fleet.address(event.ip_index)
+            request = attack_from_ip(ip, random.choice(SQL_INJECTION_PAYLOADS))
+            request.at = event.at
+            request.read_body = False
+            request.meta.update(
+                family="multi_ip",
+                profile=event.profile,
+                ip_index=event.ip_index,
+                # Estimativa global: cada worker vê 1/N da frota
+                active_ips=results["ips_seen"] * shard.count,
+            )
+            yield request
+
+    def handle(result: AttackResult) -> None:
+        meta = result.request.meta
+        profile = results["by_profile"].setdefault(meta["profile"], {"total": 0, "blocked": 0, "errors": 0})
+        bucket = results["scaling"].setdefault(
+            fleet_bucket(meta["active_ips"]),
+            {"total": 0, "blocked": 0, "histogram": LatencyHistogram()},
+        )
+
+        results["total"] += 1
+        profile["total"] += 1
+        bucket["total"] += 1
+
+        if result.error is not None:
+            results["errors"] += 1
+            profile["errors"] += 1
+            return
+
+        bucket["histogram"].record(result.latency)
+        if result.status == 403:
+            results["blocked"] += 1
+            profile["blocked"] += 1
+            bucket["blocked"] += 1
+            if not flags[meta["ip_index"]] & 2:
+                flags[meta["ip_index"]] |= 2
+                results["ips_blocked"] += 1
+        else:
+            results["detected"] += 1
+
+        engine.console.log(f"{result.request.at:9.3f}s {meta['ip']:15s} | {meta['profile']:7s} | {describe_result(result)}")
+
+    engine.run(build_requests(), handle, phase="fleet", scheduled=True)
+
+    return results
+
+
+def is_blocklisted(result: AttackResult) -> bool:
+    """
+    403 vindo da blocklist (IP já bloqueado), não da detecção do payload
+
+    O WAF responde "Forbidden" quando isIpBlocked encontra o IP e
+    "Request blocked by WAF" quando bloqueia a requisição pelo conteúdo.
+    """
+    return result.status == 403 and "Request blocked by WAF" not in result.text
+
+
+def count_percentile(counts: Dict[int, int], p: float) -> int:
+    """
+    Percentil de uma distribuição {valor: ocorrências}
+    """
+    total = sum(counts.values())
+    if not total:
+        return 0
+    target = max(1, math.ceil(p / 100.0 * total))
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen >= target:
+            return value
+    return max(counts)
+
+
+def simulate_time_to_block(
+    engine: LoadEngine,
+    fleet: IpFleet,
+    levels: List[int],
+    ips_per_level: int,
+    max_per_ip: int,
+    shard: Shard,
+    rate: Optional[float] = None,
+):
+    """
+    Mede quanto o auto-bloqueio demora para valer, em vários níveis de concorrência
+
+    Em cada nível um grupo novo de IPs da frota envia SQLi, `level` IPs
+    por vez, até o primeiro 403 da blocklist (ou `max_per_ip`
+    requisições). Por IP são registradas quantas requisições e quantos
+    ms se passaram entre o primeiro envio e essa resposta. Sob carga o
+    score é gravado mais tarde e mais requisições passam antes do
+    bloqueio.
+
+    Só um --rate explícito limita o envio (o --delay padrão derrubaria a
+    carga que se quer medir). A agenda depende dos bloqueios, então numa
+    retomada de checkpoint o nível interrompido é medido de novo.
+    """
+    print("\n" + "=" * 60)
+    print("⏱️  TEMPO ATÉ O BLOQUEIO - AUTO-BLOCK")
+    print("=" * 60)
+    print(f"Níveis de concorrência: {', '.join(str(level) for level in levels)}")
+    print(f"IPs por nível:          {ips_per_level}")
+    print(f"Máximo por IP:          {max_per_ip} requisições")
+    print(f"Mínimo teórico:         {IDEAL_REQUESTS_TO_BLOCK} requisições")
+    print("=" * 60 + "\n")
+
+    results = {"total": 0, "blocked": 0, "detected": 0, "errors": 0, "time_to_block": {}}
+    results = engine.checkpointed("time-to-block", results)
+    # Tentativas por nível: refeito após uma retomada, o nível usa IPs novos
+    # (os da tentativa interrompida já podem estar na blocklist)
+    attempts = engine.checkpointed("time-to-block-attempts", {})
+
+    for position, level in enumerate(levels):
+        attempt = attempts.get(position, 0)
+        attempts[position] = attempt + 1
+        first = (position + attempt * len(levels)) * ips_per_level
+        indices = [i for i in range(first, first + ips_per_level) if i % shard.count == shard.index]
+        if not indices:
+            continue
+
+        # O nível só entra em `results` completo (um nível interrompido é descartado)
+        counts = {"total": 0, "blocked": 0, "detected": 0, "errors": 0}
+        row = {"ips": len(indices), "blocked": 0, "sent": 0, "requests": {}, "histogram": LatencyHistogram()}
+        sent = {index: 0 for index in indices}
+        first_sent: Dict[int, float] = {}
+        done = set()
+
+        concurrency = max(1, math.ceil(level / shard.count))
+
+        def build_requests():
+            # Rodízio entre `concurrency` IPs ativos: cada um fica com ~1
+            # requisição em voo e, ao ser bloqueado, cede a vez ao próximo
+            remaining = iter(indices)
+            pending = deque(islice(remaining, concurrency))
+            while pending:
+                index = pending.popleft()
+                if index in done or sent[index] >= max_per_ip:
+                    following = next(remaining, None)
+                    if following is not None:
+                        pending.append(following)
+                    continue
+                sent[index] += 1
+                if sent[index] == 1:
+                    first_sent[index] = time.perf_counter()
+
+                request = attack_from_ip(fleet.address(index), random.choice(SQL_INJECTION_PAYLOADS))
+                # O corpo distingue o 403 da blocklist do 403 da detecção
+                request.read_body = True
+                request.meta.update(family="multi_ip", ip_index=index, sequence=sent[index])
+                pending.append(index)
+                yield request
+
+        def handle(result: AttackResult) -> None:
+            meta = result.request.meta
+            counts["total"] += 1
+            row["sent"] += 1
+
+            if result.error is not None:
+                counts["errors"] += 1
+                return
+
+            if result.status == 403:
+                counts["blocked"] += 1
+            else:
+                counts["detected"] += 1
+
+            index = meta["ip_index"]
+            if index in done or not is_blocklisted(result):
+                return
+
+            done.add(index)
+            elapsed = time.perf_counter() - first_sent[index]
+            row["blocked"] += 1
+            row["requests"][meta["sequence"]] = row["requests"].get(meta["sequence"], 0) + 1
+            row["histogram"].record(elapsed)
+            engine.console.log(
+                f"c={level:<5d} {meta['ip']:15s} | bloqueado na {meta['sequence']}ª requisição | {elapsed * 1000:.1f}ms"
+            )
+
+        print(f"▶️  concorrência {level}: {len(indices)} IPs")
+        stats = engine.run(
+            build_requests(),
+            handle,
+            rate=rate / shard.count if rate else 0,
+            concurrency=concurrency,
+            phase=f"time_to_block_c{level}",
+            resumable=False,
+        )
+        # Um nível medido antes da retomada do checkpoint volta sem envios
+        if stats.sent:
+            merge_results(results, {**counts, "time_to_block": {level: row}})
 
     return results
 
 
-def print_summary(results: dict):
+def merge_results(target: dict, other: dict) -> None:
+    """
+    Combina resultados de workers, somando os histogramas da frota
+    """
+    tables = {key: other.pop(key) for key in ("scaling", "time_to_block") if key in other}
+    merge_counters(target, other)
+    for key, rows in tables.items():
+        for bucket, row in rows.items():
+            current = target.setdefault(key, {}).get(bucket)
+            if current is None:
+                target[key][bucket] = row
+                continue
+            histogram = row.pop("histogram")
+            merge_counters(current, row)
+            current["histogram"].merge(histogram)
+
+
+def run_attack(engine: LoadEngine, args: argparse.Namespace, shard: Shard, results: dict):
+    """
+    Executa o modo escolhido sobre a fatia deste worker
+
+    No modo distributed cada worker fica com um subconjunto fixo de IPs
+    (todo o tráfego de um IP sai do mesmo processo) e uma parte
+    proporcional dos ataques. No modo focused o IP é um só, então os
+    workers dividem apenas o número de ataques.
+    """
+    if args.mode == "distributed":
+        ips = [ip for ip in ATTACKER_IPS if shard.owns(ip)]
+        if not ips:
+            return
+        num_attacks = round(args.count * len(ips) / len(ATTACKER_IPS))
+        results.update(simulate_distributed_attack(engine, num_attacks, ips))
+    elif args.mode == "fleet":
+        results.update(simulate_fleet_attack(engine, fleet_from_args(args), shard))
+    elif args.mode == "time-to-block":
+        levels = parse_levels(args.levels)
+        fleet = IpFleet(
+            FleetConfig(size=args.block_ips * len(levels), cidrs=args.cidr or DEFAULT_CIDRS, seed=args.seed)
+        )
+        results.update(simulate_time_to_block(engine, fleet, levels, args.block_ips, args.max_per_ip, shard, args.rate))
+    else:  # focused
+        results.update(simulate_focused_attack(engine, args.ip, shard.split(args.count)))
+
+
+def fleet_from_args(args: argparse.Namespace) -> IpFleet:
+    """
+    Frota do modo fleet a partir dos argumentos
+
+    Taxas e intervalos que deixariam a agenda vazia ou sem fim encerram
+    o script antes de qualquer envio.
+    """
+    mix = parse_mix(args.profiles)
+    if mix.get("zipf") and args.zipf_rate <= 0:
+        raise SystemExit("--zipf-rate precisa ser maior que 0")
+    if mix.get("burst") and args.burst_gap < 0:
+        raise SystemExit("--burst-gap não pode ser negativo")
+    if mix.get("trickle") and args.trickle_interval <= 0:
+        raise SystemExit("--trickle-interval precisa ser maior que 0")
+
+    return IpFleet(
+        FleetConfig(
+            size=args.fleet_size,
+            cidrs=args.cidr or DEFAULT_CIDRS,
+            mix=mix,
+            duration=args.duration,
+            zipf_rate=args.zipf_rate,
+            zipf_exponent=args.zipf_exponent,
+            burst_size=args.burst_size,
+            burst_gap=args.burst_gap,
+            trickle_interval=args.trickle_interval,
+            seed=args.seed,
+        )
+    )
+
+
+def parse_levels(text: str) -> List[int]:
+    """
+    "1,10,50" -> [1, 10, 50]
+    """
+    try:
+        levels = [int(item) for item in text.split(",") if item.strip()]
+    except ValueError:
+        raise ValueError(f"Níveis de concorrência inválidos: {text!r}")
+    if not levels or min(levels) < 1:
+        raise ValueError("Informe níveis de concorrência positivos (ex.: 1,10,50)")
+    return levels
+
+
+def print_summary(results: dict, run: JobRun = None):
     """
     Exibe resumo dos resultados
     """
@@ -162,7 +517,55 @@ def print_summary(results: dict):
         print("-" * 60)
         for ip, stats in sorted(results['by_ip'].items(), key=lambda x: x[1]['total'], reverse=True):
             print(f"  {ip:15s} | {stats['total']:2d} ataques | {stats['blocked']:2d} bloqueados")
-    
+
+    if 'by_profile' in results:
+        print(f"\nIPs distintos:    {results['ips_seen']} ({results['ips_blocked']} bloqueados)")
+        print(f"Erros:            {results['errors']}")
+
+        print("\n📍 Ataques por perfil:")
+        print("-" * 60)
+        for name, stats in results['by_profile'].items():
+            rate = stats['blocked'] / stats['total'] * 100 if stats['total'] else 0.0
+            print(f"  {name:8s} | {stats['total']:9d} ataques | {stats['blocked']:9d} bloqueados ({rate:5.1f}%)")
+
+        print("\n📈 Latência por IPs distintos já vistos:")
+        print("-" * 60)
+        print(f"  {'até':>10} {'req':>9} {'bloqueio':>9} {'p50':>8} {'p99':>8} {'max':>8}  (ms)")
+        for bucket, row in sorted(results['scaling'].items()):
+            histogram = row['histogram']
+            rate = row['blocked'] / row['total'] * 100 if row['total'] else 0.0
+            print(
+                f"  {bucket:>10d} {row['total']:>9d} {rate:>8.1f}% "
+                f"{histogram.percentile(50) * 1000:>8.1f} {histogram.percentile(99) * 1000:>8.1f} "
+                f"{histogram.max * 1000:>8.1f}"
+            )
+
+    if 'time_to_block' in results:
+        print(f"Erros:            {results['errors']}")
+        print("\n⏱️  Tempo até o bloqueio (1º envio → 1º 403 da blocklist):")
+        print("-" * 60)
+        print(
+            f"  {'conc.':>6} {'IPs':>6} {'bloq.':>6} │ {'req p50':>7} {'p90':>4} {'p99':>4} {'max':>4} │ "
+            f"{'ms p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+        )
+        for level, row in sorted(results['time_to_block'].items()):
+            counts, histogram = row['requests'], row['histogram']
+            print(
+                f"  {level:>6d} {row['ips']:>6d} {row['blocked']:>6d} │ "
+                f"{count_percentile(counts, 50):>7d} {count_percentile(counts, 90):>4d} "
+                f"{count_percentile(counts, 99):>4d} {max(counts, default=0):>4d} │ "
+                f"{histogram.percentile(50) * 1000:>8.1f} {histogram.percentile(90) * 1000:>8.1f} "
+                f"{histogram.percentile(99) * 1000:>8.1f} {histogram.max * 1000:>8.1f}"
+            )
+            if row['blocked'] < row['ips']:
+                print(f"  {'':>6} ⚠️  {row['ips'] - row['blocked']} IPs não foram bloqueados")
+        print(f"  Mínimo teórico: {IDEAL_REQUESTS_TO_BLOCK} requisições por IP")
+
+    if run is not None:
+        print()
+        print_engine_stats(run.totals)
+        run.report.print()
+
     print("=" * 60 + "\n")
 
 
@@ -172,7 +575,7 @@ def main():
     )
     parser.add_argument(
         "--mode",
-        choices=["distributed", "focused"],
+        choices=["distributed", "focused", "fleet", "time-to-block"],
         default="distributed",
         help="Modo de ataque (padrão: distributed)",
     )
@@ -195,18 +598,117 @@ def main():
         help="IP alvo para modo focused (padrão: 203.0.113.10)",
     )
 
+    fleet = parser.add_argument_group("frota virtual (--mode fleet)")
+    fleet.add_argument(
+        "--fleet-size",
+        type=int,
+        default=10_000,
+        help="IPs distintos na frota (padrão: 10000)",
+    )
+    fleet.add_argument(
+        "--cidr",
+        action="append",
+        help=f"Faixa de onde tirar os IPs (pode repetir; padrão: {', '.join(DEFAULT_CIDRS)})",
+    )
+    fleet.add_argument(
+        "--profiles",
+        default="zipf:0.8,burst:0.15,trickle:0.05",
+        help="Fração da frota em cada perfil (padrão: zipf:0.8,burst:0.15,trickle:0.05)",
+    )
+    fleet.add_argument(
+        "--duration",
+        type=float,
+        default=60.0,
+        help="Duração da agenda em segundos (padrão: 60)",
+    )
+    fleet.add_argument(
+        "--zipf-rate",
+        type=float,
+        default=200.0,
+        help="Req/s somadas dos IPs zipf (padrão: 200)",
+    )
+    fleet.add_argument(
+        "--zipf-exponent",
+        type=float,
+        default=1.1,
+        help="Expoente da distribuição de volume por IP (padrão: 1.1)",
+    )
+    fleet.add_argument(
+        "--burst-size",
+        type=int,
+        default=20,
+        help="Requisições por rajada de cada IP burst (padrão: 20)",
+    )
+    fleet.add_argument(
+        "--burst-gap",
+        type=float,
+        default=0.01,
+        help="Segundos entre requisições de uma rajada (padrão: 0.01)",
+    )
+    fleet.add_argument(
+        "--trickle-interval",
+        type=float,
+        default=30.0,
+        help="Segundos entre requisições de cada IP trickle (padrão: 30)",
+    )
+    fleet.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Semente dos IPs e da agenda (padrão: 0)",
+    )
+
+    block = parser.add_argument_group("tempo até o bloqueio (--mode time-to-block)")
+    block.add_argument(
+        "--levels",
+        default="1,10,50,200",
+        help="Níveis de concorrência medidos, um grupo novo de IPs por nível (padrão: 1,10,50,200)",
+    )
+    block.add_argument(
+        "--block-ips",
+        type=int,
+        default=200,
+        help="IPs medidos em cada nível (padrão: 200)",
+    )
+    block.add_argument(
+        "--max-per-ip",
+        type=int,
+        default=50,
+        help="Desiste de um IP após N requisições sem bloqueio (padrão: 50)",
+    )
+
+    add_engine_arguments(parser)
+
     args = parser.parse_args()
 
     try:
-        if args.mode == "distributed":
-            results = simulate_distributed_attack(args.count, args.delay)
-        else:  # focused
-            results = simulate_focused_attack(args.ip, args.count)
+        if args.mode == "fleet":
+            fleet = fleet_from_args(args)
+        elif args.mode == "time-to-block":
+            levels = parse_levels(args.levels)
+            if args.block_ips < 1 or args.max_per_ip < 1:
+                raise ValueError("--block-ips e --max-per-ip precisam ser positivos")
+            IpFleet(FleetConfig(size=args.block_ips * len(levels), cidrs=args.cidr or DEFAULT_CIDRS))
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Cada nível troca a concorrência do motor: o pool acompanha o maior
+    if args.mode == "time-to-block" and not args.pool_size:
+        args.pool_size = max(levels)
+    # A agenda da frota não espera respostas: o pool comporta o pico por um
+    # timeout inteiro, senão a latência medida é a fila do próprio cliente
+    if args.mode == "fleet" and not args.pool_size:
+        args.pool_size = max(args.concurrency, open_loop_pool_size(fleet.peak_rate(), args.timeout))
 
-        print_summary(results)
+    results = {}
+
+    try:
+        run = run_job(args, run_attack, results, merge=merge_results)
+        print_summary(results, run)
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Ataque interrompido pelo usuário\n")
+        print_checkpoint_hint(args)
 
 
 if __name__ == "__main__":
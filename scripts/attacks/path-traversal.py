@@ -3,69 +3,47 @@ Script de Ataque Controlado - Path Traversal & Suspicious Patterns
 Testa a detecção de padrões suspeitos e path traversal
 """
 
-import requests
-import time
 from typing import List
 import argparse
 
-BASE_URL = "http://localhost:3000"
+from harness import AttackRequest, AttackResult, LoadEngine
+from harness import JobRun, Shard, add_engine_arguments, print_engine_stats, run_job
+from harness.checkpoint import print_checkpoint_hint
+from harness.payloads import HONEYPOT_ENDPOINTS, SUSPICIOUS_PAYLOADS
 
-# Payloads de Path Traversal e padrões suspeitos
-SUSPICIOUS_PAYLOADS = [
-    # Path Traversal
-    "../../../etc/passwd",
-    "..\\..\\..\\windows\\system32\\config\\sam",
-    "....//....//....//etc/passwd",
-    "..%2F..%2F..%2Fetc%2Fpasswd",
-    
-    # Command Injection
-    "; ls -la",
-    "| cat /etc/passwd",
-    "& whoami",
-    "`id`",
-    "$(uname -a)",
-    
-    # File Inclusion
-    "php://filter/convert.base64-encode/resource=index.php",
-    "file:///etc/passwd",
-    "expect://id",
-    
-    # SSRF
-    "http://localhost:22",
-    "http://127.0.0.1:3306",
-    "http://169.254.169.254/latest/meta-data/",
-    
-    # Directory Listing
-    "/admin/",
-    "/.git/config",
-    "/.env",
-    "/backup.sql",
-    "/database.sql",
-    
-    # Source Code Disclosure
-    ".php.bak",
-    "index.php~",
-    ".DS_Store",
-    
-    # XXE
-    "<!DOCTYPE foo [<!ENTITY xxe SYSTEM 'file:///etc/passwd'>]>",
-    
-    # LDAP Injection
-    "*)(uid=*))(|(uid=*",
-    "admin*",
-    "*",
-    
-    # NoSQL Injection
-    "{'$gt': ''}",
-    "[$ne]=1",
-]
 
-
-def test_suspicious_patterns_honeypot(payloads: List[str], delay: float = 0):
+def _classify(result: AttackResult, results: dict, label: str, prefix: str, log) -> None:
+    """
+    Contabiliza e registra no log uma resposta no formato comum dos testes
+    """
+    results["total_attempts"] += 1
+
+    if result.timed_out:
+        results["errors"] += 1
+        log(f"   {prefix} ⏱️  TIMEOUT")
+        return
+    if result.error is not None:
+        results["errors"] += 1
+        log(f"   {prefix} ❌ {str(result.error)[:40]}")
+        return
+
+    if result.status == 403:
+        results["blocked"] += 1
+        status = "🛡️  BLOCKED"
+    elif result.status < 500:
+        status = "⚠️  NOT BLOCKED"
+    else:
+        status = "❌ ERROR"
+        results["errors"] += 1
+
+    log(f"   {prefix} {status} | {label}")
+
+
+def test_suspicious_patterns_honeypot(engine: LoadEngine, payloads: List[str]):
     """
     Testa padrões suspeitos nos honeypots
     """
-    honeypots = ["/admin", "/debug", "/.env", "/db"]
+    honeypots = HONEYPOT_ENDPOINTS
     
     print(f"\n🟡 Testando Padrões Suspeitos - Honeypot Endpoints")
     print(f"   Payloads: {len(payloads)} x {len(honeypots)} endpoints\n")
@@ -75,46 +53,33 @@ def test_suspicious_patterns_honeypot(payloads: List[str], delay: float = 0):
         "blocked": 0,
         "errors": 0,
     }
-
-    for endpoint in honeypots:
-        for idx, payload in enumerate(payloads, 1):
-            try:
-                results["total_attempts"] += 1
-
-                # Testa com payload no path
-                response = requests.get(
-                    f"{BASE_URL}{endpoint}/{payload}",
-                    timeout=5,
-                )
-
-                if response.status_code == 403:
-                    results["blocked"] += 1
-                    status = "🛡️  BLOCKED"
-                elif response.status_code < 500:
-                    status = "⚠️  NOT BLOCKED"
-                else:
-                    status = "❌ ERROR"
-                    results["errors"] += 1
-
-                print(f"   [{idx:2d}/{len(payloads)}] {endpoint:10s} | {status} | {payload[:30]}")
-                
-                time.sleep(delay)
-
-            except requests.exceptions.Timeout:
-                results["errors"] += 1
-                print(f"   [{idx:2d}/{len(payloads)}] {endpoint:10s} | ⏱️  TIMEOUT")
-            except Exception as e:
-                results["errors"] += 1
-                print(f"   [{idx:2d}/{len(payloads)}] {endpoint:10s} | ❌ {str(e)[:40]}")
+    results = engine.checkpointed("honeypot-path", results)
+
+    def handle(result: AttackResult) -> None:
+        meta = result.request.meta
+        prefix = f"[{meta['index']:2d}/{len(payloads)}] {meta['endpoint']:10s} |"
+        _classify(result, results, meta["payload"][:30], prefix, engine.console.log)
+
+    # Testa com payload no path
+    requests = (
+        AttackRequest(
+            "GET",
+            f"{endpoint}/{payload}",
+            meta={"index": idx, "endpoint": endpoint, "payload": payload},
+        )
+        for endpoint in honeypots
+        for idx, payload in enumerate(payloads, 1)
+    )
+    engine.run(requests, handle, phase="honeypot-path")
 
     return results
 
 
-def test_suspicious_query_params(payloads: List[str], delay: float = 0):
+def test_suspicious_query_params(engine: LoadEngine, payloads: List[str]):
     """
     Testa padrões suspeitos em query parameters
     """
-    endpoint = f"{BASE_URL}/admin"
+    endpoint = "/admin"
     
     print(f"\n🟡 Testando Padrões Suspeitos - Query Parameters")
     print(f"   Payloads: {len(payloads)}\n")
@@ -124,46 +89,33 @@ def test_suspicious_query_params(payloads: List[str], delay: float = 0):
         "blocked": 0,
         "errors": 0,
     }
-
-    for idx, payload in enumerate(payloads, 1):
-        try:
-            results["total_attempts"] += 1
-
-            # Testa em diferentes parâmetros
-            response = requests.get(
-                endpoint,
-                params={
-                    "file": payload,
-                    "path": payload,
-                    "page": payload,
-                },
-                timeout=5,
-            )
-
-            if response.status_code == 403:
-                results["blocked"] += 1
-                status = "🛡️  BLOCKED"
-            elif response.status_code < 500:
-                status = "⚠️  NOT BLOCKED"
-            else:
-                status = "❌ ERROR"
-                results["errors"] += 1
-
-            print(f"   [{idx:2d}/{len(payloads)}] Query params | {status} | {payload[:30]}")
-            
-            time.sleep(delay)
-
-        except requests.exceptions.Timeout:
-            results["errors"] += 1
-            print(f"   [{idx:2d}/{len(payloads)}] Query params | ⏱️  TIMEOUT")
-        except Exception as e:
-            results["errors"] += 1
-            print(f"   [{idx:2d}/{len(payloads)}] Query params | ❌ {str(e)[:40]}")
+    results = engine.checkpointed("query-params", results)
+
+    def handle(result: AttackResult) -> None:
+        meta = result.request.meta
+        prefix = f"[{meta['index']:2d}/{len(payloads)}] Query params |"
+        _classify(result, results, meta["payload"][:30], prefix, engine.console.log)
+
+    # Testa em diferentes parâmetros
+    requests = (
+        AttackRequest(
+            "GET",
+            endpoint,
+            params={
+                "file": payload,
+                "path": payload,
+                "page": payload,
+            },
+            meta={"index": idx, "payload": payload},
+        )
+        for idx, payload in enumerate(payloads, 1)
+    )
+    engine.run(requests, handle, phase="query-params")
 
     return results
 
 
-def test_user_agent_manipulation(delay: float = 0):
+def test_user_agent_manipulation(engine: LoadEngine):
     """
     Testa manipulação de User-Agent suspeitos
     """
@@ -175,7 +127,7 @@ def test_user_agent_manipulation(delay: float = 0):
         "<script>alert(1)</script>",
     ]
     
-    endpoint = f"{BASE_URL}/admin"
+    endpoint = "/admin"
     
     print(f"\n🟡 Testando User-Agent Suspeitos")
     print(f"   Agents: {len(suspicious_agents)}\n")
@@ -185,38 +137,55 @@ def test_user_agent_manipulation(delay: float = 0):
         "blocked": 0,
         "errors": 0,
     }
-
-    for idx, agent in enumerate(suspicious_agents, 1):
-        try:
-            results["total_attempts"] += 1
-
-            response = requests.get(
-                endpoint,
-                headers={"User-Agent": agent},
-                timeout=5,
-            )
-
-            if response.status_code == 403:
-                results["blocked"] += 1
-                status = "🛡️  BLOCKED"
-            else:
-                status = "⚠️  NOT BLOCKED"
-
-            print(f"   [{idx:2d}/{len(suspicious_agents)}] {status} | {agent[:40]}")
-            
-            time.sleep(delay)
-
-        except requests.exceptions.Timeout:
-            results["errors"] += 1
-            print(f"   [{idx:2d}/{len(suspicious_agents)}] ⏱️  TIMEOUT")
-        except Exception as e:
-            results["errors"] += 1
-            print(f"   [{idx:2d}/{len(suspicious_agents)}] ❌ {str(e)[:40]}")
+    results = engine.checkpointed("user-agent", results)
+
+    def handle(result: AttackResult) -> None:
+        meta = result.request.meta
+        prefix = f"[{meta['index']:2d}/{len(suspicious_agents)}]"
+        _classify(result, results, meta["agent"][:40], prefix, engine.console.log)
+
+    requests = (
+        AttackRequest(
+            "GET",
+            endpoint,
+            headers={"User-Agent": agent},
+            meta={"index": idx, "agent": agent},
+        )
+        for idx, agent in enumerate(suspicious_agents, 1)
+    )
+    engine.run(requests, handle, phase="user-agent")
 
     return results
 
 
-def print_summary(results: dict):
+def run_attack(engine: LoadEngine, args: argparse.Namespace, shard: Shard, all_results: dict):
+    """
+    Executa os modos selecionados sobre a fatia de payloads deste worker
+    """
+    payloads = SUSPICIOUS_PAYLOADS[: args.count] if args.count else SUSPICIOUS_PAYLOADS
+    payloads = list(shard.take(payloads))
+
+    if args.mode in ["all", "honeypot"]:
+        results = test_suspicious_patterns_honeypot(engine, payloads)
+        all_results["total_attempts"] += results["total_attempts"]
+        all_results["blocked"] += results["blocked"]
+        all_results["errors"] += results["errors"]
+
+    if args.mode in ["all", "query"]:
+        results = test_suspicious_query_params(engine, payloads)
+        all_results["total_attempts"] += results["total_attempts"]
+        all_results["blocked"] += results["blocked"]
+        all_results["errors"] += results["errors"]
+
+    # Lista fixa e pequena de agents: roda só no primeiro worker
+    if args.mode in ["all", "useragent"] and shard.index == 0:
+        results = test_user_agent_manipulation(engine)
+        all_results["total_attempts"] += results["total_attempts"]
+        all_results["blocked"] += results["blocked"]
+        all_results["errors"] += results["errors"]
+
+
+def print_summary(results: dict, run: JobRun = None):
     """
     Exibe resumo dos resultados
     """
@@ -231,6 +200,11 @@ def print_summary(results: dict):
         block_rate = (results['blocked'] / results['total_attempts']) * 100
         print(f"\nTaxa de Bloqueio:    {block_rate:.1f}%")
     
+    if run is not None:
+        print()
+        print_engine_stats(run.totals)
+        run.report.print()
+
     print("=" * 50 + "\n")
 
 
@@ -256,16 +230,17 @@ def main():
         help="Número de payloads a usar (padrão: todos)",
     )
 
-    args = parser.parse_args()
+    add_engine_arguments(parser)
 
-    payloads = SUSPICIOUS_PAYLOADS[: args.count] if args.count else SUSPICIOUS_PAYLOADS
+    args = parser.parse_args()
 
     print("\n" + "=" * 50)
     print("🎯 SUSPICIOUS PATTERNS ATTACK SIMULATOR")
     print("=" * 50)
-    print(f"Target: {BASE_URL}")
+    print(f"Target: {args.base_url}")
     print(f"Mode:   {args.mode}")
     print(f"Delay:  {args.delay}s")
+    print(f"Workers: {args.workers}")
     print("=" * 50)
 
     all_results = {
@@ -275,29 +250,13 @@ def main():
     }
 
     try:
-        if args.mode in ["all", "honeypot"]:
-            results = test_suspicious_patterns_honeypot(payloads, args.delay)
-            all_results["total_attempts"] += results["total_attempts"]
-            all_results["blocked"] += results["blocked"]
-            all_results["errors"] += results["errors"]
-
-        if args.mode in ["all", "query"]:
-            results = test_suspicious_query_params(payloads, args.delay)
-            all_results["total_attempts"] += results["total_attempts"]
-            all_results["blocked"] += results["blocked"]
-            all_results["errors"] += results["errors"]
-
-        if args.mode in ["all", "useragent"]:
-            results = test_user_agent_manipulation(args.delay)
-            all_results["total_attempts"] += results["total_attempts"]
-            all_results["blocked"] += results["blocked"]
-            all_results["errors"] += results["errors"]
-
-        print_summary(all_results)
+        run = run_job(args, run_attack, all_results)
+        print_summary(all_results, run)
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Ataque interrompido pelo usuário")
         print_summary(all_results)
+        print_checkpoint_hint(args)
 
 
 if __name__ == "__main__":
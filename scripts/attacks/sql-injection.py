@@ -3,164 +3,175 @@ Script de Ataque Controlado - SQL Injection
 Testa a detecção de tentativas de SQL Injection
 """
 
-import requests
-import time
-from typing import List
+from typing import Iterable, List, Optional
 import argparse
 
-BASE_URL = "http://localhost:3000"
+from harness import AttackRequest, AttackResult, LoadEngine
+from harness import JobRun, Shard, add_engine_arguments, print_engine_stats, run_job
+from harness.checkpoint import print_checkpoint_hint
+from harness.mutations import PayloadMutator
+from harness.payloads import SQL_INJECTION_PAYLOADS
+from harness.prefetch import prefetch
 
-# Payloads comuns de SQL Injection
-SQL_INJECTION_PAYLOADS = [
-    # Union-based
-    "' UNION SELECT NULL--",
-    "' UNION SELECT NULL, NULL--",
-    "' UNION SELECT username, password FROM users--",
-    
-    # Boolean-based
-    "' OR '1'='1",
-    "' OR 1=1--",
-    "admin' --",
-    "admin' #",
-    "' or 1=1 limit 1 --",
-    
-    # Time-based
-    "'; WAITFOR DELAY '00:00:05'--",
-    "'; SELECT SLEEP(5)--",
-    
-    # Stacked queries
-    "'; DROP TABLE users--",
-    "'; DELETE FROM users WHERE '1'='1",
-    
-    # Error-based
-    "' AND 1=CONVERT(int, @@version)--",
-    "' AND 1=CAST((SELECT @@version) AS int)--",
-    
-    # Authentication bypass
-    "admin' OR '1'='1' /*",
-    "' OR ''='",
-    "' OR 1 -- -",
-    "') OR ('1'='1",
-    
-    # Advanced
-    "1' UNION SELECT NULL, NULL, NULL, table_name FROM information_schema.tables--",
-    "1' AND (SELECT COUNT(*) FROM users) > 0--",
-]
 
-
-def test_sql_injection_login(payloads: List[str], delay: float = 0.5):
+def test_sql_injection_login(
+    engine: LoadEngine,
+    payloads: Iterable[str],
+    phase: str = "sqli-login",
+    total: Optional[int] = None,
+):
     """
     Testa SQL injection no endpoint de login
+
+    `payloads` pode ser um gerador (ex.: variantes mutadas); nesse caso
+    informe `total` para a contagem exibida no progresso.
     """
-    endpoint = f"{BASE_URL}/auth/login"
+    endpoint = "/auth/login"
+    if total is None:
+        total = len(payloads)
     
     print(f"\n🔴 Testando SQL Injection - Login Endpoint")
-    print(f"   Payloads: {len(payloads)}\n")
+    print(f"   Payloads: {total}\n")
     
     results = {
         "total_attempts": 0,
         "blocked": 0,
         "success": 0,
         "errors": 0,
-        "details": [],
     }
+    results = engine.checkpointed(phase, results)
+
+    # Cada payload gera duas requisições (campo email e campo password);
+    # o payload só é contabilizado quando as duas respostas chegarem.
+    # Guarda só (status, erro) para caber no checkpoint
+    pending = engine.checkpointed(f"{phase}-pending", {})
+
+    def handle(result: AttackResult) -> None:
+        idx = result.request.meta["index"]
+        payload = result.request.meta["payload"]
+        statuses = pending.setdefault(idx, {})
+        error = None
+        if result.error is not None:
+            error = str(result.error) or type(result.error).__name__
+        statuses[result.request.meta["field"]] = (result.status, error)
+
+        if len(statuses) < 2:
+            return
+        del pending[idx]
+
+        results["total_attempts"] += 1
+        (status1, error1), (status2, error2) = statuses["email"], statuses["password"]
+
+        log = engine.console.log
+        log(f"[{idx}/{total}] Payload: {payload[:40]:<40}")
+
+        error = error1 or error2
+        if error is not None:
+            results["errors"] += 1
+            log(f"              ❌ Erro: {error}")
+            return
+
+        log(f"              Email field:    {status1}")
+        log(f"              Password field: {status2}")
 
-    for idx, payload in enumerate(payloads, 1):
-        try:
-            results["total_attempts"] += 1
+        # Detecta bloqueio
+        if status1 == 403 or status2 == 403:
+            results["blocked"] += 1
+            log(f"              ⚠️  WAF BLOQUEOU!")
+
+        # Detecta sucesso indevido (raro: vai também para o terminal)
+        if status1 == 200 or status2 == 200:
+            results["success"] += 1
+            log(f"              🚨 VULNERÁVEL! Bypass detectado!")
+            print(f"🚨 VULNERÁVEL! Bypass detectado: {payload[:60]}")
+
+    def build_requests():
+        for idx, payload in enumerate(payloads, 1):
+            meta = {"index": idx, "payload": payload}
 
             # Testa no campo email
-            response1 = requests.post(
+            yield AttackRequest(
+                "POST",
                 endpoint,
                 json={"email": payload, "password": "test123"},
-                timeout=5,
+                meta={**meta, "field": "email"},
             )
 
             # Testa no campo password
-            response2 = requests.post(
+            yield AttackRequest(
+                "POST",
                 endpoint,
                 json={"email": "test@test.com", "password": payload},
-                timeout=5,
+                meta={**meta, "field": "password"},
             )
 
-            print(f"[{idx}/{len(payloads)}] Payload: {payload[:40]:<40}")
-            print(f"              Email field:    {response1.status_code}")
-            print(f"              Password field: {response2.status_code}")
-
-            # Detecta bloqueio
-            if response1.status_code == 403 or response2.status_code == 403:
-                results["blocked"] += 1
-                print(f"              ⚠️  WAF BLOQUEOU!")
-
-            # Detecta sucesso indevido
-            if response1.status_code == 200 or response2.status_code == 200:
-                results["success"] += 1
-                print(f"              🚨 VULNERÁVEL! Bypass detectado!")
-
-            results["details"].append({
-                "payload": payload,
-                "email_status": response1.status_code,
-                "password_status": response2.status_code,
-            })
-
-            time.sleep(delay)
-
-        except Exception as e:
-            results["errors"] += 1
-            print(f"              ❌ Erro: {e}")
+    engine.run(build_requests(), handle, phase=phase)
 
     return results
 
 
-def test_sql_injection_params(endpoint: str = "/users", payloads: List[str] = None, delay: float = 0.5):
+def test_sql_injection_params(engine: LoadEngine, endpoint: str = "/users", payloads: List[str] = None):
     """
     Testa SQL injection em query parameters
     """
     if payloads is None:
         payloads = SQL_INJECTION_PAYLOADS[:10]
     
-    full_url = f"{BASE_URL}{endpoint}"
-    
     print(f"\n🔴 Testando SQL Injection - Query Parameters")
     print(f"   Endpoint: {endpoint}")
     print(f"   Payloads: {len(payloads)}\n")
     
-    results = {"total": 0, "blocked": 0, "details": []}
-
-    for idx, payload in enumerate(payloads, 1):
-        try:
-            results["total"] += 1
-
-            response = requests.get(
-                full_url,
-                params={"id": payload, "search": payload},
-                timeout=5,
-            )
-
-            print(f"[{idx}/{len(payloads)}] {payload[:50]:<50} | Status: {response.status_code}")
-
-            if response.status_code == 403:
-                results["blocked"] += 1
-                print(f"              🛡️  BLOQUEADO pelo WAF")
-
-            results["details"].append({
-                "payload": payload,
-                "status": response.status_code,
-            })
-
-            time.sleep(delay)
-
-        except Exception as e:
-            print(f"              ❌ Erro: {e}")
+    results = engine.checkpointed("sqli-params", {"total": 0, "blocked": 0})
+
+    def handle(result: AttackResult) -> None:
+        idx = result.request.meta["index"]
+        payload = result.request.meta["payload"]
+        results["total"] += 1
+
+        if result.error is not None:
+            engine.console.log(f"              ❌ Erro: {result.error}")
+            return
+
+        engine.console.log(f"[{idx}/{len(payloads)}] {payload[:50]:<50} | Status: {result.status}")
+
+        if result.status == 403:
+            results["blocked"] += 1
+            engine.console.log(f"              🛡️  BLOQUEADO pelo WAF")
+
+    requests = (
+        AttackRequest(
+            "GET",
+            endpoint,
+            params={"id": payload, "search": payload},
+            meta={"index": idx, "payload": payload},
+        )
+        for idx, payload in enumerate(payloads, 1)
+    )
+    engine.run(requests, handle, phase="sqli-params")
 
     return results
 
 
-def advanced_sql_injection_test():
+def advanced_sql_injection_test(engine: LoadEngine, shard: Shard = None, mutations: int = 0, seed: int = 0):
     """
     Testes avançados de SQL injection com técnicas de evasão
+
+    Com `mutations` > 0 as variantes de evasão são geradas (caixa,
+    comentários, espaços, URL/double/HTML encoding) a partir do corpus
+    completo, de forma reprodutível pela `seed`, em vez da lista fixa.
     """
     print(f"\n🔴 Testes Avançados de SQL Injection (Evasão)")
+
+    if mutations:
+        shard = shard or Shard()
+        mutator = PayloadMutator(SQL_INJECTION_PAYLOADS, seed=seed, include_original=False)
+        variants = mutator.stream(mutations, start=shard.index, step=shard.count)
+        return test_sql_injection_login(
+            engine,
+            prefetch(v.payload for v in variants),
+            phase="sqli-advanced",
+            total=shard.split(mutations),
+        )
     
     evasion_payloads = [
         # Case manipulation
@@ -182,28 +193,34 @@ def advanced_sql_injection_test():
         "'OR\n1=1--",
     ]
 
-    return test_sql_injection_login(evasion_payloads, delay=0.3)
-
+    if shard is not None:
+        evasion_payloads = list(shard.take(evasion_payloads))
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="SQL Injection Attack Simulator")
-    parser.add_argument(
-        "--target",
-        choices=["login", "params", "advanced", "all"],
-        default="all",
-        help="Target to test",
-    )
-    parser.add_argument(
-        "--delay",
-        type=float,
-        default=0.5,
-        help="Delay between requests",
-    )
+    return test_sql_injection_login(engine, evasion_payloads, phase="sqli-advanced")
 
-    args = parser.parse_args()
 
+def run_attack(engine: LoadEngine, args: argparse.Namespace, shard: Shard, results: dict):
+    """
+    Executa os alvos selecionados sobre a fatia de payloads deste worker
+    """
     if args.target == "login" or args.target == "all":
-        results = test_sql_injection_login(SQL_INJECTION_PAYLOADS, args.delay)
+        payloads = list(shard.take(SQL_INJECTION_PAYLOADS))
+        results["login"] = test_sql_injection_login(engine, payloads)
+
+    if args.target == "params" or args.target == "all":
+        payloads = list(shard.take(SQL_INJECTION_PAYLOADS[:10]))
+        results["params"] = test_sql_injection_params(engine, payloads=payloads)
+
+    if args.target == "advanced" or args.target == "all":
+        results["advanced"] = advanced_sql_injection_test(engine, shard, args.mutations, args.seed)
+
+
+def print_report(results_by_target: dict, run: JobRun = None):
+    """
+    Exibe o relatório dos alvos concluídos (sem latência se interrompido)
+    """
+    if "login" in results_by_target:
+        results = results_by_target["login"]
         
         print(f"\n{'='*60}")
         print("RELATÓRIO - SQL Injection (Login)")
@@ -212,10 +229,12 @@ if __name__ == "__main__":
         print(f"Bloqueados pelo WAF: {results['blocked']}")
         print(f"Bypasses (VULNERÁVEL): {results['success']}")
         print(f"Taxa de bloqueio: {(results['blocked']/results['total_attempts']*100):.1f}%")
+        if run is not None:
+            run.report.print("sqli-login")
         print(f"{'='*60}\n")
 
-    if args.target == "params" or args.target == "all":
-        results = test_sql_injection_params(delay=args.delay)
+    if "params" in results_by_target:
+        results = results_by_target["params"]
         
         print(f"\n{'='*60}")
         print("RELATÓRIO - SQL Injection (Params)")
@@ -223,10 +242,12 @@ if __name__ == "__main__":
         print(f"Total: {results['total']}")
         print(f"Bloqueados: {results['blocked']}")
         print(f"Taxa de bloqueio: {(results['blocked']/results['total']*100):.1f}%")
+        if run is not None:
+            run.report.print("sqli-params")
         print(f"{'='*60}\n")
 
-    if args.target == "advanced" or args.target == "all":
-        results = advanced_sql_injection_test()
+    if "advanced" in results_by_target:
+        results = results_by_target["advanced"]
         
         print(f"\n{'='*60}")
         print("RELATÓRIO - SQL Injection Avançado (Evasão)")
@@ -234,4 +255,50 @@ if __name__ == "__main__":
         print(f"Total: {results['total_attempts']}")
         print(f"Bloqueados: {results['blocked']}")
         print(f"Bypasses: {results['success']}")
+        if run is not None:
+            run.report.print("sqli-advanced")
         print(f"{'='*60}\n")
+
+    if run is not None:
+        print_engine_stats(run.totals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQL Injection Attack Simulator")
+    parser.add_argument(
+        "--target",
+        choices=["login", "params", "advanced", "all"],
+        default="all",
+        help="Target to test",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.5,
+        help="Delay between requests",
+    )
+    parser.add_argument(
+        "--mutations",
+        type=int,
+        default=0,
+        help="Generated evasion variants for the advanced target (default: fixed list)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for --mutations (same seed = same variants)",
+    )
+    add_engine_arguments(parser)
+
+    args = parser.parse_args()
+
+    results_by_target = {}
+    try:
+        run = run_job(args, run_attack, results_by_target)
+        print_report(results_by_target, run)
+
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Ataque interrompido pelo usuário")
+        print_report(results_by_target)
+        print_checkpoint_hint(args)
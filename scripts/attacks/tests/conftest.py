@@ -0,0 +1,17 @@
+import importlib.util
+import os
+import sys
+
+ATTACKS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ATTACKS)
+
+
+def load_script(filename: str):
+    """
+    Importa um script de ataque pelo nome do arquivo (ex.: brute-force.py)
+    """
+    name = filename.replace("-", "_").removesuffix(".py")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ATTACKS, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
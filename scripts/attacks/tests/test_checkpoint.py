@@ -0,0 +1,33 @@
+import asyncio
+
+from harness.checkpoint import Checkpoint
+from harness.engine import AttackRequest, AttackResult, EngineStats, LoadEngine
+
+
+def test_discarded_phase_drops_timeout_errors(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+
+    with LoadEngine() as engine:
+        checkpoint = Checkpoint(path)
+        checkpoint.attach(engine)
+        stats = EngineStats()
+        checkpoint.begin("time_to_block_c1", stats, resumable=False)
+        request = AttackRequest("GET", "http://target/login")
+        engine.report.record(
+            "time_to_block_c1",
+            AttackResult(request, latency=5.0, error=asyncio.TimeoutError()),
+        )
+        stats.sent = stats.completed = stats.errors = 1
+        checkpoint.save()
+
+    with LoadEngine() as engine:
+        checkpoint = Checkpoint(path)
+        checkpoint.load()
+        checkpoint.attach(engine)
+        assert engine.report.phase_errors("time_to_block_c1") == 1
+
+        checkpoint.begin("time_to_block_c1", EngineStats(), resumable=False)
+
+        assert engine.report.phase_errors("time_to_block_c1") == 0
+        assert engine.report.phase_histogram("time_to_block_c1").count == 0
+        assert (engine.totals.completed, engine.totals.errors) == (0, 0)
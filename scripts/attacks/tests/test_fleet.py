@@ -0,0 +1,49 @@
+import argparse
+
+import pytest
+
+from conftest import load_script
+
+multi_ip = load_script("multi-ip-attack.py")
+
+
+def fleet_args(**overrides) -> argparse.Namespace:
+    args = dict(
+        fleet_size=100,
+        cidr=None,
+        profiles="zipf:0.8,burst:0.15,trickle:0.05",
+        duration=5.0,
+        zipf_rate=200.0,
+        zipf_exponent=1.1,
+        burst_size=5,
+        burst_gap=0.01,
+        trickle_interval=1.0,
+        seed=0,
+    )
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"trickle_interval": 0.0},
+        {"trickle_interval": -1.0},
+        {"burst_gap": -0.01},
+        {"zipf_rate": 0.0},
+    ],
+)
+def test_rejects_schedules_that_never_end_or_stay_empty(overrides):
+    with pytest.raises(SystemExit):
+        multi_ip.fleet_from_args(fleet_args(**overrides))
+
+
+def test_checks_only_profiles_in_the_mix():
+    fleet = multi_ip.fleet_from_args(fleet_args(profiles="zipf", trickle_interval=0.0))
+    assert list(fleet.ranges) == ["zipf"]
+
+
+def test_valid_fleet_schedule_ends():
+    fleet = multi_ip.fleet_from_args(fleet_args(burst_gap=0.0))
+    events = list(fleet.schedule())
+    assert events and all(event.at < 5.0 for event in events)
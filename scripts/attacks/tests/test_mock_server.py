@@ -0,0 +1,34 @@
+from mock_server import PRUNE_SCAN, SlidingWindow
+
+# Janela de 10s em 10 fatias de 1s, longe do zero como time.monotonic()
+T = 1000.0
+
+
+def test_counts_hits_inside_the_window():
+    window = SlidingWindow(10.0)
+    assert [window.hit("a", T + at) for at in (0, 0.5, 2)] == [1, 2, 3]
+    assert window.hit("a", T + 10.5) == 2
+
+
+def test_examines_a_bounded_number_of_idle_keys_per_hit():
+    window = SlidingWindow(10.0)
+    for i in range(1000):
+        window.hit(f"idle-{i}", T)
+
+    window.hit("a", T + 20)
+    assert len(window.entries) == 1000 - PRUNE_SCAN + 1
+
+    for _ in range(20):
+        window.hit("a", T + 20)
+    assert list(window.entries) == ["a"]
+
+
+def test_keeps_keys_hit_inside_the_window():
+    window = SlidingWindow(10.0)
+    window.hit("old", T)
+    window.hit("a", T + 5)
+    window.hit("old", T + 9.5)
+
+    window.hit("b", T + 16)
+    assert list(window.entries) == ["old", "b"]
+    assert window.hit("old", T + 16) == 2
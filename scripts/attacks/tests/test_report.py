@@ -0,0 +1,29 @@
+import asyncio
+
+from harness.engine import AttackRequest, AttackResult
+from harness.report import LatencyReport
+
+
+def test_print_does_not_add_histograms_for_error_only_endpoints(capsys):
+    report = LatencyReport()
+    report.record("sqli", AttackResult(AttackRequest("GET", "http://target/a"), status=403, latency=0.01))
+    report.record("sqli", AttackResult(AttackRequest("GET", "http://target/b"), error=ConnectionResetError()))
+    report.add_elapsed("sqli", 1.0)
+
+    report.print()
+
+    assert list(report.histograms) == [("sqli", "/a")]
+    assert [entry["endpoint"] for entry in report.to_dict()["histograms"]] == ["/a"]
+    row = next(line for line in capsys.readouterr().out.splitlines() if line.strip().startswith("/b"))
+    assert row.split()[1:] == ["0", "0.0", "-", "-", "-", "-", "-", "1"]
+
+
+def test_timeouts_still_show_latency(capsys):
+    report = LatencyReport()
+    report.record("sqli", AttackResult(AttackRequest("GET", "http://target/a"), latency=5.0, error=asyncio.TimeoutError()))
+    report.add_elapsed("sqli", 1.0)
+
+    report.print()
+
+    row = next(line for line in capsys.readouterr().out.splitlines() if line.startswith("sqli"))
+    assert "-" not in row.split()[2:]
@@ -0,0 +1,45 @@
+import argparse
+
+import pytest
+
+from conftest import load_script
+from harness import Shard, add_engine_arguments, engine_from_args
+from harness.workers import _worker_args
+
+brute_force = load_script("brute-force.py")
+
+
+def spray_args(*argv: str) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.1)
+    add_engine_arguments(parser)
+    args = parser.parse_args(argv)
+    args.emails = None
+    args.dedup = False
+    args.source_ips = 8
+    args.seed = 0
+    args.account_interval = 0.001
+    args.ip_interval = 0.0
+    return args
+
+
+def spray_rate(args: argparse.Namespace, workers: int) -> float:
+    """
+    Tentativas/s da agenda somadas entre os workers
+    """
+    args.workers = workers
+    total = 0.0
+    for index in range(workers):
+        shard = Shard(index, workers)
+        with engine_from_args(_worker_args(args, shard)) as engine:
+            schedule = []
+            engine.run = lambda requests, handler, **kwargs: schedule.extend(r.at for r in requests)
+            brute_force.spray_attack(engine, args, shard, brute_force.COMMON_PASSWORDS)
+        total += (len(schedule) - 1) / schedule[-1]
+    return total
+
+
+@pytest.mark.parametrize("argv, expected", [(["--rate", "40"], 40.0), (["--delay", "0.05"], 20.0)])
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_total_spray_rate_does_not_depend_on_workers(argv, expected, workers):
+    assert spray_rate(spray_args(*argv), workers) == pytest.approx(expected)
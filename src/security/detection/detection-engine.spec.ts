@@ -0,0 +1,178 @@
+import { DetectionEngine } from './detection-engine';
+import { AttackType, ThreatLevel } from './entities/security-event.entity';
+import type { DetectionResult } from './detection.service';
+
+/**
+ * Caminho antigo do DetectionService: um método por detector, cada um
+ * serializando o conteúdo e testando todos os seus padrões
+ */
+function legacyAnalyze(data: any): DetectionResult {
+  const detectors: Array<{
+    attackType: AttackType;
+    patterns: RegExp[];
+    content: string;
+    weight?: number;
+  }> = [
+    {
+      attackType: AttackType.SQL_INJECTION,
+      patterns: [
+        /(\bunion\b.*\bselect\b)/i,
+        /(\bor\b.*=.*)/i,
+        /(\'.*\bor\b.*\'.*=.*\')/i,
+        /(\bdrop\b.*\btable\b)/i,
+        /(;.*\b(drop|delete|insert|update)\b)/i,
+        /(\bexec\b.*\()/i,
+        /(\/\*.*\*\/)/,
+        /(--[^\r\n]*)/,
+        /(\bxp_cmdshell\b)/i,
+      ],
+      content: JSON.stringify([data.body, data.query]).toLowerCase(),
+      weight: 0.3,
+    },
+    {
+      attackType: AttackType.XSS,
+      patterns: [
+        /<script[^>]*>.*?<\/script>/gi,
+        /javascript:/gi,
+        /on\w+\s*=/gi,
+        /<iframe[^>]*>/gi,
+        /<object[^>]*>/gi,
+        /<embed[^>]*>/gi,
+      ],
+      content: JSON.stringify([data.body, data.query]),
+      weight: 0.35,
+    },
+    {
+      attackType: AttackType.SUSPICIOUS_PATTERN,
+      patterns: [/\.\.[\/\\]/, /%2e%2e[\/\\]/i, /\.\.[%2f%5c]/i],
+      content: JSON.stringify([data.endpoint, data.query, data.body]),
+    },
+  ];
+
+  const detections: DetectionResult[] = [];
+  for (const { attackType, patterns, content, weight } of detectors) {
+    const matchedPatterns: string[] = [];
+    let confidence = 0;
+    patterns.forEach((pattern) => {
+      if (pattern.test(content)) {
+        matchedPatterns.push(pattern.toString());
+        confidence += weight ?? 0;
+      }
+    });
+    if (matchedPatterns.length === 0) continue;
+
+    detections.push(
+      weight === undefined
+        ? {
+            isAttack: true,
+            attackType,
+            threatLevel: ThreatLevel.HIGH,
+            shouldBlock: true,
+            confidence: 0.9,
+            matchedPatterns,
+          }
+        : {
+            isAttack: true,
+            attackType,
+            threatLevel:
+              confidence > 0.6 ? ThreatLevel.HIGH : ThreatLevel.MEDIUM,
+            shouldBlock: true,
+            confidence: Math.min(confidence, 1),
+            matchedPatterns,
+          },
+    );
+  }
+
+  if (detections.length === 0) {
+    return { isAttack: false, shouldBlock: false, confidence: 0 };
+  }
+  return detections.reduce((prev, current) =>
+    current.confidence > prev.confidence ? current : prev,
+  );
+}
+
+const CORPUS: Array<{ endpoint?: string; query?: any; body?: any }> = [
+  { endpoint: '/api/users', query: { page: '1' }, body: { name: 'alice' } },
+  { endpoint: '/health' },
+  {},
+  { body: { username: "admin' OR '1'='1", password: 'x' } },
+  { query: { id: '1 UNION SELECT password FROM users' } },
+  { body: { q: '1; DROP TABLE users; --' } },
+  { body: { cmd: "EXEC xp_cmdshell('dir')" } },
+  { body: { note: '/* comentário */ select 1' } },
+  { body: { note: 'Oregon = estado' } },
+  { body: { note: 'ordem: coração' } },
+  { body: { comment: '<script>alert(1)</script>' } },
+  { body: { comment: '<SCRIPT src=x></SCRIPT><iframe src=y>' } },
+  { query: { next: 'javascript:alert(1)' } },
+  { body: { html: '<img src=x onerror=alert(1)>' } },
+  { body: { html: '<object data=x><embed src=y>' } },
+  { body: { text: 'once upon a time = ok' } },
+  { endpoint: '/files/../../etc/passwd' },
+  { endpoint: '/files/..\\windows\\win.ini' },
+  { query: { path: '%2e%2e/%2e%2e/etc/passwd' } },
+  { query: { path: '..%2fetc%2fpasswd' } },
+  { endpoint: '/a/b', body: { file: '...txt' } },
+  {
+    endpoint: '/../admin',
+    query: { id: "1' or 1=1 --" },
+    body: { bio: '<script>x</script> javascript: onload=1' },
+  },
+  {
+    body: {
+      a: 'union select',
+      b: 'drop table t',
+      c: '; delete from t',
+      d: "' or 'a'='a'",
+    },
+  },
+  { body: ['nested', { deep: { value: '<iframe>' } }], query: 'raw string' },
+  { body: 42, query: null },
+];
+
+describe('DetectionEngine', () => {
+  let engine: DetectionEngine;
+
+  beforeEach(() => {
+    engine = new DetectionEngine();
+  });
+
+  it('matches the old per-detector path on every request', () => {
+    CORPUS.forEach((data) => {
+      expect(engine.analyze(data)).toEqual(legacyAnalyze(data));
+    });
+  });
+
+  it('gives the same answer when a request is repeated', () => {
+    // Os padrões de XSS têm a flag g: o lastIndex não pode vazar entre
+    // requisições
+    for (let round = 0; round < 3; round++) {
+      CORPUS.forEach((data) => {
+        expect(engine.analyze(data)).toEqual(legacyAnalyze(data));
+      });
+    }
+  });
+
+  it('keeps the earlier detector on a confidence tie', () => {
+    // Quatro padrões de SQLi e três de XSS: ambos chegam ao teto de 1
+    const data = {
+      body: {
+        q: "' or 'a'='a' union select drop table",
+        html: '<script>x</script> javascript: onload=1',
+      },
+    };
+
+    const result = engine.analyze(data);
+    expect(result).toEqual(legacyAnalyze(data));
+    expect(result.attackType).toBe(AttackType.SQL_INJECTION);
+    expect(result.confidence).toBe(1);
+  });
+
+  it('reports no attack for benign traffic', () => {
+    expect(engine.analyze({ endpoint: '/api/products', query: {} })).toEqual({
+      isAttack: false,
+      shouldBlock: false,
+      confidence: 0,
+    });
+  });
+});
@@ -0,0 +1,228 @@
+import { AttackType, ThreatLevel } from './entities/security-event.entity';
+import type { DetectionResult } from './detection.service';
+
+/**
+ * Família de regras detectada sobre um mesmo conteúdo
+ *
+ * `needles` traz, para cada padrão, um trecho que toda ocorrência do
+ * padrão contém: o pré-filtro procura todos os trechos de todas as
+ * famílias em uma única varredura e só os padrões com trecho encontrado
+ * são testados de verdade.
+ */
+interface RuleFamily {
+  attackType: AttackType;
+  // payload: [body, query] | request: [endpoint, query, body]
+  target: 'payload' | 'request';
+  lowercase: boolean;
+  patterns: RegExp[];
+  needles: string[];
+  // Confiança somada a cada padrão casado (limitada a 1)
+  weight?: number;
+  // Confiança fixa, sempre com ThreatLevel.HIGH
+  confidence?: number;
+}
+
+const RULE_FAMILIES: RuleFamily[] = [
+  {
+    attackType: AttackType.SQL_INJECTION,
+    target: 'payload',
+    lowercase: true,
+    patterns: [
+      /(\bunion\b.*\bselect\b)/i,
+      /(\bor\b.*=.*)/i,
+      /(\'.*\bor\b.*\'.*=.*\')/i,
+      /(\bdrop\b.*\btable\b)/i,
+      /(;.*\b(drop|delete|insert|update)\b)/i,
+      /(\bexec\b.*\()/i,
+      /(\/\*.*\*\/)/,
+      /(--[^\r\n]*)/,
+      /(\bxp_cmdshell\b)/i,
+    ],
+    needles: [
+      '\\bunion\\b',
+      '\\bor\\b',
+      '\\bor\\b',
+      '\\bdrop\\b',
+      ';',
+      '\\bexec\\b',
+      '\\/\\*',
+      '--',
+      '\\bxp_cmdshell\\b',
+    ],
+    weight: 0.3,
+  },
+  {
+    attackType: AttackType.XSS,
+    target: 'payload',
+    lowercase: false,
+    patterns: [
+      /<script[^>]*>.*?<\/script>/gi,
+      /javascript:/gi,
+      /on\w+\s*=/gi,
+      /<iframe[^>]*>/gi,
+      /<object[^>]*>/gi,
+      /<embed[^>]*>/gi,
+    ],
+    needles: [
+      '<script',
+      'javascript:',
+      'on\\w+\\s*=',
+      '<iframe',
+      '<object',
+      '<embed',
+    ],
+    weight: 0.35,
+  },
+  {
+    attackType: AttackType.SUSPICIOUS_PATTERN,
+    target: 'request',
+    lowercase: false,
+    patterns: [/\.\.[\/\\]/, /%2e%2e[\/\\]/i, /\.\.[%2f%5c]/i],
+    needles: ['\\.\\.', '%2e%2e', '\\.\\.'],
+    confidence: 0.9,
+  },
+];
+
+interface CompiledRule {
+  // Padrão original: a string vai para matchedPatterns
+  pattern: RegExp;
+  // Cópia sem a flag g (test() não guarda lastIndex entre requisições)
+  test: RegExp;
+}
+
+const NO_ATTACK: DetectionResult = {
+  isAttack: false,
+  shouldBlock: false,
+  confidence: 0,
+};
+
+function serialize(value: unknown): string {
+  // Dentro de um array, undefined e funções viram null
+  return JSON.stringify(value) ?? 'null';
+}
+
+/**
+ * Motor de detecção em passada única
+ *
+ * Serializa cada parte da requisição uma vez, varre o conteúdo com um
+ * único regex que reúne os trechos obrigatórios de todas as regras
+ * (pré-filtro) e testa só os padrões cujo trecho apareceu. O resultado
+ * (confiança, threatLevel e matchedPatterns, na ordem dos padrões) é o
+ * mesmo de testar cada padrão sobre o conteúdo de sua família.
+ */
+export class DetectionEngine {
+  // Regras de cada família, na ordem dos padrões
+  private readonly rules: CompiledRule[][];
+  // Regras de cada trecho distinto, na ordem dos grupos do pré-filtro
+  private readonly needleRules: CompiledRule[][];
+  private readonly prefilter: RegExp;
+
+  constructor(private readonly families: RuleFamily[] = RULE_FAMILIES) {
+    const needles = new Map<string, CompiledRule[]>();
+
+    this.rules = families.map((family) =>
+      family.patterns.map((pattern, position) => {
+        const rule: CompiledRule = {
+          pattern,
+          test: new RegExp(pattern.source, pattern.flags.replace('g', '')),
+        };
+        const needle = family.needles[position];
+        needles.set(needle, [...(needles.get(needle) ?? []), rule]);
+        return rule;
+      }),
+    );
+
+    // Lookahead: cada posição é examinada sem consumir caracteres, então um
+    // trecho nunca esconde outro que comece dentro dele. Dois trechos
+    // diferentes nunca casam na mesma posição e nenhum tem grupos
+    // próprios: o grupo N do pré-filtro é o trecho N
+    const groups = [...needles.keys()].map((needle) => `(${needle})`);
+    this.prefilter = new RegExp(`(?=${groups.join('|')})`, 'gi');
+    this.needleRules = [...needles.values()];
+  }
+
+  analyze(data: {
+    endpoint?: string;
+    query?: any;
+    body?: any;
+  }): DetectionResult {
+    const endpoint = serialize(data.endpoint);
+    const query = serialize(data.query);
+    const body = serialize(data.body);
+    const request = `[${endpoint},${query},${body}]`;
+
+    const candidates = this.scan(request);
+    if (candidates.size === 0) return { ...NO_ATTACK };
+
+    const payload = `[${body},${query}]`;
+    let lowered: string;
+    let best: DetectionResult = { ...NO_ATTACK };
+
+    this.families.forEach((family, index) => {
+      let content = family.target === 'request' ? request : payload;
+      if (family.lowercase) {
+        lowered ??= payload.toLowerCase();
+        content = lowered;
+      }
+
+      const matchedPatterns: string[] = [];
+      let confidence = 0;
+      for (const rule of this.rules[index]) {
+        if (candidates.has(rule) && rule.test.test(content)) {
+          matchedPatterns.push(rule.pattern.toString());
+          confidence += family.weight ?? 0;
+        }
+      }
+      if (matchedPatterns.length === 0) return;
+
+      const detection: DetectionResult =
+        family.confidence !== undefined
+          ? {
+              isAttack: true,
+              attackType: family.attackType,
+              threatLevel: ThreatLevel.HIGH,
+              shouldBlock: true,
+              confidence: family.confidence,
+              matchedPatterns,
+            }
+          : {
+              isAttack: true,
+              attackType: family.attackType,
+              threatLevel:
+                confidence > 0.6 ? ThreatLevel.HIGH : ThreatLevel.MEDIUM,
+              shouldBlock: true,
+              confidence: Math.min(confidence, 1),
+              matchedPatterns,
+            };
+
+      // Empate fica com a família anterior (SQLi, depois XSS, depois path)
+      if (detection.confidence > best.confidence) best = detection;
+    });
+
+    return best;
+  }
+
+  /**
+   * Regras cujo trecho obrigatório aparece no conteúdo
+   */
+  private scan(content: string): Set<CompiledRule> {
+    const candidates = new Set<CompiledRule>();
+    const found = new Set<number>();
+    const prefilter = this.prefilter;
+    prefilter.lastIndex = 0;
+
+    let match: RegExpExecArray | null;
+    while ((match = prefilter.exec(content)) !== null) {
+      for (let group = 1; group < match.length; group++) {
+        if (match[group] === undefined || found.has(group)) continue;
+        found.add(group);
+        this.needleRules[group - 1].forEach((rule) => candidates.add(rule));
+      }
+      if (found.size === this.needleRules.length) break;
+      // Casamento vazio: avança uma posição
+      prefilter.lastIndex = match.index + 1;
+    }
+
+    return candidates;
+  }
+}
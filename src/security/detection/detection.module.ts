@@ -1,12 +1,13 @@
 import { Module } from '@nestjs/common';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { DetectionService } from './detection.service';
+import { SecurityEventWriter } from './security-event-writer';
 import { SecurityEvent } from './entities/security-event.entity';
 import { AttackPattern } from './entities/attack-pattern.entity';
 
 @Module({
   imports: [TypeOrmModule.forFeature([SecurityEvent, AttackPattern])],
-  providers: [DetectionService],
+  providers: [DetectionService, SecurityEventWriter],
   exports: [DetectionService],
 })
 export class DetectionModule {}
@@ -1,4 +1,5 @@
 import { Injectable, Logger } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
 import { InjectRepository } from '@nestjs/typeorm';
 import { Repository } from 'typeorm';
 import {
@@ -7,6 +8,12 @@ import {
   ThreatLevel,
 } from './entities/security-event.entity';
 import { AttackPattern } from './entities/attack-pattern.entity';
+import { DetectionEngine } from './detection-engine';
+import {
+  SecurityEventWriter,
+  SecurityEventWriterStats,
+} from './security-event-writer';
+import { SlidingWindowCounter } from './sliding-window-counter';
 
 export interface DetectionResult {
   isAttack: boolean;
@@ -17,19 +24,53 @@ export interface DetectionResult {
   matchedPatterns?: string[];
 }
 
+export interface RateLimitResult {
+  limited: boolean;
+  // Requisições do IP no endpoint dentro da janela (incluindo esta)
+  count: number;
+  limit: number;
+  // Tempo até o IP voltar a ser atendido (0 quando não limitado)
+  retryAfterMs: number;
+}
+
+// Janela das tentativas de login falhas (brute force)
+const FAILED_LOGIN_WINDOW_MS = 5 * 60 * 1000;
+
 @Injectable()
 export class DetectionService {
   private readonly logger = new Logger(DetectionService.name);
 
+  // Regras compiladas uma vez e reaproveitadas em todas as requisições
+  private readonly detectionEngine = new DetectionEngine();
+
+  // Contadores em memória: custo constante por requisição, sem ir ao banco
+  private readonly requestCounter: SlidingWindowCounter;
+  private readonly maxRequests: number;
+  private readonly failedLogins = new SlidingWindowCounter(
+    FAILED_LOGIN_WINDOW_MS,
+  );
+
   constructor(
     @InjectRepository(SecurityEvent)
     private securityEventRepo: Repository<SecurityEvent>,
     @InjectRepository(AttackPattern)
     private attackPatternRepo: Repository<AttackPattern>,
-  ) {}
+    private readonly eventWriter: SecurityEventWriter,
+    configService: ConfigService,
+  ) {
+    this.requestCounter = new SlidingWindowCounter(
+      Number(configService.get('RATE_LIMIT_WINDOW_MS', 60000)),
+    );
+    this.maxRequests = Number(
+      configService.get('RATE_LIMIT_MAX_REQUESTS', 100),
+    );
+  }
 
   /**
    * Analisa uma requisição em busca de padrões de ataque
+   *
+   * SQL Injection, XSS e Path Traversal são verificados juntos pelo
+   * DetectionEngine, em uma passada; vale a detecção de maior confiança.
    */
   async analyzeRequest(data: {
     ip: string;
@@ -40,149 +81,16 @@ export class DetectionService {
     query?: any;
     headers?: any;
   }): Promise<DetectionResult> {
-    const detections: DetectionResult[] = [];
-
-    // Detecção de SQL Injection
-    const sqlInjection = this.detectSQLInjection(data);
-    if (sqlInjection.isAttack) detections.push(sqlInjection);
-
-    // Detecção de XSS
-    const xss = this.detectXSS(data);
-    if (xss.isAttack) detections.push(xss);
-
-    // Detecção de Path Traversal
-    const pathTraversal = this.detectPathTraversal(data);
-    if (pathTraversal.isAttack) detections.push(pathTraversal);
-
-    // Se nenhum ataque detectado
-    if (detections.length === 0) {
-      return {
-        isAttack: false,
-        shouldBlock: false,
-        confidence: 0,
-      };
-    }
-
-    // Retorna a detecção com maior confiança
-    const highestConfidence = detections.reduce((prev, current) =>
-      current.confidence > prev.confidence ? current : prev,
-    );
-
-    return highestConfidence;
-  }
-
-  /**
-   * Detecta tentativas de SQL Injection
-   */
-  private detectSQLInjection(data: any): DetectionResult {
-    const sqlPatterns = [
-      /(\bunion\b.*\bselect\b)/i,
-      /(\bor\b.*=.*)/i,
-      /(\'.*\bor\b.*\'.*=.*\')/i,
-      /(\bdrop\b.*\btable\b)/i,
-      /(;.*\b(drop|delete|insert|update)\b)/i,
-      /(\bexec\b.*\()/i,
-      /(\/\*.*\*\/)/,
-      /(--[^\r\n]*)/,
-      /(\bxp_cmdshell\b)/i,
-    ];
-
-    const content = JSON.stringify([data.body, data.query]).toLowerCase();
-    const matchedPatterns: string[] = [];
-    let confidence = 0;
-
-    sqlPatterns.forEach((pattern) => {
-      if (pattern.test(content)) {
-        matchedPatterns.push(pattern.toString());
-        confidence += 0.3;
-      }
-    });
-
-    if (matchedPatterns.length > 0) {
-      return {
-        isAttack: true,
-        attackType: AttackType.SQL_INJECTION,
-        threatLevel: confidence > 0.6 ? ThreatLevel.HIGH : ThreatLevel.MEDIUM,
-        shouldBlock: true,
-        confidence: Math.min(confidence, 1),
-        matchedPatterns,
-      };
-    }
-
-    return { isAttack: false, shouldBlock: false, confidence: 0 };
-  }
-
-  /**
-   * Detecta tentativas de XSS
-   */
-  private detectXSS(data: any): DetectionResult {
-    const xssPatterns = [
-      /<script[^>]*>.*?<\/script>/gi,
-      /javascript:/gi,
-      /on\w+\s*=/gi,
-      /<iframe[^>]*>/gi,
-      /<object[^>]*>/gi,
-      /<embed[^>]*>/gi,
-    ];
-
-    const content = JSON.stringify([data.body, data.query]);
-    const matchedPatterns: string[] = [];
-    let confidence = 0;
-
-    xssPatterns.forEach((pattern) => {
-      if (pattern.test(content)) {
-        matchedPatterns.push(pattern.toString());
-        confidence += 0.35;
-      }
-    });
-
-    if (matchedPatterns.length > 0) {
-      return {
-        isAttack: true,
-        attackType: AttackType.XSS,
-        threatLevel: confidence > 0.6 ? ThreatLevel.HIGH : ThreatLevel.MEDIUM,
-        shouldBlock: true,
-        confidence: Math.min(confidence, 1),
-        matchedPatterns,
-      };
-    }
-
-    return { isAttack: false, shouldBlock: false, confidence: 0 };
-  }
-
-  /**
-   * Detecta Path Traversal
-   */
-  private detectPathTraversal(data: any): DetectionResult {
-    const pathPatterns = [/\.\.[\/\\]/, /%2e%2e[\/\\]/i, /\.\.[%2f%5c]/i];
-
-    const content = JSON.stringify([data.endpoint, data.query, data.body]);
-    const matchedPatterns: string[] = [];
-
-    pathPatterns.forEach((pattern) => {
-      if (pattern.test(content)) {
-        matchedPatterns.push(pattern.toString());
-      }
-    });
-
-    if (matchedPatterns.length > 0) {
-      return {
-        isAttack: true,
-        attackType: AttackType.SUSPICIOUS_PATTERN,
-        threatLevel: ThreatLevel.HIGH,
-        shouldBlock: true,
-        confidence: 0.9,
-        matchedPatterns,
-      };
-    }
-
-    return { isAttack: false, shouldBlock: false, confidence: 0 };
+    return this.detectionEngine.analyze(data);
   }
 
   /**
    * Registra um evento de segurança
+   *
+   * O evento vai para a fila do SecurityEventWriter e é gravado em lote:
+   * quem chama não espera o banco (o evento devolvido ainda não tem id).
    */
-  async logSecurityEvent(
+  logSecurityEvent(
     detection: DetectionResult,
     data: {
       ip: string;
@@ -192,7 +100,7 @@ export class DetectionService {
       method?: string;
       payload?: any;
     },
-  ): Promise<SecurityEvent> {
+  ): SecurityEvent {
     const event = this.securityEventRepo.create({
       attackType: detection.attackType || AttackType.UNKNOWN,
       threatLevel: detection.threatLevel || ThreatLevel.LOW,
@@ -208,15 +116,24 @@ export class DetectionService {
         confidence: detection.confidence,
         matchedPatterns: detection.matchedPatterns,
       },
+      // Hora da detecção, não a da gravação do lote
+      detectedAt: new Date(),
     });
 
-    const saved = await this.securityEventRepo.save(event);
+    this.eventWriter.enqueue(event);
 
     this.logger.warn(
       `Security Event: ${detection.attackType} from ${data.ip} - ${detection.shouldBlock ? 'BLOCKED' : 'LOGGED'}`,
     );
 
-    return saved;
+    return event;
+  }
+
+  /**
+   * Contadores da fila de gravação de eventos
+   */
+  getEventWriterStats(): SecurityEventWriterStats {
+    return this.eventWriter.getStats();
   }
 
   /**
@@ -230,23 +147,68 @@ export class DetectionService {
   }
 
   /**
-   * Analisa tentativas de brute force por IP
+   * Conta a requisição do IP no endpoint e diz se passou do limite
+   *
+   * Janela deslizante de RATE_LIMIT_WINDOW_MS (padrão: 60000) com até
+   * RATE_LIMIT_MAX_REQUESTS requisições (padrão: 100; 0 desliga) por
+   * IP + endpoint. Requisições recusadas também contam: quem insiste
+   * continua limitado até diminuir o ritmo.
    */
-  async checkBruteForce(
-    ip: string,
-    timeWindowMinutes = 5,
-    threshold = 5,
-  ): Promise<boolean> {
-    const since = new Date(Date.now() - timeWindowMinutes * 60 * 1000);
+  checkRateLimit(ip: string, endpoint: string): RateLimitResult {
+    const limit = this.maxRequests;
+    if (limit <= 0) {
+      return { limited: false, count: 0, limit, retryAfterMs: 0 };
+    }
 
-    const count = await this.securityEventRepo.count({
-      where: {
-        sourceIp: ip,
-        attackType: AttackType.BRUTE_FORCE,
-      },
-    });
+    const key = `${ip} ${endpoint}`;
+    const now = Date.now();
+    const count = this.requestCounter.hit(key, now);
+    const limited = count > limit;
+
+    return {
+      limited,
+      count,
+      limit,
+      retryAfterMs: limited
+        ? this.requestCounter.retryAfter(key, limit, now)
+        : 0,
+    };
+  }
 
-    return count >= threshold;
+  /**
+   * Registra um login falho e devolve as falhas do IP nos últimos 5 minutos
+   */
+  recordFailedLogin(ip: string): number {
+    return this.failedLogins.hit(ip);
+  }
+
+  /**
+   * Zera as falhas de login do IP (login bem-sucedido)
+   */
+  clearFailedLogins(ip: string): void {
+    this.failedLogins.delete(ip);
+  }
+
+  /**
+   * Analisa tentativas de brute force por IP
+   *
+   * Consulta o contador de logins falhos em memória (janela deslizante de
+   * 5 minutos), sem contar eventos no banco.
+   */
+  checkBruteForce(ip: string, threshold = 5): boolean {
+    return this.failedLogins.count(ip) >= threshold;
+  }
+
+  /**
+   * Configuração e chaves ativas do rate limit
+   */
+  getRateLimitStats() {
+    return {
+      windowMs: this.requestCounter.windowMs,
+      maxRequests: this.maxRequests,
+      trackedKeys: this.requestCounter.size,
+      trackedLoginIps: this.failedLogins.size,
+    };
   }
 
   /**
@@ -260,6 +222,11 @@ export class DetectionService {
    * Limpa todos os eventos (apenas para demonstração)
    */
   async clearAllEvents(): Promise<number> {
+    this.eventWriter.clear();
+    // Um lote já retirado da fila ainda seria gravado depois do DELETE
+    await this.eventWriter.flush();
+    this.requestCounter.clear();
+    this.failedLogins.clear();
     const result = await this.securityEventRepo.delete({});
     return result.affected || 0;
   }
@@ -0,0 +1,178 @@
+import { Logger } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Repository } from 'typeorm';
+import { SecurityEvent } from './entities/security-event.entity';
+import { SecurityEventWriter } from './security-event-writer';
+
+describe('SecurityEventWriter', () => {
+  let insert: jest.Mock;
+  let writer: SecurityEventWriter;
+
+  function createWriter(overrides: Record<string, number> = {}) {
+    const config = {
+      get: (key: string, fallback: number) => overrides[key] ?? fallback,
+    } as unknown as ConfigService;
+    const repo = { insert } as unknown as Repository<SecurityEvent>;
+    return new SecurityEventWriter(repo, config);
+  }
+
+  function event(ip: string): SecurityEvent {
+    return { sourceIp: ip } as SecurityEvent;
+  }
+
+  beforeAll(() => {
+    Logger.overrideLogger(false);
+  });
+
+  beforeEach(() => {
+    insert = jest.fn().mockResolvedValue(undefined);
+    writer = createWriter({
+      SECURITY_EVENT_BATCH_SIZE: 3,
+      SECURITY_EVENT_QUEUE_SIZE: 5,
+    });
+  });
+
+  it('writes the queue in batches of the configured size', async () => {
+    writer.enqueue(event('10.0.0.1'));
+    writer.enqueue(event('10.0.0.2'));
+    expect(insert).not.toHaveBeenCalled();
+
+    // O terceiro evento enche o lote e dispara a gravação
+    writer.enqueue(event('10.0.0.3'));
+    writer.enqueue(event('10.0.0.4'));
+    await writer.flush();
+
+    expect(insert).toHaveBeenCalledTimes(2);
+    expect(insert.mock.calls[0][0].map((e) => e.sourceIp)).toEqual([
+      '10.0.0.1',
+      '10.0.0.2',
+      '10.0.0.3',
+    ]);
+    expect(insert.mock.calls[1][0].map((e) => e.sourceIp)).toEqual([
+      '10.0.0.4',
+    ]);
+    expect(writer.getStats()).toEqual({
+      queued: 0,
+      written: 4,
+      dropped: 0,
+      failed: 0,
+      flushes: 2,
+    });
+  });
+
+  it('drops new events while the queue is full', () => {
+    writer = createWriter({
+      SECURITY_EVENT_BATCH_SIZE: 100,
+      SECURITY_EVENT_QUEUE_SIZE: 2,
+    });
+
+    expect(writer.enqueue(event('10.0.0.1'))).toBe(true);
+    expect(writer.enqueue(event('10.0.0.2'))).toBe(true);
+    expect(writer.enqueue(event('10.0.0.3'))).toBe(false);
+
+    expect(writer.getStats()).toMatchObject({ queued: 2, dropped: 1 });
+  });
+
+  it('reports the dropped events on the next flush', async () => {
+    writer = createWriter({
+      SECURITY_EVENT_BATCH_SIZE: 100,
+      SECURITY_EVENT_QUEUE_SIZE: 1,
+    });
+    const warn = jest.spyOn(writer['logger'], 'warn');
+
+    ['10.0.0.1', '10.0.0.2', '10.0.0.3'].forEach((ip) =>
+      writer.enqueue(event(ip)),
+    );
+    expect(warn).not.toHaveBeenCalled();
+
+    await writer.flush();
+    expect(warn).toHaveBeenCalledTimes(1);
+    expect(warn.mock.calls[0][0]).toContain('dropped 2 events');
+
+    // Sem novos descartes, o flush seguinte não repete o aviso
+    await writer.flush();
+    expect(warn).toHaveBeenCalledTimes(1);
+    expect(writer.getStats()).toMatchObject({ written: 1, dropped: 2 });
+  });
+
+  it('counts a failed batch and keeps draining the queue', async () => {
+    insert.mockRejectedValueOnce(new Error('connection lost'));
+    writer = createWriter({ SECURITY_EVENT_BATCH_SIZE: 2 });
+
+    // Sem await: o primeiro lote já começa a ser gravado no enqueue
+    ['10.0.0.1', '10.0.0.2', '10.0.0.3'].forEach((ip) =>
+      writer.enqueue(event(ip)),
+    );
+    await writer.flush();
+
+    expect(insert).toHaveBeenCalledTimes(2);
+    expect(writer.getStats()).toMatchObject({
+      queued: 0,
+      written: 1,
+      failed: 2,
+      flushes: 2,
+    });
+  });
+
+  it('runs a single flush at a time', async () => {
+    let release: () => void;
+    insert.mockImplementationOnce(
+      () => new Promise<void>((resolve) => (release = resolve)),
+    );
+
+    writer.enqueue(event('10.0.0.1'));
+    const first = writer.flush();
+    writer.enqueue(event('10.0.0.2'));
+    // O evento que chegou durante a gravação fica para o flush seguinte
+    const second = writer.flush();
+    expect(second).not.toBe(first);
+    expect(writer.flush()).toBe(second);
+    expect(insert).toHaveBeenCalledTimes(1);
+
+    release();
+    await second;
+
+    expect(insert).toHaveBeenCalledTimes(2);
+    expect(insert.mock.calls[1][0].map((e) => e.sourceIp)).toEqual([
+      '10.0.0.2',
+    ]);
+    expect(writer.getStats()).toMatchObject({ queued: 0, written: 2 });
+  });
+
+  it('finishes a flush and reports drops while events keep arriving', async () => {
+    writer = createWriter({
+      SECURITY_EVENT_BATCH_SIZE: 2,
+      SECURITY_EVENT_QUEUE_SIZE: 4,
+    });
+    const warn = jest.spyOn(writer['logger'], 'warn');
+
+    // Cada INSERT demora uma volta do event loop e, enquanto isso, chegam
+    // mais eventos do que cabem na fila (por no máximo 50 INSERTs)
+    let rounds = 0;
+    insert.mockImplementation(async () => {
+      await new Promise((resolve) => setImmediate(resolve));
+      if (rounds++ < 50) {
+        for (let i = 0; i < 5; i++) writer.enqueue(event(`10.1.0.${i}`));
+      }
+    });
+
+    writer.enqueue(event('10.0.0.1'));
+    await writer.flush();
+
+    // Resolve com o ataque ainda em andamento, já avisando dos descartes
+    expect(rounds).toBeLessThan(50);
+    expect(warn).toHaveBeenCalled();
+    expect(warn.mock.calls[0][0]).toContain('dropped 1 events');
+  });
+
+  it('discards the pending events on clear', async () => {
+    writer.enqueue(event('10.0.0.1'));
+    writer.enqueue(event('10.0.0.2'));
+
+    expect(writer.clear()).toBe(2);
+    await writer.flush();
+
+    expect(insert).not.toHaveBeenCalled();
+    expect(writer.getStats().queued).toBe(0);
+  });
+});
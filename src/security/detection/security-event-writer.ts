@@ -0,0 +1,172 @@
+import {
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { InjectRepository } from '@nestjs/typeorm';
+import { Repository } from 'typeorm';
+import { SecurityEvent } from './entities/security-event.entity';
+
+export interface SecurityEventWriterStats {
+  queued: number;
+  written: number;
+  dropped: number;
+  failed: number;
+  flushes: number;
+}
+
+/**
+ * Gravação em lote dos eventos de segurança
+ *
+ * Os eventos entram em uma fila em memória e são gravados com INSERTs de
+ * várias linhas a cada intervalo (ou assim que um lote enche), então quem
+ * detecta o ataque não espera o banco. Cada flush grava só o que estava na
+ * fila quando começou, então termina mesmo sob um fluxo contínuo de
+ * eventos. A fila é limitada: cheia, o evento novo é descartado e contado
+ * em `dropped`, e o flush registra a cada lote um aviso com quantos se
+ * perderam desde o anterior. Um lote que falha no banco é descartado e
+ * contado em `failed`.
+ *
+ * Configuração (variáveis de ambiente):
+ * - SECURITY_EVENT_FLUSH_MS: intervalo entre gravações (padrão: 1000)
+ * - SECURITY_EVENT_BATCH_SIZE: linhas por INSERT (padrão: 500)
+ * - SECURITY_EVENT_QUEUE_SIZE: eventos aguardando gravação (padrão: 10000)
+ */
+@Injectable()
+export class SecurityEventWriter implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(SecurityEventWriter.name);
+
+  private readonly flushInterval: number;
+  private readonly batchSize: number;
+  private readonly maxQueueSize: number;
+
+  private queue: SecurityEvent[] = [];
+  // Eventos retirados da fila pelo flush em andamento, ainda não gravados
+  private draining: SecurityEvent[] = [];
+  private timer: NodeJS.Timeout;
+  private flushing: Promise<void> | null = null;
+  private nextFlush: Promise<void> | null = null;
+  private readonly stats = { written: 0, dropped: 0, failed: 0, flushes: 0 };
+  // Descartados desde o último aviso
+  private droppedSinceReport = 0;
+
+  constructor(
+    @InjectRepository(SecurityEvent)
+    private securityEventRepo: Repository<SecurityEvent>,
+    configService: ConfigService,
+  ) {
+    this.flushInterval = Number(
+      configService.get('SECURITY_EVENT_FLUSH_MS', 1000),
+    );
+    this.batchSize = Number(
+      configService.get('SECURITY_EVENT_BATCH_SIZE', 500),
+    );
+    this.maxQueueSize = Number(
+      configService.get('SECURITY_EVENT_QUEUE_SIZE', 10000),
+    );
+  }
+
+  onModuleInit(): void {
+    this.timer = setInterval(() => this.flush(), this.flushInterval);
+    // O timer não segura o processo aberto sozinho
+    this.timer.unref();
+  }
+
+  async onModuleDestroy(): Promise<void> {
+    clearInterval(this.timer);
+    await this.flush();
+  }
+
+  /**
+   * Coloca o evento na fila (false = fila cheia, evento descartado)
+   */
+  enqueue(event: SecurityEvent): boolean {
+    if (this.queue.length + this.draining.length >= this.maxQueueSize) {
+      this.stats.dropped++;
+      this.droppedSinceReport++;
+      return false;
+    }
+
+    this.queue.push(event);
+    // Um lote cheio não espera o intervalo
+    if (this.queue.length >= this.batchSize) this.flush();
+    return true;
+  }
+
+  /**
+   * Grava tudo o que está na fila agora (um flush por vez)
+   *
+   * Com um flush em andamento, que não pega os eventos chegados depois
+   * dele, devolve o seguinte, que começa assim que ele termina.
+   */
+  flush(): Promise<void> {
+    if (!this.flushing) {
+      this.flushing = this.drain().finally(() => {
+        this.flushing = null;
+      });
+      return this.flushing;
+    }
+
+    if (!this.nextFlush) {
+      this.nextFlush = this.flushing.then(() => {
+        this.nextFlush = null;
+        return this.flush();
+      });
+    }
+    return this.nextFlush;
+  }
+
+  /**
+   * Descarta os eventos ainda não gravados (reset de demonstração)
+   */
+  clear(): number {
+    const discarded = this.queue.length + this.draining.length;
+    this.queue = [];
+    // O flush em andamento para depois do lote atual
+    this.draining.length = 0;
+    return discarded;
+  }
+
+  getStats(): SecurityEventWriterStats {
+    return {
+      queued: this.queue.length + this.draining.length,
+      ...this.stats,
+    };
+  }
+
+  private async drain(): Promise<void> {
+    // Os que chegarem durante a gravação ficam para o próximo flush
+    this.draining = this.queue;
+    this.queue = [];
+
+    while (this.draining.length > 0) {
+      const batch = this.draining.splice(0, this.batchSize);
+      this.stats.flushes++;
+      try {
+        await this.securityEventRepo.insert(batch);
+        this.stats.written += batch.length;
+      } catch (error) {
+        this.stats.failed += batch.length;
+        this.logger.error(
+          `Failed to write ${batch.length} security events: ${error}`,
+        );
+      }
+      this.reportDrops();
+    }
+    this.reportDrops();
+  }
+
+  /**
+   * Avisa quantos eventos a fila cheia descartou desde o último aviso
+   */
+  private reportDrops(): void {
+    if (this.droppedSinceReport === 0) return;
+
+    this.logger.warn(
+      `Security event queue full (${this.maxQueueSize}): dropped ${this.droppedSinceReport} events since the last warning (${this.stats.dropped} total)`,
+    );
+    this.droppedSinceReport = 0;
+  }
+}
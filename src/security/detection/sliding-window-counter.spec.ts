@@ -0,0 +1,126 @@
+import { SlidingWindowCounter } from './sliding-window-counter';
+
+describe('SlidingWindowCounter', () => {
+  // Janela de 1s em 10 fatias de 100ms; os instantes partem de T (como
+  // Date.now(), longe do zero)
+  const T = 1_000_000;
+  let counter: SlidingWindowCounter;
+
+  beforeEach(() => {
+    counter = new SlidingWindowCounter(1000, 10);
+  });
+
+  it('counts hits per key inside the window', () => {
+    expect(counter.hit('a', T)).toBe(1);
+    expect(counter.hit('a', T + 50)).toBe(2);
+    expect(counter.hit('b', T + 60)).toBe(1);
+
+    expect(counter.count('a', T + 100)).toBe(2);
+    expect(counter.count('b', T + 100)).toBe(1);
+    expect(counter.count('missing', T + 100)).toBe(0);
+  });
+
+  it('drops a slice exactly when it leaves the window', () => {
+    counter.hit('a', T);
+    counter.hit('a', T + 99);
+    counter.hit('a', T + 100);
+
+    expect(counter.count('a', T + 999)).toBe(3);
+    // Fatia 0 (0-99ms) sai em 1000ms, a fatia 1 em 1100ms
+    expect(counter.count('a', T + 1000)).toBe(1);
+    expect(counter.count('a', T + 1099)).toBe(1);
+    expect(counter.count('a', T + 1100)).toBe(0);
+  });
+
+  it('resets a key idle for more than a window', () => {
+    counter.hit('a', T);
+    counter.hit('a', T + 500);
+
+    expect(counter.hit('a', T + 5000)).toBe(1);
+    expect(counter.count('a', T + 5000)).toBe(1);
+  });
+
+  it('computes Retry-After from the oldest slices', () => {
+    counter.hit('a', T);
+    counter.hit('a', T + 250);
+    counter.hit('a', T + 260);
+
+    // Abaixo de 3 quando a fatia 0 sai (1000ms)
+    expect(counter.retryAfter('a', 3, T + 300)).toBe(700);
+    // Abaixo de 2 só quando a fatia 2 (200-299ms) sai (1200ms)
+    expect(counter.retryAfter('a', 2, T + 300)).toBe(900);
+    expect(counter.retryAfter('a', 4, T + 300)).toBe(0);
+    expect(counter.retryAfter('missing', 1, T + 300)).toBe(0);
+  });
+
+  it('agrees with a naive sliding window on random traffic', () => {
+    const hits: number[] = [];
+    let now = T;
+    for (let i = 0; i < 2000; i++) {
+      now += (i * 37) % 23;
+      const total = counter.hit('a', now);
+      hits.push(now);
+
+      const slot = Math.floor(now / 100);
+      const expected = hits.filter(
+        (time) => Math.floor(time / 100) > slot - 10,
+      ).length;
+      expect(total).toBe(expected);
+    }
+  });
+
+  it('prunes idle keys and supports delete and clear', () => {
+    counter.hit('a', T);
+    counter.hit('b', T);
+    // O hit de 'c' já descarta 'a' e 'b', inativas há mais de uma janela
+    counter.hit('c', T + 1500);
+    expect(counter.size).toBe(1);
+    counter.hit('c', T + 3000);
+    expect(counter.size).toBe(1);
+
+    counter.hit('d', T + 3000);
+    counter.delete('c');
+    expect(counter.count('c', T + 3000)).toBe(0);
+    expect(counter.size).toBe(1);
+
+    counter.clear();
+    expect(counter.size).toBe(0);
+  });
+
+  it('examines a bounded number of idle keys per hit', () => {
+    for (let i = 0; i < 1000; i++) counter.hit(`idle-${i}`, T);
+
+    counter.hit('a', T + 2000);
+    expect(counter.size).toBe(1000 - 64 + 1);
+
+    for (let i = 0; i < 20; i++) counter.hit('a', T + 2000);
+    expect(counter.size).toBe(1);
+  });
+
+  it('keeps the keys hit inside the window while pruning', () => {
+    counter.hit('old', T);
+    counter.hit('a', T + 500);
+    counter.hit('b', T + 900);
+    // 'old' volta a ser a mais recente e não sai da janela
+    counter.hit('old', T + 950);
+
+    counter.hit('c', T + 1400);
+    expect(counter.size).toBe(4);
+
+    counter.hit('c', T + 1600);
+    expect(counter.size).toBe(3);
+    expect(counter.count('a', T + 1600)).toBe(0);
+    expect(counter.count('b', T + 1600)).toBe(1);
+    expect(counter.count('old', T + 1600)).toBe(1);
+  });
+
+  it('prunes keys only read by count() once their hits expire', () => {
+    counter.hit('a', T);
+    counter.hit('b', T + 100);
+    // count() avança a fatia de 'a' sem mudar sua posição
+    expect(counter.count('a', T + 900)).toBe(1);
+
+    counter.hit('c', T + 1200);
+    expect(counter.size).toBe(1);
+  });
+});
@@ -0,0 +1,130 @@
+// Chaves examinadas por hit na limpeza das inativas
+const PRUNE_SCAN = 64;
+
+interface WindowEntry {
+  // Fatia (Math.floor(ms / slotMs)) do último hit
+  slot: number;
+  counts: number[];
+  total: number;
+}
+
+/**
+ * Contador de janela deslizante por chave (IP, IP + endpoint...)
+ *
+ * A janela é dividida em `slots` fatias guardadas em um buffer circular:
+ * cada hit soma na fatia atual e as fatias que saíram da janela são
+ * zeradas ao avançar, então hit, contagem e Retry-After custam no máximo
+ * `slots` passos, independentemente do volume de requisições. O Map fica
+ * na ordem do último hit, então as chaves sem hits há uma janela inteira
+ * estão no começo: cada hit examina no máximo PRUNE_SCAN delas e para na
+ * primeira ainda ativa.
+ */
+export class SlidingWindowCounter {
+  private readonly entries = new Map<string, WindowEntry>();
+  private readonly slotMs: number;
+
+  constructor(
+    readonly windowMs: number,
+    private readonly slots = 10,
+  ) {
+    this.slotMs = windowMs / slots;
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  /**
+   * Registra um hit e devolve o total da chave na janela (incluindo ele)
+   */
+  hit(key: string, now = Date.now()): number {
+    const slot = Math.floor(now / this.slotMs);
+    this.prune(slot);
+
+    let entry = this.entries.get(key);
+    if (!entry) {
+      entry = { slot, counts: new Array(this.slots).fill(0), total: 0 };
+    } else {
+      this.advance(entry, slot);
+      // Volta para o fim: a ordem do Map é a do último hit
+      this.entries.delete(key);
+    }
+    this.entries.set(key, entry);
+
+    entry.counts[slot % this.slots]++;
+    entry.total++;
+    return entry.total;
+  }
+
+  count(key: string, now = Date.now()): number {
+    const entry = this.entries.get(key);
+    if (!entry) return 0;
+    this.advance(entry, Math.floor(now / this.slotMs));
+    return entry.total;
+  }
+
+  /**
+   * Milissegundos até o total da chave ficar abaixo de `limit`
+   */
+  retryAfter(key: string, limit: number, now = Date.now()): number {
+    const entry = this.entries.get(key);
+    if (!entry) return 0;
+    this.advance(entry, Math.floor(now / this.slotMs));
+
+    // Das fatias mais antigas para as mais novas: cada uma sai da janela
+    // em (fatia + slots) * slotMs
+    let remaining = entry.total;
+    for (let slot = entry.slot - this.slots + 1; slot <= entry.slot; slot++) {
+      if (remaining < limit) break;
+      remaining -= entry.counts[slot % this.slots];
+      if (remaining < limit) {
+        return Math.max(0, (slot + this.slots) * this.slotMs - now);
+      }
+    }
+    return 0;
+  }
+
+  delete(key: string): void {
+    this.entries.delete(key);
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+
+  /**
+   * Zera as fatias que saíram da janela desde o último hit da chave
+   */
+  private advance(entry: WindowEntry, slot: number): void {
+    if (slot <= entry.slot) return;
+
+    if (slot - entry.slot >= this.slots) {
+      entry.counts.fill(0);
+      entry.total = 0;
+    } else {
+      for (let next = entry.slot + 1; next <= slot; next++) {
+        const index = next % this.slots;
+        entry.total -= entry.counts[index];
+        entry.counts[index] = 0;
+      }
+    }
+    entry.slot = slot;
+  }
+
+  /**
+   * Descarta as chaves sem hits na janela, das menos recentes em diante
+   *
+   * Uma chave cuja fatia foi avançada por count() sem hit ainda pode
+   * estar vazia, por isso o total é conferido depois de avançar.
+   */
+  private prune(slot: number): void {
+    let scanned = 0;
+    for (const [key, entry] of this.entries) {
+      if (scanned++ >= PRUNE_SCAN) return;
+
+      this.advance(entry, slot);
+      if (entry.total > 0) return;
+      this.entries.delete(key);
+    }
+  }
+}
@@ -30,7 +30,7 @@ export class HoneypotService {
     );
 
     // Registra como evento de segurança
-    await this.detectionService.logSecurityEvent(
+    this.detectionService.logSecurityEvent(
       {
         isAttack: true,
         attackType: AttackType.SUSPICIOUS_PATTERN,
@@ -43,7 +43,7 @@ export class HoneypotService {
     );
 
     // Adiciona à threat intelligence
-    await this.threatIntel.recordThreatActivity(
+    this.threatIntel.recordThreatActivity(
       data.ip,
       AttackType.SUSPICIOUS_PATTERN,
       ThreatLevel.MEDIUM,
@@ -131,6 +131,9 @@ export class MonitoringService {
           t.riskLevel === ThreatLevel.HIGH ||
           t.riskLevel === ThreatLevel.CRITICAL,
       ).length,
+      securityEventWriter: this.detectionService.getEventWriterStats(),
+      threatActors: this.threatIntel.getThreatActorStats(),
+      rateLimit: this.detectionService.getRateLimitStats(),
       timestamp: new Date().toISOString(),
     };
   }
@@ -0,0 +1,119 @@
+import { BlocklistCache } from './blocklist-cache';
+
+describe('BlocklistCache', () => {
+  let cache: BlocklistCache;
+
+  beforeEach(() => {
+    cache = new BlocklistCache();
+  });
+
+  it('keeps permanent blocks until they are deleted', () => {
+    cache.set('10.0.0.1');
+    cache.set('10.0.0.2', null);
+
+    expect(cache.popExpired(Number.MAX_SAFE_INTEGER)).toEqual([]);
+    expect(cache.has('10.0.0.1')).toBe(true);
+    expect(cache.size).toBe(2);
+
+    cache.delete('10.0.0.1');
+    expect(cache.has('10.0.0.1')).toBe(false);
+    expect(cache.size).toBe(1);
+  });
+
+  it('pops expired blocks in expiry order and removes them', () => {
+    cache.set('10.0.0.3', new Date(3000));
+    cache.set('10.0.0.1', new Date(1000));
+    cache.set('10.0.0.2', new Date(2000));
+    cache.set('10.0.0.9');
+
+    expect(cache.popExpired(2500)).toEqual(['10.0.0.1', '10.0.0.2']);
+    expect(cache.has('10.0.0.1')).toBe(false);
+    expect(cache.has('10.0.0.3')).toBe(true);
+    expect(cache.popExpired(2500)).toEqual([]);
+    expect(cache.popExpired(5000)).toEqual(['10.0.0.3']);
+    expect(cache.size).toBe(1);
+  });
+
+  it('expires a block only after its expiry time', () => {
+    cache.set('10.0.0.1', new Date(1000));
+
+    expect(cache.popExpired(1000)).toEqual([]);
+    expect(cache.popExpired(1001)).toEqual(['10.0.0.1']);
+  });
+
+  it('ignores the old expiry of a block that was renewed', () => {
+    cache.set('10.0.0.1', new Date(1000));
+    cache.set('10.0.0.1', new Date(5000));
+
+    expect(cache.popExpired(2000)).toEqual([]);
+    expect(cache.has('10.0.0.1')).toBe(true);
+    expect(cache.popExpired(6000)).toEqual(['10.0.0.1']);
+  });
+
+  it('does not return unblocked or permanently re-blocked IPs', () => {
+    cache.set('10.0.0.1', new Date(1000));
+    cache.set('10.0.0.2', new Date(1000));
+    cache.delete('10.0.0.1');
+    cache.set('10.0.0.2');
+
+    expect(cache.popExpired(2000)).toEqual([]);
+    expect(cache.has('10.0.0.2')).toBe(true);
+  });
+
+  it('keeps the heap bounded under block/unblock churn', () => {
+    cache.set('10.0.0.1', new Date(1000));
+    for (let i = 0; i < 1000; i++) {
+      cache.set('10.0.0.2', new Date(5000 + i));
+      cache.delete('10.0.0.2');
+      cache.set('10.0.0.3', new Date(9000 + i));
+      cache.set('10.0.0.3');
+    }
+
+    expect(cache['heap'].length).toBeLessThanOrEqual(2);
+    expect(cache.popExpired(Number.MAX_SAFE_INTEGER)).toEqual(['10.0.0.1']);
+    expect(cache.has('10.0.0.3')).toBe(true);
+    expect(cache['heap']).toHaveLength(0);
+  });
+
+  it('still expires renewed blocks in order after compacting', () => {
+    for (let i = 0; i < 50; i++) {
+      cache.set(`10.0.0.${i}`, new Date(1000 + i));
+    }
+    for (const base of [2000, 3000]) {
+      for (let i = 0; i < 50; i++) {
+        cache.set(`10.0.0.${i}`, new Date(base - i));
+      }
+    }
+
+    expect(cache['heap'].length).toBeLessThanOrEqual(100);
+    expect(cache.popExpired(2500)).toEqual([]);
+    const expected = Array.from({ length: 50 }, (_, i) => `10.0.0.${49 - i}`);
+    expect(cache.popExpired(4000)).toEqual(expected);
+    expect(cache.size).toBe(0);
+  });
+
+  it('keeps the heap ordered across many random expiries', () => {
+    const expiries = Array.from({ length: 200 }, (_, i) => ({
+      ip: `10.0.${i >> 8}.${i & 255}`,
+      expiresAt: ((i * 7919) % 1000) + 1,
+    }));
+    expiries.forEach(({ ip, expiresAt }) =>
+      cache.set(ip, new Date(expiresAt)),
+    );
+
+    const popped: string[] = [];
+    for (let now = 0; now <= 1001; now += 50) {
+      popped.push(...cache.popExpired(now));
+    }
+
+    // IPs com a mesma expiração podem sair em qualquer ordem entre si
+    const expiryOf = new Map(
+      expiries.map(({ ip, expiresAt }) => [ip, expiresAt]),
+    );
+    const order = popped.map((ip) => expiryOf.get(ip));
+    const expected = expiries.map(({ expiresAt }) => expiresAt);
+    expect(order).toEqual(expected.sort((a, b) => a - b));
+    expect(new Set(popped).size).toBe(expiries.length);
+    expect(cache.size).toBe(0);
+  });
+});
@@ -0,0 +1,140 @@
+interface ExpiryEntry {
+  ip: string;
+  expiresAt: number;
+}
+
+/**
+ * Cópia em memória da ip_blocklist ativa
+ *
+ * Um Map (IP -> expiração em ms, ou null para bloqueio permanente) responde
+ * a consulta do WAF sem ir ao banco, e um min-heap ordenado pela expiração
+ * encontra os bloqueios vencidos sem percorrer o Map. Entradas do heap que
+ * não batem mais com o Map (IP desbloqueado ou bloqueado de novo com outra
+ * expiração) são descartadas quando chegam ao topo; se passam a ser maioria,
+ * o heap é refeito a partir do Map. Assim ele nunca passa do dobro dos
+ * bloqueios com expiração, mesmo com bloqueios e desbloqueios em sequência.
+ */
+export class BlocklistCache {
+  private readonly entries = new Map<string, number | null>();
+  private heap: ExpiryEntry[] = [];
+  // Entradas do heap que não correspondem mais a um bloqueio do Map
+  private stale = 0;
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  has(ip: string): boolean {
+    return this.entries.has(ip);
+  }
+
+  set(ip: string, expiresAt?: Date | null): void {
+    const expires = expiresAt ? expiresAt.getTime() : null;
+    this.retire(ip);
+    this.entries.set(ip, expires);
+    if (expires !== null) {
+      this.push({ ip, expiresAt: expires });
+    }
+    this.compactIfStale();
+  }
+
+  delete(ip: string): void {
+    this.retire(ip);
+    this.entries.delete(ip);
+    this.compactIfStale();
+  }
+
+  clear(): void {
+    this.entries.clear();
+    this.heap.length = 0;
+    this.stale = 0;
+  }
+
+  /**
+   * Remove e devolve os IPs cujo bloqueio venceu antes de `now`
+   */
+  popExpired(now = Date.now()): string[] {
+    const expired: string[] = [];
+
+    while (this.heap.length > 0 && this.heap[0].expiresAt < now) {
+      const { ip, expiresAt } = this.pop();
+      if (this.entries.get(ip) === expiresAt) {
+        this.entries.delete(ip);
+        expired.push(ip);
+      } else {
+        this.stale--;
+      }
+    }
+
+    return expired;
+  }
+
+  /**
+   * Marca como obsoleta a entrada do heap do bloqueio atual de `ip`
+   */
+  private retire(ip: string): void {
+    if (this.entries.get(ip) != null) {
+      this.stale++;
+    }
+  }
+
+  /**
+   * Refaz o heap só com os bloqueios com expiração do Map quando as
+   * entradas obsoletas passam a ser maioria
+   */
+  private compactIfStale(): void {
+    if (this.stale <= this.heap.length - this.stale) return;
+
+    const heap: ExpiryEntry[] = [];
+    for (const [ip, expiresAt] of this.entries) {
+      if (expiresAt !== null) heap.push({ ip, expiresAt });
+    }
+    this.heap = heap;
+    this.stale = 0;
+
+    for (let index = (heap.length >> 1) - 1; index >= 0; index--) {
+      this.siftDown(index, heap[index]);
+    }
+  }
+
+  private push(entry: ExpiryEntry): void {
+    const heap = this.heap;
+    heap.push(entry);
+
+    let index = heap.length - 1;
+    while (index > 0) {
+      const parent = (index - 1) >> 1;
+      if (heap[parent].expiresAt <= entry.expiresAt) break;
+      heap[index] = heap[parent];
+      index = parent;
+    }
+    heap[index] = entry;
+  }
+
+  private pop(): ExpiryEntry {
+    const heap = this.heap;
+    const top = heap[0];
+    const last = heap.pop();
+    if (heap.length > 0) {
+      this.siftDown(0, last);
+    }
+    return top;
+  }
+
+  private siftDown(index: number, entry: ExpiryEntry): void {
+    const heap = this.heap;
+    for (;;) {
+      const left = 2 * index + 1;
+      if (left >= heap.length) break;
+      const right = left + 1;
+      const child =
+        right < heap.length && heap[right].expiresAt < heap[left].expiresAt
+          ? right
+          : left;
+      if (heap[child].expiresAt >= entry.expiresAt) break;
+      heap[index] = heap[child];
+      index = child;
+    }
+    heap[index] = entry;
+  }
+}
@@ -0,0 +1,239 @@
+import { Logger } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Repository } from 'typeorm';
+import {
+  AttackType,
+  ThreatLevel,
+} from '../detection/entities/security-event.entity';
+import { IpBlocklist } from './entities/ip-blocklist.entity';
+import { ThreatActor } from './entities/threat-actor.entity';
+import { ThreatIntelligenceService } from './threat-intelligence.service';
+
+// Deixa rodar as promises pendentes (busca em lote, flush)
+const tick = () => new Promise((resolve) => setImmediate(resolve));
+
+describe('ThreatIntelligenceService', () => {
+  // Linhas da tabela threat_actors, por IP
+  let rows: Map<string, Partial<ThreatActor>>;
+  let actorRepo: Record<string, jest.Mock>;
+  let blocklistRepo: Record<string, jest.Mock>;
+  let service: ThreatIntelligenceService;
+
+  function createService(maxTracked = 100) {
+    const config = {
+      get: (key: string, fallback: unknown) =>
+        key === 'THREAT_ACTOR_MAX_TRACKED' ? maxTracked : fallback,
+    } as unknown as ConfigService;
+    return new ThreatIntelligenceService(
+      actorRepo as unknown as Repository<ThreatActor>,
+      blocklistRepo as unknown as Repository<IpBlocklist>,
+      config,
+    );
+  }
+
+  function record(ip: string, attackType = AttackType.SQL_INJECTION) {
+    return service.recordThreatActivity(ip, attackType, ThreatLevel.HIGH);
+  }
+
+  function trackedIps(): string[] {
+    return [...service['actors'].keys()];
+  }
+
+  beforeAll(() => {
+    Logger.overrideLogger(false);
+  });
+
+  beforeEach(() => {
+    rows = new Map();
+    actorRepo = {
+      create: jest.fn((data) => ({ ...data })),
+      find: jest.fn(async ({ where }) =>
+        where
+          ? where.ipAddress.value
+              .filter((ip: string) => rows.has(ip))
+              .map((ip: string) => ({ ...rows.get(ip) }))
+          : [...rows.values()].map((row) => ({ ...row })),
+      ),
+      upsert: jest.fn(async (values: Partial<ThreatActor>[]) => {
+        values.forEach((value) => rows.set(value.ipAddress, { ...value }));
+      }),
+      delete: jest.fn(async () => {
+        const affected = rows.size;
+        rows.clear();
+        return { affected };
+      }),
+    };
+    blocklistRepo = {
+      findOne: jest.fn().mockResolvedValue(null),
+      create: jest.fn((data) => ({ ...data })),
+      save: jest.fn(async (entry) => entry),
+    };
+    service = createService();
+  });
+
+  it('auto-blocks as soon as the score reaches the critical threshold', () => {
+    for (let i = 0; i < 3; i++) record('10.0.0.1');
+    expect(service.isIpBlocked('10.0.0.1')).toBe(false);
+
+    // Quarto SQLi: 4 x 25 = 100
+    const actor = record('10.0.0.1');
+    expect(actor.isBlocked).toBe(true);
+    expect(service.isIpBlocked('10.0.0.1')).toBe(true);
+  });
+
+  it('blocks a returning actor once its stored history is loaded', async () => {
+    rows.set('10.0.0.1', {
+      ipAddress: '10.0.0.1',
+      threatScore: 90,
+      attackCount: 9,
+      attackTypes: [AttackType.BRUTE_FORCE],
+      isBlocked: false,
+      metadata: {},
+    });
+
+    const actor = record('10.0.0.1', AttackType.XSS);
+    expect(service.isIpBlocked('10.0.0.1')).toBe(false);
+
+    // Sem esperar o flush: só a busca em lote
+    await tick();
+    expect(actorRepo.upsert).not.toHaveBeenCalled();
+    expect(actor.threatScore).toBe(110);
+    expect(actor.attackTypes).toEqual([AttackType.XSS, AttackType.BRUTE_FORCE]);
+    expect(service.isIpBlocked('10.0.0.1')).toBe(true);
+  });
+
+  it('loads the new actors of the same tick in a single query', async () => {
+    record('10.0.0.1');
+    record('10.0.0.2');
+    record('10.0.0.3');
+    await tick();
+
+    expect(actorRepo.find).toHaveBeenCalledTimes(1);
+    expect(actorRepo.find.mock.calls[0][0].where.ipAddress.value).toEqual([
+      '10.0.0.1',
+      '10.0.0.2',
+      '10.0.0.3',
+    ]);
+  });
+
+  it('merges the stored history exactly once', async () => {
+    rows.set('10.0.0.1', {
+      ipAddress: '10.0.0.1',
+      threatScore: 40,
+      attackCount: 4,
+      attackTypes: [],
+      isBlocked: false,
+      metadata: {},
+    });
+
+    // O flush começa antes da busca em lote terminar
+    record('10.0.0.1');
+    await service.flushThreatActors();
+    expect(rows.get('10.0.0.1')).toMatchObject({
+      threatScore: 65,
+      attackCount: 5,
+    });
+
+    record('10.0.0.1');
+    await tick();
+    await service.flushThreatActors();
+    expect(actorRepo.find).toHaveBeenCalledTimes(1);
+    expect(rows.get('10.0.0.1')).toMatchObject({
+      threatScore: 90,
+      attackCount: 6,
+    });
+  });
+
+  it('evicts the least recently used actors once written', async () => {
+    service = createService(2);
+
+    record('10.0.0.1');
+    record('10.0.0.2');
+    // Volta a ser o mais recente
+    record('10.0.0.1');
+    record('10.0.0.3');
+    await tick();
+
+    // Ainda não gravados: nenhum sai da memória
+    expect(trackedIps()).toHaveLength(3);
+    expect(service.getThreatActorStats().evicted).toBe(0);
+
+    await service.flushThreatActors();
+    expect(trackedIps()).toEqual(['10.0.0.1', '10.0.0.3']);
+    expect(service.getThreatActorStats()).toMatchObject({
+      tracked: 2,
+      pending: 0,
+      evicted: 1,
+    });
+    expect(rows.size).toBe(3);
+  });
+
+  it('drops the oldest unwritten actors when a flush fails', async () => {
+    service = createService(2);
+    actorRepo.upsert.mockRejectedValue(new Error('connection lost'));
+
+    record('10.0.0.1');
+    record('10.0.0.2');
+    record('10.0.0.3');
+    await service.flushThreatActors();
+
+    expect(trackedIps()).toEqual(['10.0.0.2', '10.0.0.3']);
+    expect(service.getThreatActorStats()).toMatchObject({
+      tracked: 2,
+      pending: 2,
+      failed: 3,
+      dropped: 1,
+    });
+  });
+
+  it('waits for an in-flight flush before clearing the table', async () => {
+    let release: () => void;
+    actorRepo.upsert.mockImplementationOnce(
+      (values: Partial<ThreatActor>[]) =>
+        new Promise<void>((resolve) => {
+          release = () => {
+            values.forEach((value) => rows.set(value.ipAddress, value));
+            resolve();
+          };
+        }),
+    );
+
+    record('10.0.0.1');
+    const flushing = service.flushThreatActors();
+    while (actorRepo.upsert.mock.calls.length === 0) await tick();
+
+    const clearing = service.clearAllThreats();
+    await tick();
+    expect(actorRepo.delete).not.toHaveBeenCalled();
+
+    release();
+    await flushing;
+    expect(await clearing).toBe(1);
+    expect(rows.size).toBe(0);
+    expect(trackedIps()).toEqual([]);
+  });
+
+  it('does not keep a flush open while new actors keep arriving', async () => {
+    // Cada INSERT demora uma volta do event loop e, enquanto isso, o
+    // ataque marca mais um IP como alterado (no máximo 50 vezes)
+    let arrivals = 0;
+    actorRepo.upsert.mockImplementation(
+      async (values: Partial<ThreatActor>[]) => {
+        await tick();
+        if (arrivals < 50) record(`10.1.0.${arrivals++}`);
+        values.forEach((value) => rows.set(value.ipAddress, { ...value }));
+      },
+    );
+
+    record('10.0.0.1');
+    const top = await service.getTopThreats();
+
+    expect(actorRepo.upsert).toHaveBeenCalledTimes(1);
+    expect(top.map((actor) => actor.ipAddress)).toEqual(['10.0.0.1']);
+    expect(service.getThreatActorStats().pending).toBe(1);
+
+    // O IP que chegou durante a gravação sai no flush seguinte
+    await service.flushThreatActors();
+    expect(rows.has('10.1.0.0')).toBe(true);
+  });
+});
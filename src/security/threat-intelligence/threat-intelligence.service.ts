@@ -1,6 +1,19 @@
-import { Injectable, Logger } from '@nestjs/common';
+import {
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository, LessThan } from 'typeorm';
+import {
+  Between,
+  FindOperator,
+  In,
+  LessThan,
+  MoreThanOrEqual,
+  Repository,
+} from 'typeorm';
 import { ThreatActor } from './entities/threat-actor.entity';
 import { IpBlocklist } from './entities/ip-blocklist.entity';
 import {
@@ -8,11 +21,44 @@ import {
   ThreatLevel,
 } from '../detection/entities/security-event.entity';
 import { Cron, CronExpression } from '@nestjs/schedule';
+import { BlocklistCache } from './blocklist-cache';
+
+// Actors lidos por consulta ao banco (histórico e flush)
+const ACTOR_BATCH_SIZE = 500;
+// Entradas examinadas por chamada de evictIdleActors
+const EVICTION_SCAN = 64;
 
 @Injectable()
-export class ThreatIntelligenceService {
+export class ThreatIntelligenceService
+  implements OnModuleInit, OnModuleDestroy
+{
   private readonly logger = new Logger(ThreatIntelligenceService.name);
 
+  // Blocklist ativa em memória: o WAF consulta aqui em vez do banco
+  private readonly blocklistCache = new BlocklistCache();
+
+  // Threat actors ativos em memória; o banco recebe os IPs alterados em
+  // lote a cada THREAT_ACTOR_FLUSH_MS (write-behind). A ordem do Map é a
+  // de uso: acima de THREAT_ACTOR_MAX_TRACKED saem os menos recentes
+  private readonly actors = new Map<string, ThreatActor>();
+  private dirtyActors = new Set<string>();
+  // Criados em memória sem o histórico do banco, que é buscado em lote
+  // logo em seguida (ou, se a busca falhar, pelo flush)
+  private readonly unmergedActors = new Set<string>();
+  private readonly pendingLoads = new Set<string>();
+  private actorLoad: Promise<void> | null = null;
+  private readonly actorFlushInterval: number;
+  private readonly maxTrackedActors: number;
+  private actorFlushTimer: NodeJS.Timeout;
+  private actorFlush: Promise<void> | null = null;
+  private readonly actorWriteStats = {
+    written: 0,
+    failed: 0,
+    flushes: 0,
+    evicted: 0,
+    dropped: 0,
+  };
+
   // Thresholds para threat scoring
   private readonly THREAT_SCORE_THRESHOLDS = {
     LOW: 20,
@@ -37,29 +83,86 @@ export class ThreatIntelligenceService {
     private threatActorRepo: Repository<ThreatActor>,
     @InjectRepository(IpBlocklist)
     private blocklistRepo: Repository<IpBlocklist>,
-  ) {}
+    configService: ConfigService,
+  ) {
+    this.actorFlushInterval = Number(
+      configService.get('THREAT_ACTOR_FLUSH_MS', 2000),
+    );
+    this.maxTrackedActors = Number(
+      configService.get('THREAT_ACTOR_MAX_TRACKED', 100000),
+    );
+  }
+
+  /**
+   * Carrega a blocklist e os threat actors mais recentes na memória antes
+   * de a API aceitar requisições e inicia a gravação periódica dos actors
+   */
+  async onModuleInit(): Promise<void> {
+    const blocklist = await this.getBlocklist();
+    for (const entry of blocklist) {
+      this.blocklistCache.set(entry.ipAddress, entry.expiresAt);
+    }
+
+    const actors = await this.threatActorRepo.find({
+      order: { lastActivity: { direction: 'DESC', nulls: 'LAST' } },
+      take: this.maxTrackedActors,
+    });
+    // Do menos para o mais recente: a ordem do Map é a de uso
+    for (const actor of actors.reverse()) {
+      actor.attackTypes = actor.attackTypes || [];
+      this.actors.set(actor.ipAddress, actor);
+    }
+
+    this.actorFlushTimer = setInterval(
+      () => this.flushThreatActors(),
+      this.actorFlushInterval,
+    );
+    this.actorFlushTimer.unref();
+
+    this.logger.log(
+      `Loaded ${blocklist.length} blocked IPs and ${actors.length} threat actors`,
+    );
+  }
+
+  async onModuleDestroy(): Promise<void> {
+    clearInterval(this.actorFlushTimer);
+    await this.flushThreatActors();
+  }
 
   /**
    * Registra atividade maliciosa de um IP
+   *
+   * Atualiza o actor em memória de forma síncrona (requisições simultâneas
+   * do mesmo IP nunca perdem incrementos) e decide o auto-block na hora;
+   * a gravação no banco fica para o próximo flush. Um IP fora da memória
+   * recomeça do zero e o histórico gravado é somado assim que a busca em
+   * lote volta (uma ida ao banco), reavaliando o auto-block.
    */
-  async recordThreatActivity(
+  recordThreatActivity(
     ip: string,
     attackType: AttackType,
     threatLevel: ThreatLevel,
-  ): Promise<ThreatActor> {
-    let actor = await this.threatActorRepo.findOne({
-      where: { ipAddress: ip },
-    });
-
-    if (!actor) {
+  ): ThreatActor {
+    let actor = this.actors.get(ip);
+
+    if (actor) {
+      // Volta para o fim do Map (mais recente)
+      this.actors.delete(ip);
+      this.actors.set(ip, actor);
+    } else {
       actor = this.threatActorRepo.create({
         ipAddress: ip,
         threatScore: 0,
         attackCount: 0,
         attackTypes: [],
         firstSeen: new Date(),
+        isBlocked: false,
         metadata: {},
       });
+      this.actors.set(ip, actor);
+      this.unmergedActors.add(ip);
+      this.pendingLoads.add(ip);
+      this.loadStoredActors();
     }
 
     // Incrementa contadores
@@ -78,19 +181,10 @@ export class ThreatIntelligenceService {
     // Determina risk level baseado no score
     actor.riskLevel = this.calculateRiskLevel(actor.threatScore);
 
-    // Auto-block se crítico
-    if (
-      actor.threatScore >= this.THREAT_SCORE_THRESHOLDS.CRITICAL &&
-      !actor.isBlocked
-    ) {
-      await this.blockIp(
-        ip,
-        `Auto-blocked: Critical threat score (${actor.threatScore})`,
-      );
-      actor.isBlocked = true;
-    }
+    this.autoBlock(actor);
 
-    await this.threatActorRepo.save(actor);
+    this.dirtyActors.add(ip);
+    this.evictIdleActors();
 
     this.logger.warn(
       `Threat activity recorded: ${ip} - ${attackType} (Score: ${actor.threatScore}, Level: ${actor.riskLevel})`,
@@ -99,6 +193,222 @@ export class ThreatIntelligenceService {
     return actor;
   }
 
+  /**
+   * Auto-block se crítico
+   */
+  private autoBlock(actor: ThreatActor): void {
+    if (
+      actor.threatScore < this.THREAT_SCORE_THRESHOLDS.CRITICAL ||
+      actor.isBlocked
+    ) {
+      return;
+    }
+
+    const ip = actor.ipAddress;
+    // blockIp atualiza o cache da blocklist antes do primeiro await
+    this.blockIp(
+      ip,
+      `Auto-blocked: Critical threat score (${actor.threatScore})`,
+    ).catch((error) =>
+      this.logger.error(`Failed to persist block of ${ip}: ${error}`),
+    );
+    actor.isBlocked = true;
+  }
+
+  /**
+   * Tira da memória os actors menos recentes acima do limite
+   *
+   * Examina no máximo `limit` entradas (no caminho da requisição, só
+   * EVICTION_SCAN). Actors com alteração ainda não gravada vão para o fim
+   * do Map e saem depois do flush.
+   */
+  private evictIdleActors(limit = EVICTION_SCAN): void {
+    // Os que voltam para o fim do Map não são examinados de novo
+    const scan = Math.min(limit, this.actors.size);
+    let scanned = 0;
+    for (const [ip, actor] of this.actors) {
+      if (this.actors.size <= this.maxTrackedActors) return;
+      if (scanned++ >= scan) return;
+
+      this.actors.delete(ip);
+      if (this.dirtyActors.has(ip) || this.unmergedActors.has(ip)) {
+        this.actors.set(ip, actor);
+      } else {
+        this.actorWriteStats.evicted++;
+      }
+    }
+  }
+
+  /**
+   * Descarta os actors menos recentes acima do limite, gravados ou não
+   *
+   * Chamado quando um flush falha: sem isso um banco fora do ar faria a
+   * memória crescer a cada IP novo. Bloqueios continuam no cache da
+   * blocklist.
+   */
+  private dropUnwrittenActors(): void {
+    let dropped = 0;
+    for (const ip of this.actors.keys()) {
+      if (this.actors.size <= this.maxTrackedActors) break;
+      this.actors.delete(ip);
+      this.unmergedActors.delete(ip);
+      this.pendingLoads.delete(ip);
+      if (this.dirtyActors.delete(ip)) {
+        dropped++;
+      } else {
+        this.actorWriteStats.evicted++;
+      }
+    }
+
+    if (dropped > 0) {
+      this.actorWriteStats.dropped += dropped;
+      this.logger.warn(`Dropped ${dropped} unwritten threat actors`);
+    }
+  }
+
+  /**
+   * Busca em lote o histórico dos actors novos (uma busca por vez)
+   */
+  private loadStoredActors(): Promise<void> {
+    if (!this.actorLoad) {
+      this.actorLoad = this.readPendingLoads().finally(() => {
+        this.actorLoad = null;
+      });
+    }
+    return this.actorLoad;
+  }
+
+  private async readPendingLoads(): Promise<void> {
+    // Junta os IPs novos da mesma volta do event loop em uma consulta
+    await Promise.resolve();
+
+    while (this.pendingLoads.size > 0) {
+      const ips = [...this.pendingLoads].slice(0, ACTOR_BATCH_SIZE);
+      ips.forEach((ip) => this.pendingLoads.delete(ip));
+
+      try {
+        await this.mergeStoredActors(ips);
+      } catch (error) {
+        // Continuam em unmergedActors: o flush tenta de novo
+        this.logger.error(
+          `Failed to load ${ips.length} threat actors: ${error}`,
+        );
+      }
+    }
+  }
+
+  /**
+   * Soma aos actors criados em memória o histórico gravado no banco
+   *
+   * O histórico só é somado uma vez: quem aplicar primeiro (busca em lote
+   * ou flush) tira o IP de unmergedActors.
+   */
+  private async mergeStoredActors(ips: string[]): Promise<void> {
+    const fresh = ips.filter((ip) => this.unmergedActors.has(ip));
+    if (fresh.length === 0) return;
+
+    const stored = await this.threatActorRepo.find({
+      where: { ipAddress: In(fresh) },
+    });
+    for (const row of stored) {
+      const actor = this.actors.get(row.ipAddress);
+      if (!actor || !this.unmergedActors.has(row.ipAddress)) continue;
+
+      actor.threatScore += row.threatScore;
+      actor.attackCount += row.attackCount;
+      for (const type of row.attackTypes || []) {
+        if (!actor.attackTypes.includes(type)) actor.attackTypes.push(type);
+      }
+      actor.firstSeen = row.firstSeen ?? actor.firstSeen;
+      actor.isBlocked = actor.isBlocked || row.isBlocked;
+      actor.metadata = { ...row.metadata, ...actor.metadata };
+      actor.riskLevel = this.calculateRiskLevel(actor.threatScore);
+      this.autoBlock(actor);
+    }
+    fresh.forEach((ip) => this.unmergedActors.delete(ip));
+  }
+
+  /**
+   * Grava no banco os actors alterados até agora (um flush por vez)
+   */
+  flushThreatActors(): Promise<void> {
+    if (!this.actorFlush) {
+      this.actorFlush = this.writeDirtyActors().finally(() => {
+        this.actorFlush = null;
+      });
+    }
+    return this.actorFlush;
+  }
+
+  /**
+   * Grava os actors que estavam alterados quando o flush começou
+   *
+   * Os alterados durante a gravação ficam para o próximo intervalo: sob
+   * um ataque contínuo sempre há IPs novos, e quem espera o flush
+   * (getTopThreats, clearAllThreats...) não pode esperar o ataque acabar.
+   */
+  private async writeDirtyActors(): Promise<void> {
+    // Espera a busca de histórico em andamento em vez de repetir a consulta
+    await this.actorLoad;
+
+    // Continuam em dirtyActors até o seu lote: assim não são despejados
+    const pending = [...this.dirtyActors];
+    for (let start = 0; start < pending.length; start += ACTOR_BATCH_SIZE) {
+      const ips = pending
+        .slice(start, start + ACTOR_BATCH_SIZE)
+        .filter((ip) => this.dirtyActors.has(ip));
+      if (ips.length === 0) continue;
+      ips.forEach((ip) => this.dirtyActors.delete(ip));
+
+      this.actorWriteStats.flushes++;
+      try {
+        await this.mergeStoredActors(ips);
+
+        // Cópia dos valores atuais: o actor pode mudar durante o INSERT
+        const rows = ips
+          .map((ip) => this.actors.get(ip))
+          .filter((actor) => actor !== undefined)
+          .map((actor) => ({
+            ipAddress: actor.ipAddress,
+            threatScore: actor.threatScore,
+            riskLevel: actor.riskLevel,
+            attackCount: actor.attackCount,
+            attackTypes: [...actor.attackTypes],
+            lastActivity: actor.lastActivity,
+            firstSeen: actor.firstSeen,
+            isBlocked: actor.isBlocked,
+            metadata: actor.metadata,
+          }));
+
+        await this.threatActorRepo.upsert(rows, ['ipAddress']);
+        this.actorWriteStats.written += rows.length;
+      } catch (error) {
+        // A memória continua valendo: os IPs voltam para o próximo flush
+        ips.forEach((ip) => this.dirtyActors.add(ip));
+        this.actorWriteStats.failed += ips.length;
+        this.logger.error(
+          `Failed to write ${ips.length} threat actors: ${error}`,
+        );
+        this.dropUnwrittenActors();
+        return;
+      }
+    }
+
+    // Gravados, os actors acima do limite podem sair da memória
+    this.evictIdleActors(this.actors.size);
+  }
+
+  /**
+   * Contadores do write-behind de threat actors
+   */
+  getThreatActorStats() {
+    return {
+      tracked: this.actors.size,
+      pending: this.dirtyActors.size,
+      ...this.actorWriteStats,
+    };
+  }
+
   /**
    * Calcula o nível de risco baseado no score
    */
@@ -118,6 +428,13 @@ export class ThreatIntelligenceService {
     reason: string,
     expiresInHours?: number,
   ): Promise<IpBlocklist> {
+    const expiresAt = expiresInHours
+      ? new Date(Date.now() + expiresInHours * 60 * 60 * 1000)
+      : null;
+
+    // O cache é atualizado antes do banco: a próxima requisição já é bloqueada
+    this.blocklistCache.set(ip, expiresAt);
+
     const existing = await this.blocklistRepo.findOne({
       where: { ipAddress: ip },
     });
@@ -125,10 +442,11 @@ export class ThreatIntelligenceService {
     if (existing) {
       existing.active = true;
       existing.reason = reason;
-      if (expiresInHours) {
-        existing.expiresAt = new Date(
-          Date.now() + expiresInHours * 60 * 60 * 1000,
-        );
+      if (expiresAt) {
+        existing.expiresAt = expiresAt;
+      } else if (existing.expiresAt) {
+        // Sem nova expiração o bloqueio mantém a do registro existente
+        this.blocklistCache.set(ip, existing.expiresAt);
       }
       return this.blocklistRepo.save(existing);
     }
@@ -136,9 +454,7 @@ export class ThreatIntelligenceService {
     const blocked = this.blocklistRepo.create({
       ipAddress: ip,
       reason,
-      expiresAt: expiresInHours
-        ? new Date(Date.now() + expiresInHours * 60 * 60 * 1000)
-        : null,
+      expiresAt,
     });
 
     this.logger.warn(`IP blocked: ${ip} - ${reason}`);
@@ -149,41 +465,66 @@ export class ThreatIntelligenceService {
    * Remove IP da blocklist
    */
   async unblockIp(ip: string): Promise<void> {
+    this.blocklistCache.delete(ip);
     await this.blocklistRepo.update({ ipAddress: ip }, { active: false });
-    await this.threatActorRepo.update({ ipAddress: ip }, { isBlocked: false });
+
+    // O histórico do banco ainda não somado traria isBlocked de volta
+    if (this.unmergedActors.has(ip)) await this.flushThreatActors();
+
+    const actor = this.actors.get(ip);
+    if (actor) {
+      // Gravado pelo flush: um update direto poderia ser sobrescrito por um
+      // snapshot em andamento ainda com isBlocked = true
+      actor.isBlocked = false;
+      this.dirtyActors.add(ip);
+    } else {
+      await this.actorFlush;
+      await this.threatActorRepo.update(
+        { ipAddress: ip },
+        { isBlocked: false },
+      );
+    }
     this.logger.log(`IP unblocked: ${ip}`);
   }
 
   /**
    * Verifica se um IP está bloqueado
+   *
+   * Consulta só o cache em memória (sem ida ao banco). Bloqueios vencidos
+   * saem do cache aqui e são desativados no banco em segundo plano.
    */
-  async isIpBlocked(ip: string): Promise<boolean> {
-    const blocked = await this.blocklistRepo.findOne({
-      where: { ipAddress: ip, active: true },
-    });
-
-    if (!blocked) return false;
-
-    // Verifica se expirou
-    if (blocked.expiresAt && blocked.expiresAt < new Date()) {
-      await this.unblockIp(ip);
-      return false;
+  isIpBlocked(ip: string): boolean {
+    for (const expired of this.blocklistCache.popExpired()) {
+      this.unblockIp(expired).catch((error) =>
+        this.logger.error(`Failed to unblock expired IP ${expired}: ${error}`),
+      );
     }
 
-    return true;
+    return this.blocklistCache.has(ip);
   }
 
   /**
    * Obtém informações de um threat actor
    */
   async getThreatActor(ip: string): Promise<ThreatActor | null> {
-    return this.threatActorRepo.findOne({ where: { ipAddress: ip } });
+    if (this.actors.has(ip) && !this.unmergedActors.has(ip)) {
+      return this.actors.get(ip);
+    }
+    await this.flushThreatActors();
+    return (
+      this.actors.get(ip) ??
+      this.threatActorRepo.findOne({ where: { ipAddress: ip } })
+    );
   }
 
   /**
    * Lista top threat actors
+   *
+   * A memória guarda só os actors recentes: a lista vem do banco, depois
+   * de gravar as alterações pendentes.
    */
   async getTopThreats(limit = 50): Promise<ThreatActor[]> {
+    await this.flushThreatActors();
     return this.threatActorRepo.find({
       order: { threatScore: 'DESC' },
       take: limit,
@@ -223,31 +564,71 @@ export class ThreatIntelligenceService {
 
   /**
    * Decai threat scores ao longo do tempo
+   *
+   * Os actors fora da memória decaem direto no banco; os da memória
+   * decaem lá e são regravados pelo flush.
    */
   @Cron(CronExpression.EVERY_DAY_AT_MIDNIGHT)
   async decayThreatScores(): Promise<void> {
-    const actors = await this.threatActorRepo.find();
+    // Reduz 10% do score a cada dia
+    await this.flushThreatActors();
+    await this.threatActorRepo
+      .createQueryBuilder()
+      .update(ThreatActor)
+      .set({ threatScore: () => 'FLOOR("threatScore" * 0.9)' })
+      .execute();
+
+    const { LOW, MEDIUM, HIGH, CRITICAL } = this.THREAT_SCORE_THRESHOLDS;
+    const levels: [ThreatLevel, FindOperator<number>][] = [
+      [ThreatLevel.CRITICAL, MoreThanOrEqual(CRITICAL)],
+      [ThreatLevel.HIGH, Between(HIGH, CRITICAL - 1)],
+      [ThreatLevel.MEDIUM, Between(MEDIUM, HIGH - 1)],
+      [ThreatLevel.LOW, LessThan(MEDIUM)],
+    ];
+    for (const [riskLevel, threatScore] of levels) {
+      await this.threatActorRepo.update({ threatScore }, { riskLevel });
+    }
 
-    for (const actor of actors) {
-      // Reduz 10% do score a cada dia
+    const removed: string[] = [];
+    for (const actor of this.actors.values()) {
       actor.threatScore = Math.floor(actor.threatScore * 0.9);
       actor.riskLevel = this.calculateRiskLevel(actor.threatScore);
 
-      // Se score muito baixo, remove do DB
+      // Se score muito baixo, remove da memória e do DB
       if (actor.threatScore < 5) {
-        await this.threatActorRepo.remove(actor);
+        removed.push(actor.ipAddress);
       } else {
-        await this.threatActorRepo.save(actor);
+        this.dirtyActors.add(actor.ipAddress);
       }
     }
+    for (const ip of removed) {
+      this.actors.delete(ip);
+      this.dirtyActors.delete(ip);
+      this.unmergedActors.delete(ip);
+    }
 
-    this.logger.log(`Decayed threat scores for ${actors.length} actors`);
+    // Um flush em andamento pode ainda estar gravando os removidos
+    await this.actorFlush;
+    const result = await this.threatActorRepo.delete({
+      threatScore: LessThan(5),
+    });
+    await this.flushThreatActors();
+
+    this.logger.log(
+      `Decayed threat scores (${result.affected || 0} actors removed)`,
+    );
   }
 
   /**
    * Limpa todos os threat actors (apenas para demonstração)
    */
   async clearAllThreats(): Promise<number> {
+    this.actors.clear();
+    this.dirtyActors.clear();
+    this.unmergedActors.clear();
+    this.pendingLoads.clear();
+    // Um upsert em andamento traria de volta as linhas apagadas
+    await this.actorFlush;
     const result = await this.threatActorRepo.delete({});
     return result.affected || 0;
   }
@@ -256,6 +637,7 @@ export class ThreatIntelligenceService {
    * Limpa toda a blocklist (apenas para demonstração)
    */
   async clearBlocklist(): Promise<number> {
+    this.blocklistCache.clear();
     const result = await this.blocklistRepo.delete({});
     return result.affected || 0;
   }
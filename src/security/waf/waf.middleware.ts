@@ -8,6 +8,10 @@ import {
 import { Request, Response, NextFunction } from 'express';
 import { DetectionService } from '../detection/detection.service';
 import { ThreatIntelligenceService } from '../threat-intelligence/threat-intelligence.service';
+import {
+  AttackType,
+  ThreatLevel,
+} from '../detection/entities/security-event.entity';
 
 @Injectable()
 export class WAFMiddleware implements NestMiddleware {
@@ -36,12 +40,64 @@ export class WAFMiddleware implements NestMiddleware {
     const isDevIP = DEVELOPMENT_IPS.includes(ip);
 
     // Verifica se o IP está na blocklist (mas ignora se for dev IP em modo test)
-    const isBlocked = await this.threatIntel.isIpBlocked(ip);
+    // A consulta é feita no cache em memória, sem ida ao banco
+    const isBlocked = this.threatIntel.isIpBlocked(ip);
     if (isBlocked && !(wafMode === 'test' && isDevIP)) {
       this.logger.warn(`❌ Blocked request from blacklisted IP: ${ip}`);
       throw new HttpException('Forbidden', HttpStatus.FORBIDDEN);
     }
 
+    // Rate limit por IP + endpoint (janela deslizante em memória)
+    const rateLimit = this.detectionService.checkRateLimit(ip, req.path);
+    if (rateLimit.limited) {
+      // Registra só a primeira requisição acima do limite na janela
+      if (rateLimit.count === rateLimit.limit + 1) {
+        this.detectionService.logSecurityEvent(
+          {
+            isAttack: true,
+            attackType: AttackType.RATE_LIMIT_EXCEEDED,
+            threatLevel: ThreatLevel.LOW,
+            shouldBlock: true,
+            confidence: 1.0,
+            matchedPatterns: [
+              `More than ${rateLimit.limit} requests to ${req.path} in the window`,
+            ],
+          },
+          {
+            ip,
+            userAgent: req.headers['user-agent'],
+            endpoint: req.path,
+            method: req.method,
+          },
+        );
+        this.threatIntel.recordThreatActivity(
+          ip,
+          AttackType.RATE_LIMIT_EXCEEDED,
+          ThreatLevel.LOW,
+        );
+      }
+
+      if (wafMode === 'test' && isDevIP) {
+        this.logger.warn(
+          `⚠️  [TEST MODE] Would rate limit ${ip} on ${req.path} (${rateLimit.count}/${rateLimit.limit})`,
+        );
+      } else {
+        const retryAfter = Math.ceil(rateLimit.retryAfterMs / 1000);
+        this.logger.warn(
+          `⏱️  Rate limited ${ip} on ${req.path} (${rateLimit.count}/${rateLimit.limit})`,
+        );
+        res.setHeader('Retry-After', String(retryAfter));
+        throw new HttpException(
+          {
+            statusCode: HttpStatus.TOO_MANY_REQUESTS,
+            message: 'Too Many Requests',
+            retryAfter,
+          },
+          HttpStatus.TOO_MANY_REQUESTS,
+        );
+      }
+    }
+
     // Analisa a requisição
     const detection = await this.detectionService.analyzeRequest({
       ip,
@@ -59,8 +115,8 @@ export class WAFMiddleware implements NestMiddleware {
         `🚨 Attack detected: ${detection.attackType} from ${ip} on ${req.path} (confidence: ${(detection.confidence * 100).toFixed(0)}%)`,
       );
 
-      // Registra o evento
-      await this.detectionService.logSecurityEvent(detection, {
+      // Registra o evento (gravado em lote, sem esperar o banco)
+      this.detectionService.logSecurityEvent(detection, {
         ip,
         userAgent: req.headers['user-agent'],
         endpoint: req.path,
@@ -68,8 +124,8 @@ export class WAFMiddleware implements NestMiddleware {
         payload: { body: req.body, query: req.query },
       });
 
-      // Adiciona à threat intelligence
-      await this.threatIntel.recordThreatActivity(
+      // Adiciona à threat intelligence (score em memória, auto-block na hora)
+      this.threatIntel.recordThreatActivity(
         ip,
         detection.attackType,
         detection.threatLevel,